@@ -0,0 +1,130 @@
+import asyncio
+import os
+import weakref
+from contextlib import asynccontextmanager
+
+
+# Chat turns allowed to run at once (each fans out into several LLM/DB calls),
+# and how many more may wait for a free slot before new requests get a 503.
+CHAT_MAX_CONCURRENCY = int(os.getenv("CHAT_MAX_CONCURRENCY", 8))
+CHAT_MAX_QUEUE = int(os.getenv("CHAT_MAX_QUEUE", 32))
+
+
+class ChatQueueFull(Exception):
+    """Raised when the chat queue is full; the route answers 503"""
+    pass
+
+
+class SessionLocks:
+    """
+    One asyncio.Lock per chat session, so two messages for the same session run one
+    after the other. Locks live only while someone holds a reference to them.
+    """
+
+    def __init__(self):
+        self._locks = weakref.WeakValueDictionary()
+
+    def get(self, session_id):
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[session_id] = lock
+        return lock
+
+    def __len__(self):
+        return len(self._locks)
+
+
+class ChatReservation:
+    """
+    A place in the ChatLimiter (running or queued). release() is idempotent, and
+    `async with reservation:` releases it on any exit - including a cancelled wait for the
+    session lock - so a reservation cannot leak.
+    """
+
+    def __init__(self, limiter):
+        self._limiter = limiter
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._limiter._admitted -= 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+class ChatLimiter:
+    """Global cap on running chat turns with a bounded waiting queue"""
+
+    def __init__(self, max_concurrency=CHAT_MAX_CONCURRENCY, max_queue=CHAT_MAX_QUEUE):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._admitted = 0          # running + waiting
+        self._running = 0
+
+    def admit(self):
+        """Reserve a place (running or queued); raises ChatQueueFull when there is none"""
+        if self._admitted >= self.max_concurrency + self.max_queue:
+            raise ChatQueueFull()
+        self._admitted += 1
+        return ChatReservation(self)
+
+    @asynccontextmanager
+    async def running(self):
+        """Wait for a free slot; run inside the reservation returned by admit()"""
+        async with self._semaphore:
+            self._running += 1
+            try:
+                yield
+            finally:
+                self._running -= 1
+
+    def stats(self):
+        return {
+            "running": self._running,
+            "queued": self._admitted - self._running,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
+
+
+async def run_in_thread(func, *args, **kwargs):
+    """
+    asyncio.to_thread that does not return before the thread is done, even if the request
+    is cancelled (client went away) - otherwise the session lock would be released while the
+    graph is still writing that session's checkpoint.
+    """
+    task = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        await task
+        raise
+
+
+async def iterate_in_thread(iterator):
+    """
+    Async iteration over a blocking generator, one next() per worker-thread call.
+    Like run_in_thread, a cancelled consumer still waits for the step in flight, and the
+    generator is closed before this returns - so nothing of the turn runs on after the
+    caller lets go of the session lock.
+    """
+    done = object()
+    try:
+        while True:
+            item = await run_in_thread(next, iterator, done)
+            if item is done:
+                return
+            yield item
+    finally:
+        await run_in_thread(iterator.close)
+
+
+session_locks = SessionLocks()
+chat_limiter = ChatLimiter()
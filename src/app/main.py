@@ -1,6 +1,9 @@
+import sys
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import users, appointments, availability, appointment_types, chatbot
+from dao import DAOFactory, close_pools, close_async_pools
+from telemetry import tracer
 
 app = FastAPI(title="Appointment Scheduler API")
 
@@ -20,6 +23,41 @@ app.include_router(availability.router, prefix="/availability", tags=["Availabil
 app.include_router(appointment_types.router, prefix="/types", tags=["Appointment Types"])
 app.include_router(chatbot.router, prefix="/chatbot", tags=["Chatbot"])
 
+@app.on_event("startup")
+def check_chat_config():
+    # a misconfigured checkpointer stops the app here rather than on the first chat turn
+    from engine.checkpointer import check_checkpointer
+    check_checkpointer()
+
+@app.on_event("startup")
+def start_catalogue_listener():
+    # keep the cached service catalogue in sync with appointment_types across processes
+    app.state.catalogue_listener = DAOFactory().get_service_dao().start_catalogue_listener()
+
+@app.on_event("shutdown")
+def stop_catalogue_listener():
+    listener = getattr(app.state, "catalogue_listener", None)
+    if listener is not None:
+        listener.stop_event.set()
+
+@app.on_event("shutdown")
+async def close_chat_graph():
+    # only if a chat turn ever built the graph
+    execute_graph = sys.modules.get("execute_graph")
+    if execute_graph is not None:
+        await execute_graph.close_graphs()
+
+@app.on_event("shutdown")
+async def close_db_pools():
+    # the only place the process-wide DAO pools are closed (after the chat graph is done with them)
+    close_pools()
+    await close_async_pools()
+
+@app.on_event("shutdown")
+def flush_traces():
+    # close the trace file of the jsonl / otlp_file exporters
+    tracer.shutdown()
+
 @app.get("/")
 def root():
     return {"message": "Appointment Scheduler API is running"}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Date, Time, Text, TIMESTAMP
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Date, Time, Text, TIMESTAMP, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from .database import Base
@@ -29,12 +29,23 @@ class AvailabilitySlot(Base):
     __tablename__ = "availability_slots"
     id = Column(Integer, primary_key=True, index=True)
     provider_id = Column(Integer, ForeignKey("users.id"))
+    type_id = Column(Integer, ForeignKey("appointment_types.id"))
     date = Column(Date, nullable=False)
     start_time = Column(Time, nullable=False)
     end_time = Column(Time, nullable=False)
     status = Column(String(20), default="available")
     created_at = Column(TIMESTAMP, server_default=func.now())
 
+    # slot search: date/status + `start_time < :end AND end_time > :start` (migration 0001)
+    __table_args__ = (
+        Index("ix_availability_slots_date_status_start_time", "date", "status", "start_time",
+              postgresql_include=["end_time"]),
+        Index("ix_availability_slots_type_date_status_start_time", "type_id", "date", "status", "start_time",
+              postgresql_include=["end_time"]),
+        # one slot per provider and start (migration 0006); bulk imports skip duplicates on it
+        Index("ux_availability_slots_provider_date_start_time", "provider_id", "date", "start_time", unique=True),
+    )
+
 class Appointment(Base):
     __tablename__ = "appointments"
     id = Column(Integer, primary_key=True, index=True)
@@ -47,3 +58,8 @@ class Appointment(Base):
     notes = Column(Text)
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    # streamed / keyset-paginated listings in (scheduled_time, id) order (migration 0005)
+    __table_args__ = (
+        Index("ix_appointments_scheduled_time_id", "scheduled_time", "id"),
+    )
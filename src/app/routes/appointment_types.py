@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app import models
+from dao.service_dao import service_catalogue_cache
 
 router = APIRouter()
 
@@ -11,8 +12,16 @@ def create_appointment_type(type_data: dict, db: Session = Depends(get_db)):
     db.add(new_type)
     db.commit()
     db.refresh(new_type)
+    # the chat agents read the catalogue from a process-wide cache; drop it here
+    # (other processes are notified by the appointment_types NOTIFY trigger)
+    service_catalogue_cache.invalidate()
     return new_type
 
 @router.get("/")
 def list_appointment_types(db: Session = Depends(get_db)):
     return db.query(models.AppointmentType).all()
+
+
+@router.get("/cache/stats")
+def appointment_types_cache_stats():
+    return service_catalogue_cache.stats()
@@ -1,10 +1,21 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app import models
+from app import models, schemas
+from app.concurrency import run_in_thread
+from dao import DAOFactory, AvailabilitySlot
+from typing import List
+import psycopg2
+import tempfile
 
 router = APIRouter()
 
+# text/csv bodies are spooled to a temp file past this size before the COPY reads them
+BULK_SPOOL_BYTES = 8 * 1024 * 1024
+
+SLOT_LIST = TypeAdapter(List[schemas.AvailabilityCreate])
+
 @router.post("/")
 def create_availability(slot: dict, db: Session = Depends(get_db)):
     new_slot = models.AvailabilitySlot(**slot)
@@ -12,3 +23,48 @@ def create_availability(slot: dict, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(new_slot)
     return new_slot
+
+
+@router.post("/bulk", response_model=schemas.AvailabilityBulkResult)
+async def create_availability_bulk(request: Request, on_conflict: str = Query("ignore", pattern="^(ignore|error)$")):
+    """
+    Create many slots in one transaction. The body is a JSON array of slots
+    (provider_id, date, start_time, end_time, optional type_id and status), a CSV file
+    (Content-Type: text/csv, first line the header) or a multipart form with the CSV as `file`.
+    Slots the provider already has at that date and start time are skipped; with
+    on_conflict=error they reject the whole import (409).
+    """
+    dao = DAOFactory().get_availability_dao()
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith("application/json"):
+            try:
+                slots = SLOT_LIST.validate_json(await request.body())
+            except ValidationError as error:
+                raise HTTPException(status_code=422, detail=error.errors(include_url=False, include_context=False))
+            return await run_in_thread(
+                dao.create_many, [AvailabilitySlot(**slot.model_dump()) for slot in slots], on_conflict
+            )
+
+        if content_type.startswith("multipart/form-data"):
+            async with request.form() as form:
+                upload = form.get("file")
+                if upload is None or isinstance(upload, str):
+                    raise HTTPException(status_code=422, detail="the CSV is expected in the form field 'file'")
+                return await run_in_thread(dao.create_many_from_csv, upload.file, on_conflict=on_conflict)
+
+        if content_type.startswith("text/csv"):
+            with tempfile.SpooledTemporaryFile(max_size=BULK_SPOOL_BYTES) as file:
+                async for chunk in request.stream():
+                    file.write(chunk)
+                file.seek(0)
+                return await run_in_thread(dao.create_many_from_csv, file, on_conflict=on_conflict)
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+    except psycopg2.errors.UniqueViolation:
+        raise HTTPException(status_code=409, detail="some slots already exist; nothing was imported")
+    except (psycopg2.DataError, psycopg2.IntegrityError) as error:
+        # bad values in the CSV (dates, times, ...) or unknown provider / type ids
+        raise HTTPException(status_code=400, detail=error.diag.message_primary or str(error))
+
+    raise HTTPException(status_code=415, detail="send a JSON array, text/csv or a multipart form with a CSV file")
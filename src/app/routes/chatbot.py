@@ -1,31 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
 from ..deps import get_db, get_current_user
 from .. import models, schemas
+from ..concurrency import chat_limiter, session_locks, run_in_thread, iterate_in_thread, ChatQueueFull
+from dao import DAOFactory
 from datetime import datetime
+from typing import Optional
+import json
+import logging
+import os
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# "1": drive the graph with ainvoke/astream on the event loop (async nodes, checkpointer and DAOs)
+# instead of running the sync graph in worker threads
+ASYNC_GRAPH = os.getenv("ASYNC_GRAPH", "0") == "1"
+
+# what a client is told when a streamed turn fails (details stay in the logs and the trace)
+STREAM_ERROR_DETAIL = "The assistant could not complete this message, please try again"
 
 
 @router.post("/", response_model=schemas.ChatResponse)
-def chat_with_llm(request: schemas.ChatRequest, db: Session = Depends(get_db), user=Depends(get_current_user)):
+async def chat_with_llm(request: schemas.ChatRequest, db: Session = Depends(get_db), user=Depends(get_current_user)):
     """
     Takes session_id and user input text,
     runs it through LangGraph AI pipeline, 
     returns generated output.
+    Messages for one session are handled one at a time; different sessions run in parallel,
+    up to CHAT_MAX_CONCURRENCY turns at once (503 once CHAT_MAX_QUEUE more are waiting).
     """
 
      # Validate session_id
     if not request.session_id:
         raise HTTPException(status_code=400, detail="session_id is required")
-    
 
-    # Call your LangGraph pipeline
-    llm_output = run_langgraph_pipeline(
-        session_id=request.session_id,
-        user_id=user.id,
-        input_text=request.input_text
-    )
+    # imported here so the graph (and its checkpoint DB) is only built when chat is used
+    from execute_graph import SessionOwnershipError
+
+    try:
+        reservation = chat_limiter.admit()
+    except ChatQueueFull:
+        raise HTTPException(status_code=503, detail="Chat is busy, please retry shortly", headers={"Retry-After": "2"})
+
+    # the reservation is given back however this ends, also while waiting for the session lock
+    async with reservation:
+        async with session_locks.get(request.session_id):
+            async with chat_limiter.running():
+                # Call your LangGraph pipeline (async graph, or the blocking one kept off the event loop)
+                try:
+                    if ASYNC_GRAPH:
+                        llm_output = await arun_langgraph_pipeline(
+                            session_id=request.session_id,
+                            user_id=user.id,
+                            input_text=request.input_text
+                        )
+                    else:
+                        llm_output = await run_in_thread(
+                            run_langgraph_pipeline,
+                            session_id=request.session_id,
+                            user_id=user.id,
+                            input_text=request.input_text
+                        )
+                except SessionOwnershipError:
+                    raise HTTPException(status_code=403, detail="Session belongs to another user")
 
     return schemas.ChatResponse(
         session_id=request.session_id,
@@ -34,10 +74,95 @@ def chat_with_llm(request: schemas.ChatRequest, db: Session = Depends(get_db), u
     )
     
 
-# Dummy LangGraph runner (replace with real LangGraph integration)
+@router.post("/stream")
+async def stream_chat_with_llm(request: schemas.ChatRequest, user=Depends(get_current_user)):
+    """
+    Same input as POST /chatbot/, answered as Server-Sent Events:
+    `token` events carry assistant text as it is generated, `progress` events report
+    what the graph is doing (e.g. fetching slots), `message` carries each complete
+    assistant message and `done` closes the turn.
+    """
+    if not request.session_id:
+        raise HTTPException(status_code=400, detail="session_id is required")
+
+    # imported here so the graph (and its checkpoint DB) is only built when chat is used
+    from execute_graph import stream_chat, session_owned_by, astream_chat, asession_owned_by
+
+    if ASYNC_GRAPH:
+        owned = await asession_owned_by(request.session_id, user.id)
+    else:
+        owned = await run_in_thread(session_owned_by, request.session_id, user.id)
+    if not owned:
+        raise HTTPException(status_code=403, detail="Session belongs to another user")
+    try:
+        reservation = chat_limiter.admit()
+    except ChatQueueFull:
+        raise HTTPException(status_code=503, detail="Chat is busy, please retry shortly", headers={"Retry-After": "2"})
+
+    if ASYNC_GRAPH:
+        events = astream_chat(request.input_text, thread_id=request.session_id, user_id=user.id)
+    else:
+        events = iterate_in_thread(stream_chat(request.input_text, thread_id=request.session_id, user_id=user.id))
+
+    async def event_stream():
+        async with reservation:
+            async with session_locks.get(request.session_id):
+                async with chat_limiter.running():
+                    try:
+                        async for event in events:
+                            yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+                    except Exception:
+                        # the chat.turn span records the error; the client only learns the turn failed
+                        logger.exception("chat stream error (session %s)", request.session_id)
+                        yield f"event: error\ndata: {json.dumps({'event': 'error', 'detail': STREAM_ERROR_DETAIL})}\n\n"
+                    finally:
+                        # a disconnected client: finish / close the turn before the lock is released
+                        await events.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # a stream that never started never entered its reservation
+        background=BackgroundTask(reservation.release)
+    )
+
+
+@router.get("/stats")
+def chat_stats(user=Depends(get_current_user)):
+    """
+    Running/queued chat turns, open session locks, LLM response cache and slot prefetch counters,
+    and per-span latency (chat turns, nodes, LLM calls, DAO methods, SQL, checkpoints)
+    """
+    from engine.llm_cache import get_llm_cache_stats
+    from engine.prefetch import get_prefetch_stats
+    from telemetry import get_trace_stats
+
+    return {**chat_limiter.stats(), "active_sessions": len(session_locks),
+            "llm_cache": get_llm_cache_stats(), "slot_prefetch": get_prefetch_stats(),
+            "tracing": get_trace_stats()}
+
+
+@router.get("/{session_id}/transcript", response_model=schemas.TranscriptPage)
+def get_transcript(session_id: str, limit: int = Query(50, ge=1, le=200), before_id: Optional[int] = None,
+                   user=Depends(get_current_user)):
+    """
+    The session's chat transcript, newest page first (messages within a page are oldest first).
+    Only rows recorded for the requesting user are returned.
+    """
+    page = DAOFactory().get_transcript_dao().get_page(session_id, user_id=user.id, limit=limit, before_id=before_id)
+    return schemas.TranscriptPage(session_id=session_id, **page)
+
+
 def run_langgraph_pipeline(session_id: str, user_id: int, input_text: str) -> dict:
-    # Here you’d invoke your LangGraph chat graph
-    return {
-        "output": "AI response goes here",
-        "session_id": session_id,
-    }
\ No newline at end of file
+    """Invoke the compiled chat graph on the session's own checkpoint thread"""
+    from execute_graph import run_chat_turn
+
+    return run_chat_turn(input_text, thread_id=session_id, user_id=user_id)
+
+
+async def arun_langgraph_pipeline(session_id: str, user_id: int, input_text: str) -> dict:
+    """run_langgraph_pipeline on the async graph (ainvoke, async checkpointer and DAOs)"""
+    from execute_graph import arun_chat_turn
+
+    return await arun_chat_turn(input_text, thread_id=session_id, user_id=user_id)
@@ -40,6 +40,14 @@ class AvailabilityCreate(BaseModel):
     date: date
     start_time: time
     end_time: time
+    type_id: Optional[int] = None
+    status: str = "available"
+
+# POST /availability/bulk: ids of the created slots; skipped = duplicates left as they were
+class AvailabilityBulkResult(BaseModel):
+    inserted: int
+    skipped: int
+    ids: List[int]
 
 class AppointmentBase(BaseModel):
     type_id: int
@@ -68,4 +76,15 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     session_id: str
     user_input: str
-    llm_output: dict
\ No newline at end of file
+    llm_output: dict
+class TranscriptMessage(BaseModel):
+    id: int
+    role: str
+    content: str
+    created_at: datetime
+
+# One page of a chat transcript, oldest first; pass next_before_id as before_id for the previous page
+class TranscriptPage(BaseModel):
+    session_id: str
+    messages: List[TranscriptMessage]
+    next_before_id: Optional[int] = None
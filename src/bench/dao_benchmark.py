@@ -0,0 +1,323 @@
+import argparse
+import json
+import math
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+
+from dao.database import Database
+from dao.appointment_dao import AppointmentDAO
+from dao.availability_dao import AvailabilityDAO
+
+
+# Times the hot read paths of the DAO layer against whatever the DAOs point at (a local
+# Postgres loaded by bench.datagen) and captures EXPLAIN (ANALYZE, BUFFERS) for the exact
+# SQL each call ran:
+#
+#   cd src && python -m bench.datagen --scale 1m
+#   python -m bench.dao_benchmark --label before --json before.json
+#   ... change an index or a query ...
+#   python -m bench.dao_benchmark --label after --json after.json --compare before.json
+#
+# Cases are keyed by stable names, so two reports can be compared case by case.
+# The pool's DB_STATEMENT_TIMEOUT_MS applies, as in the app; raise it for very large scans.
+REPORT_VERSION = 1
+WARMUP_RUNS = 1
+FULL_LISTING_MAX_ROWS = 200_000     # get_appointments_with_details() reads the whole table
+
+
+class RecordingDatabase(Database):
+    """Database whose cursors remember the SQL (with parameters bound) of every execute"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statements = []
+
+    def get_connection(self):
+        return _RecordingConnection(super().get_connection(), self.statements)
+
+
+class _RecordingConnection:
+    def __init__(self, conn, statements):
+        self._conn = conn
+        self._statements = statements
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return _RecordingCursor(self._conn.cursor(*args, **kwargs), self._statements)
+
+    def close(self):
+        self._conn.close()
+
+
+class _RecordingCursor:
+    def __init__(self, cursor, statements):
+        self._cursor = cursor
+        self._statements = statements
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, query, vars=None):
+        self._statements.append(self._cursor.mogrify(query, vars).decode())
+        return self._cursor.execute(query, vars)
+
+
+##--------------------------------------------------------------------
+#                   PARAMETERS
+##--------------------------------------------------------------------
+def pick_parameters(database):
+    """
+    Representative arguments from the data itself: the busiest and a median provider, seeker
+    and date, the busiest date's most common service, a recent appointment
+    """
+    conn = database.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SET LOCAL statement_timeout = 0")
+
+        def hot_and_median(column, table):
+            cursor.execute(f'''
+                WITH counts AS (SELECT {column} AS key, COUNT(*) AS n FROM {table} GROUP BY {column})
+                SELECT (SELECT key FROM counts ORDER BY n DESC, key LIMIT 1),
+                       (SELECT key FROM counts ORDER BY n, key LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM counts))
+            ''')
+            hot, median = cursor.fetchone()
+            return hot, median
+
+        hot_provider, median_provider = hot_and_median("provider_id", "appointments")
+        hot_seeker, median_seeker = hot_and_median("seeker_id", "appointments")
+        busy_date, quiet_date = hot_and_median("date", "availability_slots")
+        cursor.execute('''
+            SELECT at.name FROM availability_slots s JOIN appointment_types at ON at.id = s.type_id
+            WHERE s.date = %s AND s.status = 'available'
+            GROUP BY at.name ORDER BY COUNT(*) DESC, at.name LIMIT 1
+        ''', (busy_date,))
+        row = cursor.fetchone()
+        cursor.execute("SELECT MAX(id), COUNT(*) FROM appointments")
+        latest_appointment, appointment_count = cursor.fetchone()
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "hot_provider": hot_provider, "median_provider": median_provider,
+        "hot_seeker": hot_seeker, "median_seeker": median_seeker,
+        "busy_date": str(busy_date) if busy_date else None, "quiet_date": str(quiet_date) if quiet_date else None,
+        "busy_service": row[0] if row else None,
+        "latest_appointment": latest_appointment, "appointments": appointment_count,
+    }
+
+
+def build_cases(params):
+    """{case name: (dao attribute, method name, kwargs)}"""
+    cases = {}
+    if params["busy_date"]:
+        cases.update({
+            "slots.busy_date.morning.service": ("availability", "get_slots_by_date_overlapping_time_range",
+                {"date": params["busy_date"], "start_time": "08:00", "end_time": "12:00", "service_name": params["busy_service"]}),
+            "slots.busy_date.morning": ("availability", "get_slots_by_date_overlapping_time_range",
+                {"date": params["busy_date"], "start_time": "08:00", "end_time": "12:00"}),
+            "slots.busy_date.whole_day": ("availability", "get_slots_by_date_overlapping_time_range",
+                {"date": params["busy_date"], "start_time": "00:00", "end_time": "23:59"}),
+            "slots.quiet_date.afternoon.service": ("availability", "get_slots_by_date_overlapping_time_range",
+                {"date": params["quiet_date"], "start_time": "12:00", "end_time": "17:00", "service_name": params["busy_service"]}),
+        })
+    if params["latest_appointment"]:
+        cases["appointments.details.by_id"] = ("appointment", "get_appointments_with_details",
+                                               {"appointment_id": params["latest_appointment"]})
+        if params["appointments"] <= FULL_LISTING_MAX_ROWS:
+            cases["appointments.details.all"] = ("appointment", "get_appointments_with_details", {})
+        for label in ("hot", "median"):
+            seeker, provider = params[f"{label}_seeker"], params[f"{label}_provider"]
+            cases[f"appointments.by_seeker.{label}"] = ("appointment", "get_by_seeker", {"seeker_id": seeker})
+            cases[f"appointments.by_seeker.{label}.booked"] = ("appointment", "get_by_seeker", {"seeker_id": seeker, "status": "booked"})
+            cases[f"appointments.by_provider.{label}"] = ("appointment", "get_by_provider", {"provider_id": provider})
+            cases[f"appointments.by_provider.{label}.booked"] = ("appointment", "get_by_provider", {"provider_id": provider, "status": "booked"})
+    return cases
+
+
+##--------------------------------------------------------------------
+#                   TIMING AND PLANS
+##--------------------------------------------------------------------
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+def result_rows(result):
+    if result is None:
+        return 0
+    return len(result) if isinstance(result, list) else 1
+
+
+def scan_nodes(plan, found=None):
+    """'Index Scan using ix on table' / 'Seq Scan on table' ... for every scan in the plan tree"""
+    found = [] if found is None else found
+    node_type = plan.get("Node Type", "")
+    if "Scan" in node_type:
+        target = f" using {plan['Index Name']}" if plan.get("Index Name") else ""
+        relation = f" on {plan['Relation Name']}" if plan.get("Relation Name") else ""
+        found.append(f"{node_type}{target}{relation}")
+    for child in plan.get("Plans", []):
+        scan_nodes(child, found)
+    return found
+
+
+def explain(database, statement):
+    """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) summary of one statement"""
+    conn = database.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement)
+        plan = cursor.fetchone()[0][0]
+        conn.rollback()
+    finally:
+        conn.close()
+    root = plan["Plan"]
+    return {
+        "planning_ms": plan.get("Planning Time"),
+        "execution_ms": plan.get("Execution Time"),
+        "shared_hit_blocks": root.get("Shared Hit Blocks"),
+        "shared_read_blocks": root.get("Shared Read Blocks"),
+        "estimated_rows": root.get("Plan Rows"),
+        "actual_rows": root.get("Actual Rows"),
+        "scans": scan_nodes(root),
+        "plan": plan,
+    }
+
+
+def run_case(database, daos, dao_name, method_name, kwargs, repeat):
+    method = getattr(daos[dao_name], method_name)
+    for _ in range(WARMUP_RUNS):
+        method(**kwargs)
+
+    timings = []
+    for _ in range(repeat):
+        database.statements.clear()
+        started = time.perf_counter()
+        result = method(**kwargs)
+        timings.append((time.perf_counter() - started) * 1000)
+    statements = list(database.statements)
+
+    return {
+        "method": f"{type(daos[dao_name]).__name__}.{method_name}",
+        "args": {key: str(value) for key, value in kwargs.items()},
+        "rows": result_rows(result),
+        "timings_ms": {
+            "min": round(min(timings), 3),
+            "p50": round(statistics.median(timings), 3),
+            "p95": round(percentile(timings, 95), 3),
+            "mean": round(statistics.mean(timings), 3),
+            "max": round(max(timings), 3),
+        },
+        "statements": statements,
+        "plans": [explain(database, statement) for statement in statements],
+    }
+
+
+def table_stats(database):
+    conn = database.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SHOW server_version")
+        server_version = cursor.fetchone()[0]
+        cursor.execute('''
+            SELECT c.relname, c.reltuples::bigint, pg_total_relation_size(c.oid), pg_indexes_size(c.oid),
+                   ARRAY(SELECT indexrelid::regclass::text FROM pg_index WHERE indrelid = c.oid ORDER BY 1)
+            FROM pg_class c
+            WHERE c.relname IN ('users', 'appointment_types', 'availability_slots', 'appointments')
+              AND c.relkind = 'r' AND pg_table_is_visible(c.oid)
+            ORDER BY c.relname
+        ''')
+        tables = {
+            name: {"rows_estimate": rows, "total_bytes": total, "index_bytes": indexes, "indexes": index_names}
+            for name, rows, total, indexes, index_names in cursor.fetchall()
+        }
+        conn.commit()
+    finally:
+        conn.close()
+    return {"server_version": server_version, "tables": tables}
+
+
+##--------------------------------------------------------------------
+#                   REPORT
+##--------------------------------------------------------------------
+def run(label=None, repeat=20, only=None):
+    database = RecordingDatabase()
+    daos = {"availability": AvailabilityDAO(database), "appointment": AppointmentDAO(database)}
+    params = pick_parameters(database)
+    cases = build_cases(params)
+
+    report = {
+        "version": REPORT_VERSION,
+        "label": label,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "database": table_stats(database),
+        "parameters": params,
+        "repeat": repeat,
+        "cases": {},
+    }
+    for name, (dao_name, method_name, kwargs) in cases.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        try:
+            report["cases"][name] = run_case(database, daos, dao_name, method_name, kwargs, repeat)
+        except Exception as e:
+            print(f"Case {name} error: {e}")
+            report["cases"][name] = {"error": f"{type(e).__name__}: {e}"}
+    return report
+
+
+def print_report(report, baseline=None):
+    tables = report["database"]["tables"]
+    print(f"\nPostgres {report['database']['server_version']}  " + "  ".join(
+        f"{name}={stats['rows_estimate']}" for name, stats in tables.items()))
+    header = f"{'case':<42} {'rows':>7} {'p50 ms':>9} {'p95 ms':>9} {'exec ms':>9} {'hit':>7} {'read':>7}"
+    print(header + ("  vs baseline" if baseline else ""))
+    for name, case in report["cases"].items():
+        if "error" in case:
+            print(f"{name:<42} {case['error']}")
+            continue
+        plan = case["plans"][0] if case["plans"] else {}
+        line = (f"{name:<42} {case['rows']:>7} {case['timings_ms']['p50']:>9.2f} {case['timings_ms']['p95']:>9.2f} "
+                f"{plan.get('execution_ms') or 0:>9.2f} {plan.get('shared_hit_blocks') or 0:>7} {plan.get('shared_read_blocks') or 0:>7}")
+        previous = (baseline or {}).get("cases", {}).get(name)
+        if previous and "error" not in previous:
+            ratio = case["timings_ms"]["p50"] / previous["timings_ms"]["p50"] if previous["timings_ms"]["p50"] else float("inf")
+            changed = previous["plans"] and plan and previous["plans"][0]["scans"] != plan["scans"]
+            line += f"  x{ratio:.2f}" + ("  plan changed" if changed else "")
+        print(line)
+        print(f"{'':<42} {', '.join(plan.get('scans', []))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time DAO read paths and capture their query plans")
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per case (after a warm-up call)")
+    parser.add_argument("--only", action="append", help="run only cases whose name starts with this (repeatable)")
+    parser.add_argument("--label", help="name of this run in the report (e.g. the branch or index change)")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--compare", help="a previous report to compare p50 latency and plans against")
+    args = parser.parse_args()
+
+    report = run(label=args.label, repeat=args.repeat, only=args.only)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import argparse
+import io
+import random
+import time
+from datetime import date, datetime, timedelta
+
+import psycopg2
+import psycopg2.extras
+
+from dao.database import DB_CONFIG
+from bench.fixtures import BENCH_EMAIL_DOMAIN, GENERATED_SERVICE_PREFIX, create_schema, teardown
+
+
+# Synthetic data at scale for the DAO benchmark (bench.dao_benchmark): users, appointment
+# types, availability slots and appointments, with skew where production has it:
+#   - hot providers:  provider i gets a share of the slots ~ 1 / (i + 1) ** provider_skew
+#   - busy dates:     likewise per date (date_skew), over a shuffled calendar
+#   - heavy seekers:  appointments pick seekers ~ random() ** (1 + seeker_skew)
+# Everything is owned by bench-gen-* users, so bench.fixtures.teardown() removes it.
+# Rows are streamed with COPY on a dedicated connection (no pool statement_timeout).
+SCALES = {
+    "10k": {"slots": 10_000, "providers": 20, "seekers": 2_000},
+    "100k": {"slots": 100_000, "providers": 100, "seekers": 20_000},
+    "1m": {"slots": 1_000_000, "providers": 600, "seekers": 100_000},
+    "10m": {"slots": 10_000_000, "providers": 5_000, "seekers": 500_000},
+}
+
+DAY_START_MINUTES = 8 * 60          # slots from 08:00 ...
+DAY_END_MINUTES = 20 * 60           # ... to 20:00
+COPY_CHUNK_ROWS = 200_000
+
+
+def zipf_weights(count, skew):
+    """Weight of rank i ~ 1 / (i + 1) ** skew (skew 0 = uniform)"""
+    return [1 / (rank + 1) ** skew for rank in range(count)]
+
+
+def spread(total, weights, cap):
+    """Split total into integer counts proportional to weights, none above cap"""
+    counts = [0] * len(weights)
+    candidates = [i for i, weight in enumerate(weights) if weight > 0]
+    remaining = total
+    while remaining > 0 and candidates:
+        weight_sum = sum(weights[i] for i in candidates)
+        placed = 0
+        for i in candidates:
+            add = min(cap - counts[i], int(remaining * weights[i] / weight_sum))
+            counts[i] += add
+            placed += add
+        if placed == 0:
+            # only fractions left: one more each for the heaviest
+            for i in sorted(candidates, key=lambda i: -weights[i])[:remaining]:
+                counts[i] += 1
+                placed += 1
+        remaining -= placed
+        candidates = [i for i in candidates if counts[i] < cap]
+    return counts
+
+
+def _time(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _copy(cursor, table_columns, lines):
+    """COPY lines (tab-separated, newline-terminated) in chunks"""
+    buffer = io.StringIO()
+    rows = 0
+    for line in lines:
+        buffer.write(line)
+        rows += 1
+        if rows % COPY_CHUNK_ROWS == 0:
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {table_columns} FROM STDIN", buffer)
+            buffer = io.StringIO()
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table_columns} FROM STDIN", buffer)
+    return rows
+
+
+def _create_users(cursor, role, count):
+    prefix = f"bench-gen-{role}-"
+    _copy(cursor, "users (email, password_hash, role, name)", (
+        f"{prefix}{i}@{BENCH_EMAIL_DOMAIN}\tbench\t{role}\tGenerated {role.capitalize()} {i}\n" for i in range(count)
+    ))
+    cursor.execute("SELECT id FROM users WHERE email LIKE %s ORDER BY id", (f"{prefix}%@{BENCH_EMAIL_DOMAIN}",))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _create_services(cursor, count):
+    rows = [(f"{GENERATED_SERVICE_PREFIX}{i:03d}", 30, "first_available", 180, i % 2 == 0) for i in range(count)]
+    return [row[0] for row in psycopg2.extras.execute_values(
+        cursor,
+        "INSERT INTO appointment_types (name, duration_minutes, matching_strategy, max_days_ahead, is_online) VALUES %s RETURNING id",
+        rows,
+        fetch=True,
+    )]
+
+
+def slot_lines(rng, provider_ids, type_ids, dates, total, slot_minutes, provider_skew, date_skew, booked_fraction):
+    """availability_slots rows for COPY: skewed per provider and date, unique per provider/date/start"""
+    per_day = (DAY_END_MINUTES - DAY_START_MINUTES) // slot_minutes
+    calendar = list(range(len(dates)))
+    rng.shuffle(calendar)                       # busy dates are spread over the range, not the first days
+    date_weights = [0.0] * len(dates)
+    for rank, weight in zip(calendar, zipf_weights(len(dates), date_skew)):
+        date_weights[rank] = weight
+
+    provider_counts = spread(total, zipf_weights(len(provider_ids), provider_skew), per_day * len(dates))
+    for index, (provider_id, provider_total) in enumerate(zip(provider_ids, provider_counts)):
+        type_id = type_ids[index % len(type_ids)]
+        for day, day_count in zip(dates, spread(provider_total, date_weights, per_day)):
+            for j in range(day_count):
+                start = DAY_START_MINUTES + (j * per_day // day_count) * slot_minutes
+                status = "booked" if rng.random() < booked_fraction else "available"
+                yield f"{provider_id}\t{type_id}\t{day}\t{_time(start)}\t{_time(start + slot_minutes)}\t{status}\n"
+
+
+def generate(slots=10_000, providers=20, seekers=2_000, services=12, days=180, start_date=None,
+             slot_minutes=30, provider_skew=1.0, date_skew=0.8, seeker_skew=1.0,
+             booked_fraction=0.3, cancelled_fraction=0.05, seed=42):
+    """
+    Load a generated data set; returns a summary dict (row counts, parameters, seconds).
+    Booked slots get a 'booked' appointment; cancelled_fraction of the available ones also
+    have a 'cancelled' appointment in their history. Existing bench data is removed first.
+    """
+    teardown()
+    rng = random.Random(seed)
+    start_date = start_date or date.today() + timedelta(days=1)
+    dates = [start_date + timedelta(days=offset) for offset in range(days)]
+    started = time.perf_counter()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SET statement_timeout = 0")
+        type_ids = _create_services(cursor, services)
+        provider_ids = _create_users(cursor, "provider", providers)
+        seeker_ids = _create_users(cursor, "seeker", seekers)
+        slot_rows = _copy(
+            cursor,
+            "availability_slots (provider_id, type_id, date, start_time, end_time, status)",
+            slot_lines(rng, provider_ids, type_ids, dates, slots, slot_minutes, provider_skew, date_skew, booked_fraction),
+        )
+        conn.commit()
+        print(f"Loaded {slot_rows} slots in {time.perf_counter() - started:.1f}s")
+
+        # one plan, one random() sequence: the same seed gives the same appointments
+        cursor.execute("SET max_parallel_workers_per_gather = 0")
+        cursor.execute("SELECT setseed(%s)", (rng.random() * 2 - 1,))
+        cursor.execute('''
+            INSERT INTO appointments (type_id, seeker_id, provider_id, slot_id, scheduled_time, status)
+            SELECT s.type_id,
+                   (%(seekers)s::int[])[1 + floor(%(seeker_count)s * power(random(), %(exponent)s))::int],
+                   s.provider_id, s.id, s.date + s.start_time,
+                   CASE WHEN s.status = 'booked' THEN 'booked' ELSE 'cancelled' END
+            FROM availability_slots s
+            WHERE s.provider_id = ANY(%(providers)s)
+              AND (s.status = 'booked' OR random() < %(cancelled)s)
+            ORDER BY s.id
+        ''', {"seekers": seeker_ids, "seeker_count": len(seeker_ids), "exponent": 1 + seeker_skew,
+              "providers": provider_ids, "cancelled": cancelled_fraction})
+        appointment_rows = cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    analyze()
+    summary = {
+        "rows": {"appointment_types": len(type_ids), "providers": len(provider_ids), "seekers": len(seeker_ids),
+                 "availability_slots": slot_rows, "appointments": appointment_rows},
+        "parameters": {"slots": slots, "providers": providers, "seekers": seekers, "services": services,
+                       "days": days, "start_date": str(start_date), "slot_minutes": slot_minutes,
+                       "provider_skew": provider_skew, "date_skew": date_skew, "seeker_skew": seeker_skew,
+                       "booked_fraction": booked_fraction, "cancelled_fraction": cancelled_fraction, "seed": seed},
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+    print(f"Generated {summary['rows']} in {summary['seconds']}s")
+    return summary
+
+
+def analyze():
+    """Fresh planner statistics and visibility map, so plans reflect the new data"""
+    conn = psycopg2.connect(**DB_CONFIG)
+    conn.autocommit = True
+    try:
+        conn.cursor().execute("VACUUM (ANALYZE) users, appointment_types, availability_slots, appointments")
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a skewed appointment data set for the DAO benchmark")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k", help="preset for --slots / --providers / --seekers")
+    parser.add_argument("--slots", type=int)
+    parser.add_argument("--providers", type=int)
+    parser.add_argument("--seekers", type=int)
+    parser.add_argument("--services", type=int, default=12)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--start-date", type=lambda value: datetime.strptime(value, "%Y-%m-%d").date())
+    parser.add_argument("--slot-minutes", type=int, default=30)
+    parser.add_argument("--provider-skew", type=float, default=1.0, help="0 = every provider equally busy")
+    parser.add_argument("--date-skew", type=float, default=0.8, help="0 = every date equally busy")
+    parser.add_argument("--seeker-skew", type=float, default=1.0, help="0 = appointments spread evenly over seekers")
+    parser.add_argument("--booked-fraction", type=float, default=0.3)
+    parser.add_argument("--cancelled-fraction", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--schema", action="store_true", help="create the tables and run the migrations first")
+    args = parser.parse_args()
+
+    scale = SCALES[args.scale]
+    if args.schema:
+        create_schema()
+    generate(
+        slots=args.slots or scale["slots"], providers=args.providers or scale["providers"],
+        seekers=args.seekers or scale["seekers"], services=args.services, days=args.days,
+        start_date=args.start_date, slot_minutes=args.slot_minutes, provider_skew=args.provider_skew,
+        date_skew=args.date_skew, seeker_skew=args.seeker_skew, booked_fraction=args.booked_fraction,
+        cancelled_fraction=args.cancelled_fraction, seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
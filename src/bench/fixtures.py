@@ -0,0 +1,211 @@
+import argparse
+import os
+from datetime import date, datetime, time, timedelta
+
+import psycopg2.extras
+
+from dao.database import DB_CONFIG, Database
+
+
+# Local database fixture for the benchmarks: the schema (app.models + every migration) and a
+# deterministic data set owned by bench-* users, so it can be reset without touching anything
+# else in the database. Point the DAO layer at a local Postgres with DB_HOST / DB_PORT /
+# DB_NAME / DB_USER / DB_PASSWORD first.
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+BENCH_EMAIL_DOMAIN = "bench.local"
+BENCH_SERVICES = ("haircut", "dentist", "massage")
+GENERATED_SERVICE_PREFIX = "bench-service-"       # appointment types created by bench.datagen
+SLOT_HOURS = range(9, 17)                 # one-hour slots, 09:00-17:00
+
+TEARDOWN_INDEXES = (
+    ("bench_teardown_appointments_seeker", "appointments", "seeker_id"),
+    ("bench_teardown_appointments_provider", "appointments", "provider_id"),
+    ("bench_teardown_appointments_slot", "appointments", "slot_id"),
+    ("bench_teardown_slots_provider", "availability_slots", "provider_id"),
+    ("bench_teardown_transcripts_user", "chat_transcripts", "user_id"),
+)
+
+
+def database_url():
+    """DATABASE_URL if set, otherwise the database the DAO layer talks to (as in migrations/env.py)"""
+    from sqlalchemy.engine import URL
+
+    if os.getenv("DATABASE_URL"):
+        return os.getenv("DATABASE_URL")
+    return URL.create(
+        "postgresql+psycopg2",
+        username=DB_CONFIG["user"],
+        password=DB_CONFIG["password"],
+        host=DB_CONFIG["host"],
+        port=DB_CONFIG["port"],
+        database=DB_CONFIG["database"],
+    )
+
+
+def create_schema():
+    """Base tables from app.models, then alembic upgrade head (indexes, triggers, chat_transcripts)"""
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import create_engine
+    from app.database import Base
+    from app import models  # noqa: F401  (registers the tables on Base.metadata)
+
+    engine = create_engine(database_url())
+    try:
+        Base.metadata.create_all(engine)
+    finally:
+        engine.dispose()
+    command.upgrade(Config(ALEMBIC_INI), "head")
+
+
+def bench_email(role, index):
+    return f"bench-{role}-{index}@{BENCH_EMAIL_DOMAIN}"
+
+
+def teardown(database=None):
+    """
+    Delete everything the fixture and bench.datagen created: bench users with their slots,
+    appointments and transcripts, and the generated appointment types
+    """
+    database = database or Database()
+    conn = database.get_connection()
+    cursor = conn.cursor()
+    try:
+        # semi-joins against one temp table stay fast with millions of generated rows
+        cursor.execute("SET LOCAL statement_timeout = 0")
+        cursor.execute('''
+            CREATE TEMP TABLE bench_users ON COMMIT DROP AS
+            SELECT id FROM users WHERE email LIKE %s
+        ''', (f"bench-%@{BENCH_EMAIL_DOMAIN}",))
+        removed = cursor.rowcount
+        # the foreign keys into users / availability_slots have no index on the referencing
+        # side, so each deleted row's FK check would scan the table; index them for this
+        # transaction only
+        for name, table, column in TEARDOWN_INDEXES:
+            cursor.execute(f"CREATE INDEX {name} ON {table} ({column})")
+        cursor.execute("DELETE FROM appointments WHERE seeker_id IN (SELECT id FROM bench_users)")
+        cursor.execute("DELETE FROM appointments WHERE provider_id IN (SELECT id FROM bench_users)")
+        cursor.execute('''
+            DELETE FROM appointments WHERE slot_id IN (
+                SELECT id FROM availability_slots WHERE provider_id IN (SELECT id FROM bench_users)
+            )
+        ''')
+        cursor.execute("DELETE FROM chat_transcripts WHERE user_id IN (SELECT id FROM bench_users)")
+        cursor.execute("DELETE FROM availability_slots WHERE provider_id IN (SELECT id FROM bench_users)")
+        cursor.execute("DELETE FROM users WHERE id IN (SELECT id FROM bench_users)")
+        cursor.execute('''
+            DELETE FROM appointment_types t
+            WHERE t.name LIKE %s
+              AND NOT EXISTS (SELECT 1 FROM availability_slots s WHERE s.type_id = t.id)
+              AND NOT EXISTS (SELECT 1 FROM appointments a WHERE a.type_id = t.id)
+        ''', (f"{GENERATED_SERVICE_PREFIX}%",))
+        for name, _, _ in TEARDOWN_INDEXES:
+            cursor.execute(f"DROP INDEX {name}")
+        conn.commit()
+        return removed
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _ensure_services(cursor, services):
+    """appointment_types id per service name (created when missing)"""
+    type_ids = {}
+    for name in services:
+        cursor.execute("SELECT id FROM appointment_types WHERE name = %s ORDER BY id LIMIT 1", (name,))
+        row = cursor.fetchone()
+        if row is None:
+            cursor.execute('''
+                INSERT INTO appointment_types (name, duration_minutes, matching_strategy, max_days_ahead, is_online)
+                VALUES (%s, 60, 'first_available', 60, false)
+                RETURNING id
+            ''', (name,))
+            row = cursor.fetchone()
+        type_ids[name] = row[0]
+    return type_ids
+
+
+def _create_users(cursor, role, count):
+    rows = [(bench_email(role, i), "bench", role, f"Bench {role.capitalize()} {i}") for i in range(count)]
+    return [row[0] for row in psycopg2.extras.execute_values(
+        cursor,
+        "INSERT INTO users (email, password_hash, role, name) VALUES %s RETURNING id",
+        rows,
+        fetch=True,
+    )]
+
+
+def seed(database=None, seekers=50, providers_per_service=2, days=14, start_date=None, services=BENCH_SERVICES):
+    """
+    Reset the bench data and create it again:
+      - `seekers` seeker users and `providers_per_service` providers per service
+      - one-hour slots (SLOT_HOURS) for every provider on each of `days` days from start_date
+        (default: tomorrow)
+    Returns {"seeker_ids", "provider_ids", "services", "dates", "slots"}.
+    """
+    database = database or Database()
+    start_date = start_date or date.today() + timedelta(days=1)
+    dates = [start_date + timedelta(days=offset) for offset in range(days)]
+    teardown(database)
+
+    conn = database.get_connection()
+    cursor = conn.cursor()
+    try:
+        type_ids = _ensure_services(cursor, services)
+        seeker_ids = _create_users(cursor, "seeker", seekers)
+        provider_ids = _create_users(cursor, "provider", providers_per_service * len(services))
+
+        slots = []
+        for index, provider_id in enumerate(provider_ids):
+            type_id = type_ids[services[index % len(services)]]
+            for day in dates:
+                for hour in SLOT_HOURS:
+                    slots.append((provider_id, type_id, day, time(hour), time(hour + 1), "available"))
+        psycopg2.extras.execute_values(
+            cursor,
+            "INSERT INTO availability_slots (provider_id, type_id, date, start_time, end_time, status) VALUES %s",
+            slots,
+            page_size=1000,
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print(f"Seeded {len(seeker_ids)} seekers, {len(provider_ids)} providers, {len(slots)} slots "
+          f"({dates[0]} .. {dates[-1]})")
+    return {
+        "seeker_ids": seeker_ids,
+        "provider_ids": provider_ids,
+        "services": list(services),
+        "dates": [day.strftime("%Y-%m-%d") for day in dates],
+        "slots": len(slots),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create / seed / remove the benchmark data set")
+    parser.add_argument("--schema", action="store_true", help="create the tables and run the migrations first")
+    parser.add_argument("--teardown", action="store_true", help="only delete the bench data")
+    parser.add_argument("--seekers", type=int, default=50)
+    parser.add_argument("--providers-per-service", type=int, default=2)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--start-date", type=lambda value: datetime.strptime(value, "%Y-%m-%d").date())
+    args = parser.parse_args()
+
+    if args.schema:
+        create_schema()
+    if args.teardown:
+        print(f"Removed {teardown()} bench users and their data")
+        return
+    seed(seekers=args.seekers, providers_per_service=args.providers_per_service,
+         days=args.days, start_date=args.start_date)
+
+
+if __name__ == "__main__":
+    main()
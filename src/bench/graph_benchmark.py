@@ -0,0 +1,355 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Throughput benchmark of the appointment graph, fully offline: the scripted chat model
+# (LLM_BACKEND=fake) instead of Gemini, a local Postgres seeded by bench.fixtures and a
+# fresh SQLite checkpoint file. N synthetic users book an appointment, then reschedule
+# and cancel it, `concurrency` of them at a time:
+#
+#   cd src && DB_HOST=localhost DB_NAME=appointments python -m bench.graph_benchmark \
+#       --conversations 50 --concurrency 10 [--async] [--llm-latency-ms 800] [--matcher]
+#
+# Reports turns/sec, p50/p95/p99 turn latency, LLM calls per booking and checkpoint
+# bytes per turn (plus per-span averages from the tracer).
+FLOWS = ("book", "reschedule", "cancel")
+TIME_WINDOWS = ("morning", "afternoon")
+MAX_TURNS_PER_FLOW = 12
+
+
+def configure_environment(args, checkpoint_path):
+    """Must run before engine / execute_graph are imported: they read these at import time"""
+    os.environ["LLM_BACKEND"] = "fake"
+    os.environ["LLM_FAKE_LATENCY_MS"] = str(args.llm_latency_ms)
+    os.environ["CHECKPOINTER"] = "sqlite"
+    os.environ["SQLITE_CHECKPOINT_PATH"] = checkpoint_path
+    if args.matcher:
+        # every slot search goes through the tool-calling matcher agent
+        os.environ["DIRECT_SLOT_FETCH"] = "0"
+    if args.no_llm_cache:
+        os.environ["LLM_CACHE"] = "off"
+
+
+class SyntheticUser:
+    """
+    Answers whatever the assistant is waiting for, from the conversation's state:
+    the first missing booking item, a new date after a reschedule / no slots, or a slot id.
+    """
+
+    def __init__(self, index, seeker_id, fixture):
+        self.index = index
+        self.seeker_id = seeker_id
+        self.service = fixture["services"][index % len(fixture["services"])]
+        self.dates = fixture["dates"]
+        self.date_offset = index % len(self.dates)
+        self.name = f"Bench User {chr(ord('A') + index % 26)}"
+        self.email = f"bench-user-{index}@example.com"
+
+    def next_date(self):
+        """A different date (and window) every time one is asked for"""
+        date = self.dates[self.date_offset % len(self.dates)]
+        window = TIME_WINDOWS[self.date_offset % len(TIME_WINDOWS)]
+        self.date_offset += 1
+        return f"{date} in the {window}"
+
+    def reply(self, values):
+        from engine.nodes.information_gatherer_node import identify_missing_information
+        from engine.state import ConversationStage
+
+        stage = values.get("conversation_stage")
+        if stage == ConversationStage.CONFIRMING_SLOTS:
+            slots = values.get("available_slots") or []
+            return str(slots[self.index % len(slots)]["slot_id"])
+
+        missing = identify_missing_information(values)
+        if not missing:
+            # rescheduling, or no slots for the last preference
+            return f"how about {self.next_date()}"
+        return {
+            "service_type": f"I need a {self.service}",
+            "preferred_date": self.next_date(),
+            "seeker_name": f"my name is {self.name}",
+            "seeker_contact": self.email,
+        }[missing[0]]
+
+    def opening(self):
+        return f"Hi, I'd like to book an appointment on {self.next_date()}"
+
+
+FLOW_DONE = {
+    "book": "booking_complete",
+    "reschedule": "booking_complete",
+    "cancel": "cancellation_complete",
+}
+
+FLOW_START = {
+    "reschedule": ("I need to reschedule my appointment", "RESCHEDULING"),
+    "cancel": ("Please cancel my appointment", "CANCELLING"),
+}
+
+
+def stage_name(values):
+    stage = values.get("conversation_stage")
+    return getattr(stage, "value", stage)
+
+
+def run_conversation(index, fixture, flows):
+    """
+    One user's booking (then reschedule, cancel) on the sync graph.
+    Returns {"turns": [seconds], "completed": [flow], "failed": flow or None}.
+    """
+    import execute_graph
+    from engine.state import ConversationStage
+
+    thread_id = f"bench-{index}-{time.time_ns()}"
+    user = SyntheticUser(index, fixture["seeker_ids"][index % len(fixture["seeker_ids"])], fixture)
+    config = execute_graph.thread_config(thread_id)
+    outcome = {"turns": [], "completed": [], "failed": None}
+
+    for flow in flows:
+        started = time.perf_counter()
+        if flow == "book":
+            execute_graph.run_chat_turn(user.opening(), thread_id, user.seeker_id)
+        else:
+            text, stage = FLOW_START[flow]
+            # the reschedule / cancel actions enter the graph at their stage (as in orchestrator_test)
+            execute_graph.execute_chat({"seeker_request": text, "conversation_stage": ConversationStage[stage]}, thread_id)
+        outcome["turns"].append(time.perf_counter() - started)
+
+        for _ in range(MAX_TURNS_PER_FLOW):
+            values = execute_graph.graph.get_state(config).values
+            if stage_name(values) == FLOW_DONE[flow]:
+                outcome["completed"].append(flow)
+                break
+            started = time.perf_counter()
+            execute_graph.run_chat_turn(user.reply(values), thread_id, user.seeker_id)
+            outcome["turns"].append(time.perf_counter() - started)
+        else:
+            outcome["failed"] = flow
+            break
+    return outcome
+
+
+async def arun_conversation(index, fixture, flows):
+    """run_conversation on the async graph"""
+    import execute_graph
+    from engine.state import ConversationStage
+
+    thread_id = f"bench-{index}-{time.time_ns()}"
+    user = SyntheticUser(index, fixture["seeker_ids"][index % len(fixture["seeker_ids"])], fixture)
+    config = execute_graph.thread_config(thread_id)
+    graph = await execute_graph.get_async_graph()
+    outcome = {"turns": [], "completed": [], "failed": None}
+
+    for flow in flows:
+        started = time.perf_counter()
+        if flow == "book":
+            await execute_graph.arun_chat_turn(user.opening(), thread_id, user.seeker_id)
+        else:
+            text, stage = FLOW_START[flow]
+            await graph.ainvoke({"seeker_request": text, "conversation_stage": ConversationStage[stage]}, config=config)
+        outcome["turns"].append(time.perf_counter() - started)
+
+        for _ in range(MAX_TURNS_PER_FLOW):
+            values = (await graph.aget_state(config)).values
+            if stage_name(values) == FLOW_DONE[flow]:
+                outcome["completed"].append(flow)
+                break
+            started = time.perf_counter()
+            await execute_graph.arun_chat_turn(user.reply(values), thread_id, user.seeker_id)
+            outcome["turns"].append(time.perf_counter() - started)
+        else:
+            outcome["failed"] = flow
+            break
+    return outcome
+
+
+def merge_outcomes(flows, outcomes):
+    results = {"turns": [], "completed": {flow: 0 for flow in flows}, "failed": {flow: 0 for flow in flows}, "errors": 0}
+    for outcome in outcomes:
+        if outcome is None:
+            results["errors"] += 1
+            continue
+        results["turns"].extend(outcome["turns"])
+        for flow in outcome["completed"]:
+            results["completed"][flow] += 1
+        if outcome["failed"]:
+            results["failed"][outcome["failed"]] += 1
+    return results
+
+
+def run_sync(args, fixture, flows):
+    def conversation(index):
+        try:
+            return run_conversation(index, fixture, flows)
+        except Exception as e:
+            print(f"Conversation {index} error: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        return merge_outcomes(flows, executor.map(conversation, range(args.conversations)))
+
+
+async def run_async(args, fixture, flows):
+    import execute_graph
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def conversation(index):
+        async with semaphore:
+            try:
+                return await arun_conversation(index, fixture, flows)
+            except Exception as e:
+                print(f"Conversation {index} error: {e}")
+                return None
+
+    try:
+        return merge_outcomes(flows, await asyncio.gather(*(conversation(index) for index in range(args.conversations))))
+    finally:
+        await execute_graph.close_async_graph()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of values (seconds) in milliseconds"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return round(ordered[rank - 1] * 1000, 2)
+
+
+def checkpoint_bytes(path):
+    """Serialized checkpoints + pending writes stored in the SQLite checkpoint file"""
+    conn = sqlite3.connect(path)
+    try:
+        checkpoints = conn.execute("SELECT COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0), COUNT(*) FROM checkpoints").fetchone()
+        writes = conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes").fetchone()
+    finally:
+        conn.close()
+    return {"checkpoints": checkpoints[1], "checkpoint_bytes": checkpoints[0], "write_bytes": writes[0]}
+
+
+def span_summary(before, after, prefixes=("chat.", "node.", "llm.", "checkpoint.", "db.query", "dao.")):
+    """count / avg_ms / max_ms per span name recorded during the run"""
+    summary = {}
+    for name, counts in after.items():
+        if not name.startswith(prefixes):
+            continue
+        previous = before.get(name, {"count": 0, "total_ms": 0.0})
+        count = counts["count"] - previous["count"]
+        if count:
+            summary[name] = {
+                "count": count,
+                "avg_ms": round((counts["total_ms"] - previous["total_ms"]) / count, 2),
+                "max_ms": round(counts["max_ms"], 2),
+            }
+    return summary
+
+
+def build_report(args, flows, results, elapsed, spans_before, spans_after, checkpoint_path):
+    turns = results["turns"]
+    llm_calls = spans_after.get("llm.call", {}).get("count", 0) - spans_before.get("llm.call", {}).get("count", 0)
+    bookings = results["completed"]["book"] + results["completed"]["reschedule"]
+    stored = checkpoint_bytes(checkpoint_path)
+
+    return {
+        "config": {
+            "conversations": args.conversations,
+            "concurrency": args.concurrency,
+            "graph": "async" if args.use_async else "sync",
+            "flows": list(flows),
+            "llm_latency_ms": args.llm_latency_ms,
+            "slot_search": "matcher agent" if args.matcher else "direct",
+        },
+        "elapsed_s": round(elapsed, 3),
+        "turns": len(turns),
+        "turns_per_sec": round(len(turns) / elapsed, 2) if elapsed else None,
+        "turn_latency_ms": {
+            "p50": percentile(turns, 50),
+            "p95": percentile(turns, 95),
+            "p99": percentile(turns, 99),
+            "max": round(max(turns) * 1000, 2) if turns else None,
+        },
+        "completed": results["completed"],
+        "failed": results["failed"],
+        "errors": results["errors"],
+        "llm_calls": llm_calls,
+        "llm_calls_per_booking": round(llm_calls / bookings, 2) if bookings else None,
+        "checkpoint": {
+            **stored,
+            "bytes_per_turn": round((stored["checkpoint_bytes"] + stored["write_bytes"]) / len(turns)) if turns else None,
+        },
+        "spans": span_summary(spans_before, spans_after),
+    }
+
+
+def print_report(report):
+    latency = report["turn_latency_ms"]
+    print(f"\n{report['config']}")
+    print(f"turns:                {report['turns']} in {report['elapsed_s']}s ({report['turns_per_sec']} turns/sec)")
+    print(f"turn latency (ms):    p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    print(f"completed flows:      {report['completed']}  failed: {report['failed']}  errors: {report['errors']}")
+    print(f"LLM calls:            {report['llm_calls']} ({report['llm_calls_per_booking']} per booking)")
+    print(f"checkpoint bytes/turn: {report['checkpoint']['bytes_per_turn']} "
+          f"({report['checkpoint']['checkpoints']} checkpoints)")
+    print("spans:")
+    for name, counts in sorted(report["spans"].items()):
+        print(f"  {name:<48} {counts['count']:>7}  avg {counts['avg_ms']:>9.2f}ms  max {counts['max_ms']:>9.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline throughput benchmark of the appointment graph")
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--flows", default=",".join(FLOWS), help="comma-separated subset of book,reschedule,cancel (in that order)")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="drive the async graph (ainvoke/astream)")
+    parser.add_argument("--llm-latency-ms", type=float, default=0, help="simulated round trip of each LLM call")
+    parser.add_argument("--matcher", action="store_true", help="search slots through the tool-calling matcher agent")
+    parser.add_argument("--no-llm-cache", action="store_true")
+    parser.add_argument("--schema", action="store_true", help="create the schema before seeding")
+    parser.add_argument("--days", type=int, default=14, help="days of seeded availability")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    flows = [flow for flow in FLOWS if flow in args.flows.split(",")]
+    if flows and flows[0] != "book":
+        parser.error("the reschedule and cancel flows need a booking first")
+
+    workdir = tempfile.mkdtemp(prefix="graph-bench-")
+    checkpoint_path = os.path.join(workdir, "checkpoints.db")
+    configure_environment(args, checkpoint_path)
+
+    from bench import fixtures
+    from telemetry import get_trace_stats
+
+    if args.schema:
+        fixtures.create_schema()
+    fixture = fixtures.seed(seekers=args.conversations, days=args.days)
+
+    import execute_graph  # noqa: F401  (builds the graph before the clock starts)
+
+    spans_before = get_trace_stats()["spans"]
+    started = time.perf_counter()
+    if args.use_async:
+        results = asyncio.run(run_async(args, fixture, flows))
+    else:
+        results = run_sync(args, fixture, flows)
+    elapsed = time.perf_counter() - started
+
+    report = build_report(args, flows, results, elapsed, spans_before, get_trace_stats()["spans"], checkpoint_path)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
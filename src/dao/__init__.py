@@ -1,13 +1,25 @@
 from .dao_factory import DAOFactory
+from .database import close_pools
+from .async_database import close_async_pools
 from .provider_dao import Provider, ProviderDAO
 from .service_dao import Service, ServiceDAO
 from .availability_dao import AvailabilitySlot, AvailabilityDAO
 from .appointment_dao import Appointment, AppointmentDAO
+from .transcript_dao import TranscriptDAO
+from .async_dao_factory import AsyncDAOFactory
+from .async_provider_dao import AsyncProviderDAO
+from .async_service_dao import AsyncServiceDAO
+from .async_availability_dao import AsyncAvailabilityDAO
+from .async_appointment_dao import AsyncAppointmentDAO
+from .async_transcript_dao import AsyncTranscriptDAO
 
 __all__ = [
-    'DAOFactory',
+    'DAOFactory', 'close_pools', 'close_async_pools',
     'Provider', 'ProviderDAO',
     'Service', 'ServiceDAO', 
     'AvailabilitySlot', 'AvailabilityDAO',
-    'Appointment', 'AppointmentDAO'
+    'Appointment', 'AppointmentDAO',
+    'TranscriptDAO',
+    'AsyncDAOFactory', 'AsyncProviderDAO', 'AsyncServiceDAO',
+    'AsyncAvailabilityDAO', 'AsyncAppointmentDAO', 'AsyncTranscriptDAO'
 ]
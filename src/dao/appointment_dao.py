@@ -17,6 +17,176 @@ class Appointment:
         self.created_at = created_at
         self.updated_at = updated_at
 
+
+# Lock the slot, re-check it is still available, flip it to booked and insert the
+# appointment -- one statement, one transaction, one round trip.
+# SKIP LOCKED makes a concurrent booking of the same slot return no row instead of waiting.
+BOOK_SLOT_ATOMICALLY_SQL = '''
+    WITH slot AS (
+        SELECT id
+        FROM availability_slots
+        WHERE id = %(slot_id)s AND status = 'available'
+        FOR UPDATE SKIP LOCKED
+    ), booked AS (
+        UPDATE availability_slots s
+        SET status = 'booked'
+        FROM slot
+        WHERE s.id = slot.id
+        RETURNING s.id, s.provider_id, s.type_id, s.date, s.start_time
+    )
+    INSERT INTO appointments (
+        type_id, seeker_id, provider_id, slot_id, scheduled_time, status, notes
+    )
+    SELECT COALESCE(%(type_id)s, booked.type_id), %(seeker_id)s, booked.provider_id, booked.id,
+           booked.date + booked.start_time, %(status)s, %(notes)s
+    FROM booked
+    RETURNING *
+'''
+
+# Cancel the old appointment, release its slot, book the new slot and insert the new
+# appointment -- one statement. Nothing changes unless the old appointment is still active
+# AND the new slot could be locked while available.
+RESCHEDULE_APPOINTMENT_SQL = '''
+    WITH old_appointment AS (
+        SELECT id, type_id, seeker_id, slot_id
+        FROM appointments
+        WHERE id = %(old_appointment_id)s AND status <> 'cancelled'
+        FOR UPDATE
+    ), new_slot AS (
+        SELECT s.id
+        FROM availability_slots s, old_appointment
+        WHERE s.id = %(new_slot_id)s AND s.status = 'available'
+        FOR UPDATE OF s SKIP LOCKED
+    ), booked AS (
+        UPDATE availability_slots s
+        SET status = 'booked'
+        FROM new_slot
+        WHERE s.id = new_slot.id
+        RETURNING s.id, s.provider_id, s.type_id, s.date, s.start_time
+    ), cancelled AS (
+        UPDATE appointments a
+        SET status = 'cancelled', updated_at = CURRENT_TIMESTAMP
+        FROM old_appointment
+        WHERE a.id = old_appointment.id AND EXISTS (SELECT 1 FROM new_slot)
+        RETURNING a.id, a.slot_id
+    ), released AS (
+        UPDATE availability_slots s
+        SET status = 'available'
+        FROM cancelled
+        WHERE s.id = cancelled.slot_id
+        RETURNING s.id
+    ), created AS (
+        INSERT INTO appointments (
+            type_id, seeker_id, provider_id, slot_id, scheduled_time, status, notes
+        )
+        SELECT COALESCE(%(type_id)s, booked.type_id, old_appointment.type_id),
+               COALESCE(%(seeker_id)s, old_appointment.seeker_id),
+               booked.provider_id, booked.id, booked.date + booked.start_time, %(status)s, %(notes)s
+        FROM booked, old_appointment
+        RETURNING *
+    )
+    SELECT created.*,
+           cancelled.id AS old_appointment_id,
+           cancelled.slot_id AS old_slot_id,
+           (SELECT COUNT(*) FROM released) > 0 AS old_slot_released
+    FROM created, cancelled
+'''
+
+# Why a reschedule changed nothing, checked in the same transaction when the statement above
+# returns no row
+OLD_APPOINTMENT_ACTIVE_SQL = '''
+    SELECT 1 FROM appointments WHERE id = %(old_appointment_id)s AND status <> 'cancelled'
+'''
+
+# reschedule_appointment outcomes
+RESCHEDULED = "rescheduled"
+SLOT_TAKEN = "slot_taken"
+OLD_APPOINTMENT_INACTIVE = "old_appointment_inactive"
+
+# Cancel an appointment and put its slot back on offer -- one statement.
+CANCEL_APPOINTMENT_SQL = '''
+    WITH cancelled AS (
+        UPDATE appointments
+        SET status = 'cancelled', updated_at = CURRENT_TIMESTAMP
+        WHERE id = %(appointment_id)s AND status <> 'cancelled'
+        RETURNING *
+    ), released AS (
+        UPDATE availability_slots s
+        SET status = 'available'
+        FROM cancelled
+        WHERE s.id = cancelled.slot_id
+        RETURNING s.id
+    )
+    SELECT cancelled.*, released.id AS released_slot_id
+    FROM cancelled
+    LEFT JOIN released ON released.id = cancelled.slot_id
+'''
+
+APPOINTMENTS_SQL = 'SELECT a.* FROM appointments a'
+
+APPOINTMENT_DETAILS_SQL = '''
+    SELECT a.*,
+           seeker.name as seeker_name, seeker.email as seeker_email,
+           provider.name as provider_name, provider.email as provider_email,
+           slot.date as slot_date, slot.start_time, slot.end_time,
+           apt_type.name as appointment_type_name
+    FROM appointments a
+    JOIN users seeker ON a.seeker_id = seeker.id
+    JOIN users provider ON a.provider_id = provider.id
+    JOIN availability_slots slot ON a.slot_id = slot.id
+    LEFT JOIN appointment_types apt_type ON a.type_id = apt_type.id
+'''
+
+# Keyset page in (scheduled_time, id) order: rows strictly after the last one seen, read in
+# index order from ix_appointments_scheduled_time_id (migration 0005), so a page costs the
+# same at any depth. Without after_id every row at after_scheduled_time is included.
+# LIMIT NULL means no limit.
+APPOINTMENT_KEYSET_SQL = '''
+    WHERE (%(after_scheduled_time)s::timestamp IS NULL
+           OR (a.scheduled_time, a.id) > (%(after_scheduled_time)s::timestamp, COALESCE(%(after_id)s::int, 0)))
+    ORDER BY a.scheduled_time, a.id
+    LIMIT %(limit)s
+'''
+
+
+def _appointment_row_to_dict(row):
+    return {
+        "appointment_id": row['id'],
+        "type_id": row['type_id'],
+        "seeker_id": row['seeker_id'],
+        "provider_id": row['provider_id'],
+        "slot_id": row['slot_id'],
+        "scheduled_time": row['scheduled_time'],
+        "status": row['status'],
+        "notes": row['notes'],
+        "created_at": row['created_at'],
+        "updated_at": row['updated_at']
+    }
+
+
+def _appointment_details_row_to_dict(row):
+    return {
+        "appointment_id": row['id'],
+        "type_id": row['type_id'],
+        "appointment_type_name": row['appointment_type_name'],
+        "seeker_id": row['seeker_id'],
+        "seeker_name": row['seeker_name'],
+        "seeker_email": row['seeker_email'],
+        "provider_id": row['provider_id'],
+        "provider_name": row['provider_name'],
+        "provider_email": row['provider_email'],
+        "slot_id": row['slot_id'],
+        "slot_date": row['slot_date'],
+        "start_time": row['start_time'],
+        "end_time": row['end_time'],
+        "scheduled_time": row['scheduled_time'],
+        "status": row['status'],
+        "notes": row['notes'],
+        "created_at": row['created_at'],
+        "updated_at": row['updated_at']
+    }
+
+
 #  The functions that can be used as a TOOL right now, given a tag $---TOOL---$
 class AppointmentDAO(BaseDAO):
     """Data Access Object for Appointment operations"""
@@ -45,7 +215,130 @@ class AppointmentDAO(BaseDAO):
         finally:
             conn.close()
 
+    # $---TOOL---$
+    def book_slot_atomically(self, seeker_id, slot_id, type_id=None, status='booked', notes=None):
+        """
+        Book an availability slot in a single transaction.
+        The slot row is locked and re-checked, marked as booked and the appointment is inserted.
+        provider, scheduled time and (unless given) type are taken from the slot itself.
+        Returns the created Appointment, or None if the slot is no longer available
+        (already booked, blocked, deleted or being booked by a concurrent session).
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+
+        try:
+            cursor.execute(BOOK_SLOT_ATOMICALLY_SQL, {
+                "slot_id": slot_id,
+                "seeker_id": seeker_id,
+                "type_id": type_id,
+                "status": status,
+                "notes": notes,
+            })
+            row = cursor.fetchone()
+            conn.commit()
+
+            if row is None:
+                return None
+            return Appointment(
+                appointment_id=row['id'],
+                type_id=row['type_id'],
+                seeker_id=row['seeker_id'],
+                provider_id=row['provider_id'],
+                slot_id=row['slot_id'],
+                scheduled_time=row['scheduled_time'],
+                status=row['status'],
+                notes=row['notes'],
+                created_at=row['created_at'],
+                updated_at=row['updated_at']
+            )
+        finally:
+            conn.close()
+
+    # $---TOOL---$
+    def reschedule_appointment(self, old_appointment_id, new_slot_id, seeker_id=None, type_id=None,
+                               status='booked', notes=None):
+        """
+        Move an appointment to a new slot in a single transaction:
+        cancel the old appointment, release its slot, book the new slot and create the new appointment.
+        seeker and type default to the old appointment's.
+        Returns {"outcome": RESCHEDULED, "appointment": Appointment, "old_appointment_id", "old_slot_id",
+        "old_slot_released"}, or {"outcome", "appointment": None} if nothing was changed:
+        SLOT_TAKEN (new slot no longer available) or OLD_APPOINTMENT_INACTIVE (missing/already cancelled).
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+
+        try:
+            cursor.execute(RESCHEDULE_APPOINTMENT_SQL, {
+                "old_appointment_id": old_appointment_id,
+                "new_slot_id": new_slot_id,
+                "seeker_id": seeker_id,
+                "type_id": type_id,
+                "status": status,
+                "notes": notes,
+            })
+            row = cursor.fetchone()
+            if row is None:
+                cursor.execute(OLD_APPOINTMENT_ACTIVE_SQL, {"old_appointment_id": old_appointment_id})
+                outcome = SLOT_TAKEN if cursor.fetchone() else OLD_APPOINTMENT_INACTIVE
+            conn.commit()
+
+            if row is None:
+                return {"outcome": outcome, "appointment": None}
+            return {
+                "outcome": RESCHEDULED,
+                "appointment": Appointment(
+                    appointment_id=row['id'],
+                    type_id=row['type_id'],
+                    seeker_id=row['seeker_id'],
+                    provider_id=row['provider_id'],
+                    slot_id=row['slot_id'],
+                    scheduled_time=row['scheduled_time'],
+                    status=row['status'],
+                    notes=row['notes'],
+                    created_at=row['created_at'],
+                    updated_at=row['updated_at']
+                ),
+                "old_appointment_id": row['old_appointment_id'],
+                "old_slot_id": row['old_slot_id'],
+                "old_slot_released": row['old_slot_released']
+            }
+        finally:
+            conn.close()
+
+    # $---TOOL---$
+    def cancel_appointment(self, appointment_id):
+        """
+        Cancel an appointment and mark its slot as available again in a single transaction.
+        Returns the cancelled appointment (plus "released_slot_id"),
+        or None if the appointment does not exist or is already cancelled.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
+        try:
+            cursor.execute(CANCEL_APPOINTMENT_SQL, {"appointment_id": appointment_id})
+            row = cursor.fetchone()
+            conn.commit()
+
+            if row is None:
+                return None
+            return {
+                "appointment_id": row['id'],
+                "type_id": row['type_id'],
+                "seeker_id": row['seeker_id'],
+                "provider_id": row['provider_id'],
+                "slot_id": row['slot_id'],
+                "scheduled_time": row['scheduled_time'],
+                "status": row['status'],
+                "notes": row['notes'],
+                "created_at": row['created_at'],
+                "updated_at": row['updated_at'],
+                "released_slot_id": row['released_slot_id']
+            }
+        finally:
+            conn.close()
     
     def get_by_id(self, appointment_id):
         """Get appointment by ID"""
@@ -82,25 +375,19 @@ class AppointmentDAO(BaseDAO):
         
         try:
             cursor.execute('SELECT * FROM appointments ORDER BY scheduled_time')
-            rows = cursor.fetchall()
-            
-            appointments = []
-            for row in rows:
-                appointments.append({
-                    "appointment_id":row['id'],
-                    "type_id":row['type_id'],
-                    "seeker_id":row['seeker_id'],
-                    "provider_id":row['provider_id'],
-                    "slot_id":row['slot_id'],
-                    "scheduled_time":row['scheduled_time'],
-                    "status":row['status'],
-                    "notes":row['notes'],
-                    "created_at":row['created_at'],
-                    "updated_at":row['updated_at']
-                })
-            return appointments
+            return [_appointment_row_to_dict(row) for row in cursor.fetchall()]
         finally:
             conn.close()
+
+    def iter_all(self, after_scheduled_time=None, after_id=None, limit=None, itersize=None):
+        """
+        Stream appointments ordered by (scheduled_time, id), as get_all dicts.
+        Keyset pagination: pass the scheduled_time and appointment_id of the last row seen to
+        continue after it, and limit to stop after that many rows.
+        """
+        params = {"after_scheduled_time": after_scheduled_time, "after_id": after_id, "limit": limit}
+        for row in self._stream(APPOINTMENTS_SQL + APPOINTMENT_KEYSET_SQL, params, itersize):
+            yield _appointment_row_to_dict(row)
     
     def update(self, appointment_id, status):
         """Update appointment"""
@@ -238,72 +525,21 @@ class AppointmentDAO(BaseDAO):
         cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
         
         try:
-            query = '''
-                SELECT a.*, 
-                       seeker.name as seeker_name, seeker.email as seeker_email,
-                       provider.name as provider_name, provider.email as provider_email,
-                       slot.date as slot_date, slot.start_time, slot.end_time,
-                       apt_type.name as appointment_type_name
-                FROM appointments a
-                JOIN users seeker ON a.seeker_id = seeker.id
-                JOIN users provider ON a.provider_id = provider.id
-                JOIN availability_slots slot ON a.slot_id = slot.id
-                LEFT JOIN appointment_types apt_type ON a.type_id = apt_type.id
-            '''
-            
             if appointment_id:
-                query += ' WHERE a.id = %s'
-                cursor.execute(query, (appointment_id,))
+                cursor.execute(APPOINTMENT_DETAILS_SQL + ' WHERE a.id = %s', (appointment_id,))
                 row = cursor.fetchone()
-                if row:
-                    return {
-                        "appointment_id": row['id'],
-                        "type_id": row['type_id'],
-                        "appointment_type_name": row['appointment_type_name'],
-                        "seeker_id": row['seeker_id'],
-                        "seeker_name": row['seeker_name'],
-                        "seeker_email": row['seeker_email'],
-                        "provider_id": row['provider_id'],
-                        "provider_name": row['provider_name'],
-                        "provider_email": row['provider_email'],
-                        "slot_id": row['slot_id'],
-                        "slot_date": row['slot_date'],
-                        "start_time": row['start_time'],
-                        "end_time": row['end_time'],
-                        "scheduled_time": row['scheduled_time'],
-                        "status": row['status'],
-                        "notes": row['notes'],
-                        "created_at": row['created_at'],
-                        "updated_at": row['updated_at']
-                    }
-                return None
+                return _appointment_details_row_to_dict(row) if row else None
             else:
-                query += ' ORDER BY a.scheduled_time'
-                cursor.execute(query)
-                rows = cursor.fetchall()
-                
-                appointments = []
-                for row in rows:
-                    appointments.append({
-                        "appointment_id": row['id'],
-                        "type_id": row['type_id'],
-                        "appointment_type_name": row['appointment_type_name'],
-                        "seeker_id": row['seeker_id'],
-                        "seeker_name": row['seeker_name'],
-                        "seeker_email": row['seeker_email'],
-                        "provider_id": row['provider_id'],
-                        "provider_name": row['provider_name'],
-                        "provider_email": row['provider_email'],
-                        "slot_id": row['slot_id'],
-                        "slot_date": row['slot_date'],
-                        "start_time": row['start_time'],
-                        "end_time": row['end_time'],
-                        "scheduled_time": row['scheduled_time'],
-                        "status": row['status'],
-                        "notes": row['notes'],
-                        "created_at": row['created_at'],
-                        "updated_at": row['updated_at']
-                    })
-                return appointments
+                cursor.execute(APPOINTMENT_DETAILS_SQL + ' ORDER BY a.scheduled_time')
+                return [_appointment_details_row_to_dict(row) for row in cursor.fetchall()]
         finally:
             conn.close()
+
+    def iter_appointments_with_details(self, after_scheduled_time=None, after_id=None, limit=None, itersize=None):
+        """
+        Stream get_appointments_with_details() rows ordered by (scheduled_time, id), with the
+        same keyset arguments as iter_all
+        """
+        params = {"after_scheduled_time": after_scheduled_time, "after_id": after_id, "limit": limit}
+        for row in self._stream(APPOINTMENT_DETAILS_SQL + APPOINTMENT_KEYSET_SQL, params, itersize):
+            yield _appointment_details_row_to_dict(row)
@@ -0,0 +1,209 @@
+from .async_base_dao import AsyncBaseDAO
+from .appointment_dao import (
+    Appointment, BOOK_SLOT_ATOMICALLY_SQL, RESCHEDULE_APPOINTMENT_SQL, CANCEL_APPOINTMENT_SQL,
+    APPOINTMENTS_SQL, APPOINTMENT_DETAILS_SQL, APPOINTMENT_KEYSET_SQL,
+    OLD_APPOINTMENT_ACTIVE_SQL, RESCHEDULED, SLOT_TAKEN, OLD_APPOINTMENT_INACTIVE,
+    _appointment_row_to_dict, _appointment_details_row_to_dict
+)
+from psycopg.rows import dict_row
+
+
+def _appointment_row_to_object(row):
+    return Appointment(
+        appointment_id=row['id'],
+        type_id=row['type_id'],
+        seeker_id=row['seeker_id'],
+        provider_id=row['provider_id'],
+        slot_id=row['slot_id'],
+        scheduled_time=row['scheduled_time'],
+        status=row['status'],
+        notes=row['notes'],
+        created_at=row['created_at'],
+        updated_at=row['updated_at']
+    )
+
+
+class AsyncAppointmentDAO(AsyncBaseDAO):
+    """Async Data Access Object for Appointment operations (same surface as AppointmentDAO)"""
+
+    async def create(self, appointment):
+        """Create a new appointment"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('''
+                    INSERT INTO appointments (
+                        type_id, seeker_id, provider_id, slot_id, scheduled_time, status, notes
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    RETURNING id
+                ''', (appointment.type_id, appointment.seeker_id, appointment.provider_id,
+                      appointment.slot_id, appointment.scheduled_time, appointment.status,
+                      appointment.notes))
+                appointment.id = (await cursor.fetchone())['id']
+                return appointment
+
+    async def book_slot_atomically(self, seeker_id, slot_id, type_id=None, status='booked', notes=None):
+        """
+        Book an availability slot in a single transaction (see AppointmentDAO.book_slot_atomically).
+        Returns the created Appointment, or None if the slot is no longer available.
+        """
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute(BOOK_SLOT_ATOMICALLY_SQL, {
+                    "slot_id": slot_id,
+                    "seeker_id": seeker_id,
+                    "type_id": type_id,
+                    "status": status,
+                    "notes": notes,
+                })
+                row = await cursor.fetchone()
+                return _appointment_row_to_object(row) if row else None
+
+    async def reschedule_appointment(self, old_appointment_id, new_slot_id, seeker_id=None, type_id=None,
+                                     status='booked', notes=None):
+        """
+        Move an appointment to a new slot in a single transaction (see AppointmentDAO.reschedule_appointment).
+        Returns the outcome with the new appointment and the old ids, or the outcome
+        (SLOT_TAKEN / OLD_APPOINTMENT_INACTIVE) and appointment None if nothing was changed.
+        """
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute(RESCHEDULE_APPOINTMENT_SQL, {
+                    "old_appointment_id": old_appointment_id,
+                    "new_slot_id": new_slot_id,
+                    "seeker_id": seeker_id,
+                    "type_id": type_id,
+                    "status": status,
+                    "notes": notes,
+                })
+                row = await cursor.fetchone()
+                if row is None:
+                    await cursor.execute(OLD_APPOINTMENT_ACTIVE_SQL, {"old_appointment_id": old_appointment_id})
+                    outcome = SLOT_TAKEN if await cursor.fetchone() else OLD_APPOINTMENT_INACTIVE
+                    return {"outcome": outcome, "appointment": None}
+                return {
+                    "outcome": RESCHEDULED,
+                    "appointment": _appointment_row_to_object(row),
+                    "old_appointment_id": row['old_appointment_id'],
+                    "old_slot_id": row['old_slot_id'],
+                    "old_slot_released": row['old_slot_released']
+                }
+
+    async def cancel_appointment(self, appointment_id):
+        """
+        Cancel an appointment and release its slot in a single transaction (see AppointmentDAO.cancel_appointment).
+        Returns the cancelled appointment (plus "released_slot_id"), or None.
+        """
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute(CANCEL_APPOINTMENT_SQL, {"appointment_id": appointment_id})
+                row = await cursor.fetchone()
+                if row is None:
+                    return None
+                return {**_appointment_row_to_dict(row), "released_slot_id": row['released_slot_id']}
+
+    async def get_by_id(self, appointment_id):
+        """Get appointment by ID"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('SELECT * FROM appointments WHERE id = %s', (appointment_id,))
+                row = await cursor.fetchone()
+                return _appointment_row_to_dict(row) if row else None
+
+    async def get_all(self):
+        """Get all appointments"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('SELECT * FROM appointments ORDER BY scheduled_time')
+                return [_appointment_row_to_dict(row) for row in await cursor.fetchall()]
+
+    async def iter_all(self, after_scheduled_time=None, after_id=None, limit=None, itersize=None):
+        """Stream appointments ordered by (scheduled_time, id); keyset arguments as AppointmentDAO.iter_all"""
+        params = {"after_scheduled_time": after_scheduled_time, "after_id": after_id, "limit": limit}
+        async for row in self._stream(APPOINTMENTS_SQL + APPOINTMENT_KEYSET_SQL, params, itersize):
+            yield _appointment_row_to_dict(row)
+
+    async def update(self, appointment_id, status):
+        """Update appointment"""
+        if not appointment_id:
+            return None
+
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('''
+                    UPDATE appointments
+                    SET status = %s, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                ''', (status, appointment_id))
+                return True if cursor.rowcount > 0 else None
+
+    async def delete(self, appointment_id):
+        """Delete appointment by ID"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('DELETE FROM appointments WHERE id = %s', (appointment_id,))
+                return cursor.rowcount > 0
+
+    async def get_by_provider(self, provider_id, status=None):
+        """Get appointments for a specific provider, optionally filter by status"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                if status:
+                    await cursor.execute('''
+                        SELECT * FROM appointments
+                        WHERE provider_id = %s AND status = %s
+                        ORDER BY scheduled_time
+                    ''', (provider_id, status))
+                else:
+                    await cursor.execute('''
+                        SELECT * FROM appointments
+                        WHERE provider_id = %s
+                        ORDER BY scheduled_time
+                    ''', (provider_id,))
+                return [_appointment_row_to_object(row) for row in await cursor.fetchall()]
+
+    async def get_by_seeker(self, seeker_id, status=None):
+        """Get appointments for a specific seeker, optionally filter by status"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                if status:
+                    await cursor.execute('''
+                        SELECT * FROM appointments
+                        WHERE seeker_id = %s AND status = %s
+                        ORDER BY scheduled_time
+                    ''', (seeker_id, status))
+                else:
+                    await cursor.execute('''
+                        SELECT * FROM appointments
+                        WHERE seeker_id = %s
+                        ORDER BY scheduled_time
+                    ''', (seeker_id,))
+                return [_appointment_row_to_object(row) for row in await cursor.fetchall()]
+
+    async def update_status(self, appointment_id, new_status):
+        """Update appointment status"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('''
+                    UPDATE appointments
+                    SET status = %s, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                ''', (new_status, appointment_id))
+                return cursor.rowcount > 0
+
+    async def get_appointments_with_details(self, appointment_id=None):
+        """Get appointment with full details including user names and slot info"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                if appointment_id:
+                    await cursor.execute(APPOINTMENT_DETAILS_SQL + ' WHERE a.id = %s', (appointment_id,))
+                    row = await cursor.fetchone()
+                    return _appointment_details_row_to_dict(row) if row else None
+
+                await cursor.execute(APPOINTMENT_DETAILS_SQL + ' ORDER BY a.scheduled_time')
+                return [_appointment_details_row_to_dict(row) for row in await cursor.fetchall()]
+
+    async def iter_appointments_with_details(self, after_scheduled_time=None, after_id=None, limit=None, itersize=None):
+        """Stream get_appointments_with_details() rows ordered by (scheduled_time, id), keyset as iter_all"""
+        params = {"after_scheduled_time": after_scheduled_time, "after_id": after_id, "limit": limit}
+        async for row in self._stream(APPOINTMENT_DETAILS_SQL + APPOINTMENT_KEYSET_SQL, params, itersize):
+            yield _appointment_details_row_to_dict(row)
@@ -0,0 +1,206 @@
+from .async_base_dao import AsyncBaseDAO
+from .availability_dao import (
+    AvailabilitySlot, SLOT_KEYSET_SQL, SLOT_IMPORT_COLUMNS, SLOT_IMPORT_TABLE_SQL, _slot_row_to_object,
+    read_csv_header, slot_import_copy_sql, slot_import_insert_sql
+)
+from datetime import datetime, timedelta
+from psycopg.rows import dict_row
+
+
+class AsyncAvailabilityDAO(AsyncBaseDAO):
+    """Async Data Access Object for Availability Slot operations (same surface as AvailabilityDAO)"""
+
+    async def create(self, slot):
+        """Create a new availability slot"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('''
+                    INSERT INTO availability_slots (provider_id, date, start_time, end_time, status)
+                    VALUES (%s, %s, %s, %s, %s)
+                    RETURNING id
+                ''', (slot.provider_id, slot.date, slot.start_time, slot.end_time, slot.status))
+                slot.id = (await cursor.fetchone())['id']
+                return slot
+
+    async def create_many(self, slots, on_conflict="ignore"):
+        """Create many availability slots in one transaction with COPY; same result as AvailabilityDAO.create_many"""
+        insert_sql = slot_import_insert_sql(on_conflict)
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute(SLOT_IMPORT_TABLE_SQL)
+                received = 0
+                async with cursor.copy(f"COPY slot_import ({', '.join(SLOT_IMPORT_COLUMNS)}) FROM STDIN") as copy:
+                    for slot in slots:
+                        await copy.write_row((slot.provider_id, slot.type_id, slot.date, slot.start_time,
+                                              slot.end_time, slot.status))
+                        received += 1
+                await cursor.execute(insert_sql)
+                ids = [row['id'] for row in await cursor.fetchall()]
+                return {"inserted": len(ids), "skipped": received - len(ids), "ids": ids}
+
+    async def create_many_from_csv(self, file, columns=None, on_conflict="ignore", chunk_size=64 * 1024):
+        """create_many for CSV rows read from a file object, as AvailabilityDAO.create_many_from_csv"""
+        columns = list(columns or read_csv_header(file))
+        copy_sql = slot_import_copy_sql(columns)
+        insert_sql = slot_import_insert_sql(on_conflict)
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute(SLOT_IMPORT_TABLE_SQL)
+                async with cursor.copy(copy_sql) as copy:
+                    while data := file.read(chunk_size):
+                        await copy.write(data)
+                received = cursor.rowcount
+                await cursor.execute(insert_sql)
+                ids = [row['id'] for row in await cursor.fetchall()]
+                return {"inserted": len(ids), "skipped": received - len(ids), "ids": ids}
+
+    async def get_slots_by_date_overlapping_time_range(
+        self, date, start_time, end_time=None, status="available", service_name=None
+    ):
+        """
+        Get availability slots that overlap with a given time range on a specific date,
+        joined with users (provider_id → users.id).
+        If service_name is provided, it will join with appointment_types (type_id → appointment_types.id)
+        and filter by service_name (case-insensitive, partial match).
+        """
+        # If end_time not provided, default to start_time + 1 hour
+        if not end_time:
+            start_dt = datetime.strptime(start_time, "%H:%M")
+            end_dt = start_dt + timedelta(hours=1)
+            end_time = end_dt.strftime("%H:%M")
+
+        # canonical interval overlap: slot.start < end AND slot.end > start
+        overlap = (end_time, start_time)
+
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                if service_name:
+                    await cursor.execute(
+                        """
+                        SELECT s.*, u.name, u.email, u.phone, u.preferences, at.name AS service_name
+                        FROM availability_slots s
+                        JOIN users u ON s.provider_id = u.id
+                        JOIN appointment_types at ON at.id = s.type_id
+                        WHERE at.name ILIKE %s
+                        AND s.date = %s
+                        AND s.status = %s
+                        AND s.start_time < %s
+                        AND s.end_time > %s
+                        ORDER BY s.start_time
+                        """,
+                        (f"%{service_name}%", date, status) + overlap,
+                    )
+                else:
+                    await cursor.execute(
+                        """
+                        SELECT s.*, u.name, u.email, u.phone, u.preferences, at.name AS service_name
+                        FROM availability_slots s
+                        JOIN users u ON s.provider_id = u.id
+                        JOIN appointment_types at ON at.id = s.type_id
+                        WHERE s.date = %s
+                        AND s.status = %s
+                        AND s.start_time < %s
+                        AND s.end_time > %s
+                        ORDER BY s.start_time
+                        """,
+                        (date, status) + overlap,
+                    )
+
+                slots = []
+                for row in await cursor.fetchall():
+                    slots.append(
+                        {
+                            "slot_id": row["id"],
+                            "provider_id": row["provider_id"],
+                            "date": row["date"],
+                            "start_time": row["start_time"],
+                            "end_time": row["end_time"],
+                            "status": row["status"],
+                            "provider_name": row["name"],
+                            "provider_email": row["email"],
+                            "provider_ph_no": row["phone"],
+                            "provider_pref": row["preferences"],
+                            "service_name": row["service_name"],
+                        }
+                    )
+                return slots
+
+    async def get_available_slots_by_provider(self, provider_id, start_date, end_date):
+        """Get available slots for a provider within date range"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('''
+                    SELECT * FROM availability_slots
+                    WHERE provider_id = %s
+                    AND date >= %s
+                    AND date <= %s
+                    AND status = 'available'
+                    ORDER BY date, start_time
+                ''', (provider_id, start_date, end_date))
+
+                slots = []
+                for row in await cursor.fetchall():
+                    slots.append({
+                        "slot_id": row['id'],
+                        "provider_id": row['provider_id'],
+                        "date": row['date'],
+                        "start_time": row['start_time'],
+                        "end_time": row['end_time'],
+                        "status": row['status'],
+                        "created_at": row['created_at']
+                    })
+                return slots
+
+    async def update_slot_status(self, slot_id, status):
+        """Update slot status (available, booked, blocked)"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('''
+                    UPDATE availability_slots
+                    SET status = %s
+                    WHERE id = %s
+                ''', (status, slot_id))
+                return cursor.rowcount > 0
+
+    async def update(self, slot):
+        """Update availability slot"""
+        if not slot.id:
+            return None
+
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('''
+                    UPDATE availability_slots
+                    SET provider_id = %s, date = %s, start_time = %s, end_time = %s, status = %s
+                    WHERE id = %s
+                ''', (slot.provider_id, slot.date, slot.start_time, slot.end_time,
+                      slot.status, slot.id))
+                return slot if cursor.rowcount > 0 else None
+
+    async def delete(self, slot_id):
+        """Delete availability slot by ID"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('DELETE FROM availability_slots WHERE id = %s', (slot_id,))
+                return cursor.rowcount > 0
+
+    async def get_by_id(self, slot_id):
+        """Get availability slot by ID"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('SELECT * FROM availability_slots WHERE id = %s', (slot_id,))
+                row = await cursor.fetchone()
+                return _slot_row_to_object(row) if row else None
+
+    async def get_all(self):
+        """Get all availability slots"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('SELECT * FROM availability_slots')
+                return [_slot_row_to_object(row) for row in await cursor.fetchall()]
+
+    async def iter_all(self, after_id=None, limit=None, itersize=None):
+        """Stream availability slots in id order; keyset arguments as AvailabilityDAO.iter_all"""
+        params = {"after_id": after_id, "limit": limit}
+        async for row in self._stream(SLOT_KEYSET_SQL, params, itersize):
+            yield _slot_row_to_object(row)
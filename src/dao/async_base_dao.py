@@ -0,0 +1,44 @@
+from psycopg.rows import dict_row
+
+from telemetry import trace_methods
+from .database import STREAM_ITERSIZE
+
+
+class AsyncBaseDAO:
+    """Base class for all async Data Access Objects"""
+
+    def __init_subclass__(cls, **kwargs):
+        # same "dao.<Class>.<method>" spans as BaseDAO
+        super().__init_subclass__(**kwargs)
+        trace_methods(cls, "dao")
+
+    def __init__(self, database):
+        self.database = database
+
+    def get_connection(self):
+        """Get a pooled async connection (use as `async with self.get_connection() as conn`)"""
+        return self.database.get_connection()
+
+    async def _stream(self, query, params=None, itersize=None):
+        """Async twin of BaseDAO._stream: dict rows from a server-side cursor, itersize per round trip"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(name=f"{type(self).__name__.lower()}_stream", row_factory=dict_row) as cursor:
+                cursor.itersize = itersize or STREAM_ITERSIZE
+                await cursor.execute(query, params)
+                async for row in cursor:
+                    yield row
+
+    async def create(self, entity):
+        raise NotImplementedError("Subclasses must implement create method")
+
+    async def get_by_id(self, entity_id):
+        raise NotImplementedError("Subclasses must implement get_by_id method")
+
+    async def get_all(self):
+        raise NotImplementedError("Subclasses must implement get_all method")
+
+    async def update(self, entity):
+        raise NotImplementedError("Subclasses must implement update method")
+
+    async def delete(self, entity_id):
+        raise NotImplementedError("Subclasses must implement delete method")
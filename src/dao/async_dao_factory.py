@@ -0,0 +1,55 @@
+from .async_database import AsyncDatabase
+from .async_provider_dao import AsyncProviderDAO
+from .async_service_dao import AsyncServiceDAO
+from .async_availability_dao import AsyncAvailabilityDAO
+from .async_appointment_dao import AsyncAppointmentDAO
+from .async_transcript_dao import AsyncTranscriptDAO
+
+class AsyncDAOFactory:
+    """Factory class for creating async DAO instances"""
+
+    def __init__(self):
+        self.database = AsyncDatabase()
+        self._provider_dao = None
+        self._service_dao = None
+        self._availability_dao = None
+        self._appointment_dao = None
+        self._transcript_dao = None
+
+    def get_provider_dao(self):
+        """Get async Provider DAO instance"""
+        if self._provider_dao is None:
+            self._provider_dao = AsyncProviderDAO(self.database)
+        return self._provider_dao
+
+    def get_service_dao(self):
+        """Get async Service DAO instance"""
+        if self._service_dao is None:
+            self._service_dao = AsyncServiceDAO(self.database)
+        return self._service_dao
+
+    def get_availability_dao(self):
+        """Get async Availability DAO instance"""
+        if self._availability_dao is None:
+            self._availability_dao = AsyncAvailabilityDAO(self.database)
+        return self._availability_dao
+
+    def get_appointment_dao(self):
+        """Get async Appointment DAO instance"""
+        if self._appointment_dao is None:
+            self._appointment_dao = AsyncAppointmentDAO(self.database)
+        return self._appointment_dao
+
+    def get_transcript_dao(self):
+        """Get async Transcript DAO instance"""
+        if self._transcript_dao is None:
+            self._transcript_dao = AsyncTranscriptDAO(self.database)
+        return self._transcript_dao
+
+    async def get_pool_stats(self):
+        """Get async connection pool statistics"""
+        return await self.database.pool_stats()
+
+    async def close_connections(self):
+        """No-op kept for callers: the pool is process-wide and closed at app shutdown (close_async_pools)"""
+        await self.database.close()
@@ -0,0 +1,96 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool
+
+from telemetry import TracedAsyncCursor, current_span
+from .database import DB_CONFIG, POOL_CONFIG
+
+
+def _conninfo(db_config):
+    """Build a libpq conninfo string from the psycopg2-style DB_CONFIG dict"""
+    params = dict(db_config)
+    if 'database' in params:
+        params['dbname'] = params.pop('database')
+    return make_conninfo(**params)
+
+
+# One async pool per distinct db_config, shared by every AsyncDatabase in the process
+_pools = {}
+_pools_lock = asyncio.Lock()
+
+
+def _pool_key(db_config):
+    return tuple(sorted(db_config.items()))
+
+
+async def _configure(conn):
+    """New pool connections trace their statements as db.query spans"""
+    conn.cursor_factory = TracedAsyncCursor
+
+
+class AsyncDatabase:
+    """Async counterpart of Database, backed by a psycopg 3 AsyncConnectionPool"""
+
+    def __init__(self, db_config=DB_CONFIG, pool_config=POOL_CONFIG):
+        self.db_config = db_config
+        self.pool_config = pool_config
+
+    async def get_pool(self):
+        """Process-wide async pool for this db_config (opened lazily on first use)"""
+        key = _pool_key(self.db_config)
+        pool = _pools.get(key)
+        if pool is not None and not pool.closed:
+            return pool
+
+        async with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None or pool.closed:
+                kwargs = {}
+                if self.pool_config.get('statement_timeout_ms'):
+                    kwargs['options'] = "-c statement_timeout=%d" % self.pool_config['statement_timeout_ms']
+                pool = AsyncConnectionPool(
+                    _conninfo(self.db_config),
+                    kwargs=kwargs,
+                    min_size=self.pool_config.get('min_size', 1),
+                    max_size=self.pool_config.get('max_size', 10),
+                    timeout=self.pool_config.get('acquire_timeout', 10.0),
+                    max_lifetime=self.pool_config.get('max_lifetime', 1800.0),
+                    check=AsyncConnectionPool.check_connection,
+                    configure=_configure,
+                    open=False,
+                )
+                await pool.open()
+                _pools[key] = pool
+            return pool
+
+    @asynccontextmanager
+    async def get_connection(self):
+        """
+        Borrow a connection from the pool.
+        The transaction is committed when the block exits normally and rolled back on error.
+        """
+        pool = await self.get_pool()
+        started = time.perf_counter()
+        async with pool.connection() as conn:
+            current_span().set_attribute("db.acquire_ms", (time.perf_counter() - started) * 1000)
+            yield conn
+
+    async def pool_stats(self):
+        """Expose pool counters (pool_size, pool_available, requests_waiting, ...)"""
+        pool = await self.get_pool()
+        return pool.get_stats()
+
+    async def close(self):
+        """No-op: the pool is process-wide (see close_async_pools, application shutdown only)"""
+
+
+async def close_async_pools():
+    """Close every process-wide async pool; application shutdown only (see close_pools)"""
+    async with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        await pool.close()
@@ -0,0 +1,77 @@
+from .async_base_dao import AsyncBaseDAO
+from .provider_dao import Provider
+from psycopg.rows import dict_row
+
+
+def _provider_row_to_object(row):
+    return Provider(
+        provider_id=row['id'],
+        name=row['name'],
+        email=row['email'],
+        location=row['location'],
+        specialties=row['specialties']
+    )
+
+
+class AsyncProviderDAO(AsyncBaseDAO):
+    """Async Data Access Object for Provider operations (same surface as ProviderDAO)"""
+
+    async def create(self, provider):
+        """Create a new provider"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('''
+                    INSERT INTO providers (name, email, location, specialties)
+                    VALUES (%s, %s, %s, %s)
+                    RETURNING id
+                ''', (provider.name, provider.email, provider.location, provider.specialties))
+                provider.id = (await cursor.fetchone())['id']
+                return provider
+
+    async def get_by_id(self, provider_id):
+        """Get provider by ID"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('SELECT * FROM providers WHERE id = %s', (provider_id,))
+                row = await cursor.fetchone()
+                return _provider_row_to_object(row) if row else None
+
+    async def get_all(self):
+        """Get all providers"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('SELECT * FROM providers')
+                return [_provider_row_to_object(row) for row in await cursor.fetchall()]
+
+    async def update(self, provider):
+        """Update provider information"""
+        if not provider.id:
+            return None
+
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('''
+                    UPDATE providers
+                    SET name = %s, email = %s, location = %s, specialties = %s
+                    WHERE id = %s
+                ''', (provider.name, provider.email, provider.location,
+                      provider.specialties, provider.id))
+                return provider if cursor.rowcount > 0 else None
+
+    async def delete(self, provider_id):
+        """Delete provider by ID"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('DELETE FROM providers WHERE id = %s', (provider_id,))
+                return cursor.rowcount > 0
+
+    async def find_by_service_type(self, service_type):
+        """Find providers who offer a specific service type"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('''
+                    SELECT DISTINCT p.* FROM providers p
+                    JOIN services s ON p.id = s.provider_id
+                    WHERE s.name ILIKE %s OR p.specialties ILIKE %s
+                ''', (f'%{service_type}%', f'%{service_type}%'))
+                return [_provider_row_to_object(row) for row in await cursor.fetchall()]
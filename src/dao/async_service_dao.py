@@ -0,0 +1,127 @@
+from .async_base_dao import AsyncBaseDAO
+from .service_dao import Service, SEARCH_SERVICES_SQL, SERVICE_NAMES_KEY, service_catalogue_cache
+from psycopg.rows import dict_row
+
+
+def _service_row_to_object(row):
+    return Service(
+        service_id=row['id'],
+        provider_id=row['provider_id'],
+        name=row['name'],
+        duration_minutes=row['duration_minutes'],
+        price=row['price']
+    )
+
+
+class AsyncServiceDAO(AsyncBaseDAO):
+    """Async Data Access Object for Service operations (same surface as ServiceDAO)"""
+
+    async def create(self, service):
+        """Create a new service"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('''
+                    INSERT INTO services (provider_id, name, duration_minutes, price)
+                    VALUES (%s, %s, %s, %s)
+                    RETURNING id
+                ''', (service.provider_id, service.name, service.duration_minutes, service.price))
+                service.id = (await cursor.fetchone())['id']
+                return service
+
+    async def get_by_id(self, service_id):
+        """Get service by ID"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('SELECT * FROM services WHERE id = %s', (service_id,))
+                row = await cursor.fetchone()
+                return _service_row_to_object(row) if row else None
+
+    async def get_all(self):
+        """Get all services"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('SELECT * FROM services')
+                return [_service_row_to_object(row) for row in await cursor.fetchall()]
+
+    async def get_all_service_names(self):
+        """Get all services (served from the same process-wide catalogue cache as ServiceDAO)"""
+        found, names = service_catalogue_cache.get(SERVICE_NAMES_KEY)
+        if found:
+            return list(names)
+
+        generation = service_catalogue_cache.generation()
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('SELECT * FROM appointment_types')
+                names = [row['name'] for row in await cursor.fetchall()]
+        service_catalogue_cache.set(SERVICE_NAMES_KEY, names, generation)
+        return list(names)
+
+    async def search_services(self, query, limit=5, min_similarity=0.3):
+        """
+        Fuzzy-search appointment types by name (see ServiceDAO.search_services).
+        Returns [{"type_id", "service_name", "similarity"}], best first.
+        """
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute("SELECT set_config('pg_trgm.similarity_threshold', %s, true)", (str(min_similarity),))
+                await cursor.execute(SEARCH_SERVICES_SQL, {"query": query, "limit": limit})
+                return [
+                    {"type_id": row['id'], "service_name": row['name'], "similarity": float(row['score'])}
+                    for row in await cursor.fetchall()
+                ]
+
+    async def update(self, service):
+        """Update service information"""
+        if not service.id:
+            return None
+
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('''
+                    UPDATE services
+                    SET provider_id = %s, name = %s, duration_minutes = %s, price = %s
+                    WHERE id = %s
+                ''', (service.provider_id, service.name, service.duration_minutes,
+                      service.price, service.id))
+                return service if cursor.rowcount > 0 else None
+
+    async def delete(self, service_id):
+        """Delete service by ID"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('DELETE FROM services WHERE id = %s', (service_id,))
+                return cursor.rowcount > 0
+
+    async def get_by_provider(self, provider_id):
+        """Get all services for a specific provider"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('SELECT * FROM services WHERE provider_id = %s', (provider_id,))
+                return [_service_row_to_object(row) for row in await cursor.fetchall()]
+
+    async def find_matching_services(self, service_type):
+        """Find services that match the service type"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute('''
+                    SELECT s.*, p.name as provider_name, p.email, p.location, p.specialties
+                    FROM services s
+                    JOIN providers p ON s.provider_id = p.id
+                    WHERE s.name ILIKE %s OR p.specialties ILIKE %s
+                ''', (f'%{service_type}%', f'%{service_type}%'))
+
+                services = []
+                for row in await cursor.fetchall():
+                    services.append({
+                        "service_id": row['id'],
+                        "provider_id": row['provider_id'],
+                        "provider_name": row['provider_name'],
+                        "provider_email": row['email'],
+                        "location": row['location'],
+                        "specialties": row['specialties'],
+                        "service_name": row['name'],
+                        "duration_minutes": row['duration_minutes'],
+                        "price": row['price']
+                    })
+                return services
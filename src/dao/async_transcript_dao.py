@@ -0,0 +1,27 @@
+from .async_base_dao import AsyncBaseDAO
+from .transcript_dao import TRANSCRIPT_PAGE_SQL, transcript_rows, transcript_page
+from psycopg.rows import dict_row
+
+
+class AsyncTranscriptDAO(AsyncBaseDAO):
+    """Async Data Access Object for the chat transcript (same surface as TranscriptDAO)"""
+
+    async def append(self, session_id, user_id, messages):
+        """Append [{"role", "content"}, ...] to the session's transcript"""
+        if not messages:
+            return 0
+        async with self.get_connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany('''
+                    INSERT INTO chat_transcripts (session_id, user_id, role, content) VALUES (%s, %s, %s, %s)
+                ''', transcript_rows(session_id, user_id, messages))
+        return len(messages)
+
+    async def get_page(self, session_id, user_id=None, limit=50, before_id=None):
+        """The `limit` most recent messages of a session older than before_id, oldest first"""
+        async with self.get_connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                await cursor.execute(TRANSCRIPT_PAGE_SQL, {
+                    "session_id": session_id, "user_id": user_id, "before_id": before_id, "limit": limit + 1
+                })
+                return transcript_page(await cursor.fetchall(), limit)
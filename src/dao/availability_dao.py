@@ -1,12 +1,15 @@
 from .base_dao import BaseDAO
 from datetime import datetime, timedelta
+import csv
+import io
 import psycopg2
 import psycopg2.extras
 
 class AvailabilitySlot:
     def __init__(self, provider_id, date, start_time, end_time, 
-                 status='available', slot_id=None, created_at=None):
+                 status='available', slot_id=None, created_at=None, type_id=None):
         self.id = slot_id
+        self.type_id = type_id
         self.provider_id = provider_id
         self.date = date
         self.start_time = start_time
@@ -14,6 +17,80 @@ class AvailabilitySlot:
         self.status = status
         self.created_at = created_at
 
+
+# Keyset page in id order (the primary key): rows after after_id, at most limit (NULL = all)
+SLOT_KEYSET_SQL = '''
+    SELECT * FROM availability_slots
+    WHERE (%(after_id)s::int IS NULL OR id > %(after_id)s)
+    ORDER BY id
+    LIMIT %(limit)s
+'''
+
+
+def _slot_row_to_object(row):
+    return AvailabilitySlot(
+        slot_id=row['id'],
+        provider_id=row['provider_id'],
+        date=row['date'],
+        start_time=row['start_time'],
+        end_time=row['end_time'],
+        status=row['status'],
+        created_at=row['created_at'],
+        type_id=row['type_id']
+    )
+
+
+# Bulk import (create_many): rows are COPYed into a per-transaction staging table, then moved
+# with one INSERT ... SELECT. The unique (provider_id, date, start_time) index (migration 0006)
+# decides what a duplicate is; "ignore" skips those slots, "error" rejects the whole import.
+SLOT_IMPORT_COLUMNS = ("provider_id", "type_id", "date", "start_time", "end_time", "status")
+SLOT_IMPORT_REQUIRED_COLUMNS = ("provider_id", "date", "start_time", "end_time")
+SLOT_IMPORT_CONFLICT_ACTIONS = ("ignore", "error")
+
+SLOT_IMPORT_TABLE_SQL = '''
+    CREATE TEMP TABLE slot_import (
+        provider_id integer,
+        type_id integer,
+        date date,
+        start_time time,
+        end_time time,
+        status varchar(20)
+    ) ON COMMIT DROP
+'''
+
+SLOT_IMPORT_INSERT_SQL = '''
+    INSERT INTO availability_slots (provider_id, type_id, date, start_time, end_time, status)
+    SELECT provider_id, type_id, date, start_time, end_time, COALESCE(status, 'available')
+    FROM slot_import
+'''
+
+
+def slot_import_copy_sql(columns):
+    """COPY statement for CSV rows with the given columns; raises ValueError for unknown or missing ones"""
+    unknown = [column for column in columns if column not in SLOT_IMPORT_COLUMNS]
+    missing = [column for column in SLOT_IMPORT_REQUIRED_COLUMNS if column not in columns]
+    if unknown or missing or len(set(columns)) != len(columns):
+        raise ValueError(f"CSV columns must be {', '.join(SLOT_IMPORT_REQUIRED_COLUMNS)} "
+                         f"and optionally type_id, status (got {', '.join(columns)})")
+    return f"COPY slot_import ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+
+
+def slot_import_insert_sql(on_conflict):
+    """INSERT ... SELECT from the staging table, returning the new slot ids"""
+    if on_conflict not in SLOT_IMPORT_CONFLICT_ACTIONS:
+        raise ValueError(f"on_conflict must be one of {', '.join(SLOT_IMPORT_CONFLICT_ACTIONS)}")
+    if on_conflict == "ignore":
+        return SLOT_IMPORT_INSERT_SQL + " ON CONFLICT (provider_id, date, start_time) DO NOTHING RETURNING id"
+    return SLOT_IMPORT_INSERT_SQL + " RETURNING id"
+
+
+def read_csv_header(file):
+    """Column names from the first line of a CSV file object (text or binary)"""
+    header = file.readline()
+    if isinstance(header, bytes):
+        header = header.decode("utf-8-sig")
+    return [column.strip().lstrip("\ufeff") for column in header.split(",")]
+
 class AvailabilityDAO(BaseDAO):
     """Data Access Object for Availability Slot operations"""
     
@@ -39,6 +116,44 @@ class AvailabilityDAO(BaseDAO):
         finally:
             conn.close()
 
+    def create_many(self, slots, on_conflict="ignore"):
+        """
+        Create many availability slots in one transaction, streamed to the database with COPY.
+        on_conflict="ignore" skips slots the provider already has at that date and start time;
+        "error" raises psycopg2.errors.UniqueViolation and creates none.
+        Returns {"inserted", "skipped", "ids"} (ids of the created slots).
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for slot in slots:
+            writer.writerow([slot.provider_id, slot.type_id, slot.date, slot.start_time, slot.end_time, slot.status])
+        buffer.seek(0)
+        return self.create_many_from_csv(buffer, columns=SLOT_IMPORT_COLUMNS, on_conflict=on_conflict)
+
+    def create_many_from_csv(self, file, columns=None, on_conflict="ignore"):
+        """
+        create_many for CSV rows read from a file object (text or binary). Unless columns is
+        given, the first line is a header naming them: provider_id, date, start_time, end_time
+        and optionally type_id, status (default 'available'). Empty fields are NULL.
+        """
+        columns = list(columns or read_csv_header(file))
+        copy_sql = slot_import_copy_sql(columns)
+        insert_sql = slot_import_insert_sql(on_conflict)
+
+        conn = self.get_connection()
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+
+        try:
+            cursor.execute(SLOT_IMPORT_TABLE_SQL)
+            cursor.copy_expert(copy_sql, file)
+            received = cursor.rowcount
+            cursor.execute(insert_sql)
+            ids = [row['id'] for row in cursor.fetchall()]
+            conn.commit()
+            return {"inserted": len(ids), "skipped": received - len(ids), "ids": ids}
+        finally:
+            conn.close()
+
     # $---TOOL---$
     def get_slots_by_date_overlapping_time_range(
         self, date, start_time, end_time=None, status="available", service_name=None
@@ -48,6 +163,8 @@ class AvailabilityDAO(BaseDAO):
         joined with users (provider_id → users.id).
         If service_name is provided, it will join with appointment_types (type_id → appointment_types.id)
         and filter by service_name (case-insensitive, partial match).
+        Uses the canonical overlap predicate (slot.start < end AND slot.end > start), which is
+        served by the (date, status, start_time) / (type_id, date, status, start_time) indexes.
         """
         conn = self.get_connection()
         cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -69,23 +186,16 @@ class AvailabilityDAO(BaseDAO):
                     WHERE at.name ILIKE %s
                     AND s.date = %s
                     AND s.status = %s
-                    AND (
-                        (s.start_time >= %s AND s.start_time < %s) OR
-                        (s.end_time > %s AND s.end_time <= %s) OR
-                        (s.start_time <= %s AND s.end_time >= %s)
-                    )
+                    AND s.start_time < %s
+                    AND s.end_time > %s
                     ORDER BY s.start_time
                     """,
                     (
                         f"%{service_name}%",
                         date,
                         status,
-                        start_time,
                         end_time,
                         start_time,
-                        end_time,
-                        start_time,
-                        end_time,
                     ),
                 )
             else:
@@ -97,22 +207,15 @@ class AvailabilityDAO(BaseDAO):
                     JOIN appointment_types at ON at.id = s.type_id
                     WHERE s.date = %s
                     AND s.status = %s
-                    AND (
-                        (s.start_time >= %s AND s.start_time < %s) OR
-                        (s.end_time > %s AND s.end_time <= %s) OR
-                        (s.start_time <= %s AND s.end_time >= %s)
-                    )
+                    AND s.start_time < %s
+                    AND s.end_time > %s
                     ORDER BY s.start_time
                     """,
                     (
                         date,
                         status,
-                        start_time,
                         end_time,
                         start_time,
-                        end_time,
-                        start_time,
-                        end_time,
                     ),
                 )
 
@@ -261,20 +364,16 @@ class AvailabilityDAO(BaseDAO):
         
         try:
             cursor.execute('SELECT * FROM availability_slots')
-            rows = cursor.fetchall()
-            
-            slots = []
-            for row in rows:
-                slots.append(AvailabilitySlot(
-                    slot_id=row['id'],
-                    provider_id=row['provider_id'],
-                    date=row['date'],
-                    start_time=row['start_time'],
-                    end_time=row['end_time'],
-                    status=row['status'],
-                    created_at=row['created_at']
-                ))
-            return slots
+            return [_slot_row_to_object(row) for row in cursor.fetchall()]
         finally:
             conn.close()
+
+    def iter_all(self, after_id=None, limit=None, itersize=None):
+        """
+        Stream availability slots in id order, as get_all objects.
+        Keyset pagination: pass the id of the last slot seen as after_id to continue after it.
+        """
+        params = {"after_id": after_id, "limit": limit}
+        for row in self._stream(SLOT_KEYSET_SQL, params, itersize):
+            yield _slot_row_to_object(row)
     
@@ -1,5 +1,16 @@
+import psycopg2.extras
+
+from telemetry import trace_methods
+from .database import STREAM_ITERSIZE
+
+
 class BaseDAO:
     """Base class for all Data Access Objects"""
+
+    def __init_subclass__(cls, **kwargs):
+        # every DAO method runs in a "dao.<Class>.<method>" span (its SQL shows up as db.query children)
+        super().__init_subclass__(**kwargs)
+        trace_methods(cls, "dao")
     
     def __init__(self, database):
         self.database = database
@@ -7,6 +18,24 @@ class BaseDAO:
     def get_connection(self):
         """Get database connection from database manager"""
         return self.database.get_connection()
+
+    def _stream(self, query, params=None, itersize=None):
+        """
+        Yield DictCursor rows from a server-side (named) cursor, itersize rows per round trip,
+        so a caller can walk millions of rows in constant memory. The pooled connection is
+        held until the generator is exhausted or closed.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor(name=f"{type(self).__name__.lower()}_stream",
+                             cursor_factory=psycopg2.extras.DictCursor)
+        cursor.itersize = itersize or STREAM_ITERSIZE
+        try:
+            cursor.execute(query, params)
+            for row in cursor:
+                yield row
+        finally:
+            cursor.close()
+            conn.close()
     
     def create(self, entity):
         raise NotImplementedError("Subclasses must implement create method")
@@ -0,0 +1,118 @@
+import logging
+import select
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+
+
+class TTLCache:
+    """
+    Thread-safe, process-wide read-through cache.
+    Entries expire after `ttl` seconds and can be invalidated explicitly
+    (e.g. from a route that changed the data, or from a Postgres NOTIFY).
+    """
+
+    def __init__(self, ttl=3600.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}            # key -> (value, expires_at)
+        self._generation = 0          # bumped on invalidate, so in-flight loads don't resurrect stale data
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "invalidations": 0}
+
+    def get(self, key):
+        """Return (found, value) without loading"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._stats["hits"] += 1
+                return True, entry[0]
+            self._stats["misses"] += 1
+            return False, None
+
+    def set(self, key, value, generation=None):
+        """Store a value; dropped if the cache was invalidated since `generation` was read"""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for `key`, calling `loader()` on a miss"""
+        found, value = self.get(key)
+        if found:
+            return value
+
+        generation = self.generation()
+        value = loader()
+        with self._lock:
+            self._stats["loads"] += 1
+        self.set(key, value, generation)
+        return value
+
+    def invalidate(self, key=None):
+        """Drop one key, or everything when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._generation += 1
+            self._stats["invalidations"] += 1
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["ttl"] = self.ttl
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+def start_invalidation_listener(db_config, channel, cache, reconnect_delay=5.0):
+    """
+    LISTEN on a Postgres channel in a daemon thread and invalidate `cache` on every NOTIFY.
+    The cache is also invalidated on each (re)connect, since notifications sent while
+    disconnected are lost.
+    Returns the thread; set `thread.stop_event` to stop it.
+    """
+    stop_event = threading.Event()
+
+    def listen():
+        while not stop_event.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**db_config)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                cursor = conn.cursor()
+                cursor.execute('LISTEN "%s"' % channel.replace('"', ''))
+                cache.invalidate()
+
+                while not stop_event.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        cache.invalidate()
+            except Exception as e:
+                logging.getLogger(__name__).warning("cache listener (%s) error: %s", channel, e)
+                stop_event.wait(reconnect_delay)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    thread = threading.Thread(target=listen, name=f"listen-{channel}", daemon=True)
+    thread.stop_event = stop_event
+    thread.start()
+    return thread
@@ -3,6 +3,7 @@ from .provider_dao import ProviderDAO
 from .service_dao import ServiceDAO
 from .availability_dao import AvailabilityDAO
 from .appointment_dao import AppointmentDAO
+from .transcript_dao import TranscriptDAO
 
 class DAOFactory:
     """Factory class for creating DAO instances"""
@@ -13,6 +14,7 @@ class DAOFactory:
         self._service_dao = None
         self._availability_dao = None
         self._appointment_dao = None
+        self._transcript_dao = None
     
     def get_provider_dao(self):
         """Get Provider DAO instance"""
@@ -38,8 +40,16 @@ class DAOFactory:
             self._appointment_dao = AppointmentDAO(self.database)
         return self._appointment_dao
     
+    def get_transcript_dao(self):
+        """Get Transcript DAO instance"""
+        if self._transcript_dao is None:
+            self._transcript_dao = TranscriptDAO(self.database)
+        return self._transcript_dao
+    
+    def get_pool_stats(self):
+        """Get connection pool statistics"""
+        return self.database.pool_stats()
+    
     def close_connections(self):
-        """Close all database connections (if needed for cleanup)"""
-        # In this simple implementation, connections are closed after each operation
-        # This method is here for future extension if connection pooling is added
-        pass
+        """No-op kept for callers: the pool is process-wide and closed at app shutdown (close_pools)"""
+        self.database.close()
@@ -1,27 +1,321 @@
 import sqlite3
 import psycopg2
+import psycopg2.extensions
 import os
+import threading
+import time
+from collections import deque
+
+from telemetry import TracedCursor, current_span
 
 DB_CONFIG = {
-                'host': 'coordinaite-db.c856ouoewepl.us-east-1.rds.amazonaws.com',
-                'port': 5432,
-                'database': 'coordinaite_db',
-                'user': 'postgres',
-                'password': 'JohnIsAGoodBadGuy'
+                'host': os.getenv('DB_HOST', 'coordinaite-db.c856ouoewepl.us-east-1.rds.amazonaws.com'),
+                'port': int(os.getenv('DB_PORT', 5432)),
+                'database': os.getenv('DB_NAME', 'coordinaite_db'),
+                'user': os.getenv('DB_USER', 'postgres'),
+                'password': os.getenv('DB_PASSWORD', 'JohnIsAGoodBadGuy')
+            }
+
+POOL_CONFIG = {
+                'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+                'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+                'acquire_timeout': float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', 10)),       # seconds to wait for a free connection
+                'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),           # recycle connections older than this (seconds)
+                'health_check_after': float(os.getenv('DB_POOL_HEALTH_CHECK_AFTER', 30)), # ping connections idle longer than this (seconds)
+                'statement_timeout_ms': int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 5000)),
             }
 
+# rows fetched per round trip by the DAOs' server-side (named) cursors, see BaseDAO._stream
+STREAM_ITERSIZE = int(os.getenv('DB_STREAM_ITERSIZE', 2000))
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be acquired from the pool in time"""
+
+
+class PooledConnection:
+    """
+    Thin proxy around a psycopg2 connection checked out of a ConnectionPool.
+    Everything is delegated to the real connection except close(), which hands
+    the connection back to the pool instead of tearing down the socket, so the
+    existing DAO code (`try: ... finally: conn.close()`) keeps working unchanged.
+    """
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._conn.__exit__(exc_type, exc_value, traceback)
+
+    @property
+    def closed(self):
+        return self._conn is None or self._conn.closed
+
+    def cursor(self, *args, **kwargs):
+        """Cursor whose statements are traced as db.query spans"""
+        return TracedCursor(self._conn.cursor(*args, **kwargs))
+
+    def close(self):
+        """Return the connection to the pool"""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.putconn(conn)
+
+
+class ConnectionPool:
+    """
+    Thread-safe psycopg2 connection pool.
+
+    - keeps between `min_size` and `max_size` physical connections
+    - pings connections that sat idle for longer than `health_check_after`
+    - recycles connections older than `max_lifetime`
+    - applies `statement_timeout` to every connection it opens
+    """
+
+    def __init__(self, db_config, min_size=1, max_size=10, acquire_timeout=10.0,
+                 max_lifetime=1800.0, health_check_after=30.0, statement_timeout_ms=5000):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("invalid pool size: min_size=%s max_size=%s" % (min_size, max_size))
+
+        self.db_config = db_config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self.statement_timeout_ms = statement_timeout_ms
+
+        self._cond = threading.Condition()
+        self._idle = deque()          # (conn, created_at, returned_at)
+        self._created_at = {}         # id(conn) -> created_at, for connections checked out
+        self._size = 0                # physical connections currently owned by the pool
+        self._closed = False
+
+        self._stats = {
+            "connections_opened": 0,
+            "connections_closed": 0,
+            "acquired": 0,
+            "released": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "recycled": 0,
+            "acquire_time_total_ms": 0.0,
+        }
+
+        for _ in range(min_size):
+            self._size += 1
+            conn = self._open()
+            self._idle.append((conn, time.monotonic(), time.monotonic()))
+
+    def _open(self):
+        """Open a new physical connection (caller must already hold a slot in _size)"""
+        params = dict(self.db_config)
+        if self.statement_timeout_ms:
+            params["options"] = "-c statement_timeout=%d" % self.statement_timeout_ms
+        conn = psycopg2.connect(**params)
+        with self._cond:
+            self._stats["connections_opened"] += 1
+        return conn
+
+    def _discard(self, conn):
+        """Close a physical connection and release its slot in the pool"""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._stats["connections_closed"] += 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn, created_at, returned_at):
+        """Check an idle connection before handing it out"""
+        now = time.monotonic()
+        if conn.closed:
+            return False
+        if self.max_lifetime and now - created_at > self.max_lifetime:
+            with self._cond:
+                self._stats["recycled"] += 1
+            return False
+        if self.health_check_after and now - returned_at > self.health_check_after:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
+                cursor.close()
+                conn.rollback()
+            except Exception:
+                with self._cond:
+                    self._stats["health_check_failures"] += 1
+                return False
+        return True
+
+    def getconn(self):
+        """Check a connection out of the pool, opening one if below max_size"""
+        started = time.monotonic()
+        deadline = started + self.acquire_timeout
+
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise PoolTimeout("connection pool is closed")
+
+                if self._idle:
+                    conn, created_at, returned_at = self._idle.pop()
+                    reserved = False
+                elif self._size < self.max_size:
+                    # reserve the slot now, open the socket outside the lock
+                    self._size += 1
+                    conn, created_at, returned_at = None, None, None
+                    reserved = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(
+                            "could not acquire a connection within %.1fs (max_size=%d)"
+                            % (self.acquire_timeout, self.max_size)
+                        )
+                    self._stats["waits"] += 1
+                    self._cond.wait(remaining)
+                    continue
+
+            if reserved:
+                try:
+                    conn = self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                created_at = time.monotonic()
+            elif not self._is_healthy(conn, created_at, returned_at):
+                self._discard(conn)
+                continue
+
+            with self._cond:
+                self._created_at[id(conn)] = created_at
+                self._stats["acquired"] += 1
+                self._stats["acquire_time_total_ms"] += (time.monotonic() - started) * 1000
+            return conn
+
+    def putconn(self, conn):
+        """Give a connection back; unfinished transactions are rolled back"""
+        with self._cond:
+            created_at = self._created_at.pop(id(conn), time.monotonic())
+            self._stats["released"] += 1
+
+        if self._closed or conn.closed:
+            self._discard(conn)
+            return
+
+        status = conn.get_transaction_status()
+        if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except Exception:
+                self._discard(conn)
+                return
+
+        with self._cond:
+            if not self._closed:
+                self._idle.append((conn, created_at, time.monotonic()))
+                self._cond.notify()
+                return
+        self._discard(conn)
+
+    def closeall(self):
+        """Close idle connections and refuse new checkouts; busy ones close on return"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    def stats(self):
+        """Snapshot of pool counters"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "closed": self._closed,
+            })
+        stats["avg_acquire_time_ms"] = (
+            stats["acquire_time_total_ms"] / stats["acquired"] if stats["acquired"] else 0.0
+        )
+        return stats
+
+
+# One pool per distinct db_config, shared by every Database / DAOFactory in the process
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(db_config):
+    return tuple(sorted(db_config.items()))
+
+
 class Database:
-    def __init__(self, db_config=DB_CONFIG):
+    def __init__(self, db_config=DB_CONFIG, pool_config=POOL_CONFIG):
         self.db_config = db_config
+        self.pool_config = pool_config
         # self.init_database()
-    
+
+    @property
+    def pool(self):
+        """Process-wide connection pool for this db_config (created lazily)"""
+        key = _pool_key(self.db_config)
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None or pool._closed:
+                pool = ConnectionPool(self.db_config, **self.pool_config)
+                _pools[key] = pool
+            return pool
+
     def get_connection(self):
-        """Get database connection"""
-        
-        conn = psycopg2.connect(**self.db_config)
-        print("connection established succefully")
-        return conn
-    
+        """Get a pooled database connection; close() returns it to the pool"""
+        pool = self.pool
+        started = time.perf_counter()
+        conn = pool.getconn()
+        current_span().set_attribute("db.acquire_ms", (time.perf_counter() - started) * 1000)
+        return PooledConnection(pool, conn)
+
+    def pool_stats(self):
+        """Expose pool counters (size, idle, in_use, waits, timeouts, ...)"""
+        return self.pool.stats()
+
+    def close(self):
+        """
+        No-op: the pool is shared by every Database in the process, so one owner must not
+        close it under the others (close_pools() does that at application shutdown)
+        """
+
+
+def close_pools():
+    """
+    Close every process-wide pool. Only for application shutdown / process exit: other
+    Database / DAOFactory instances would get PoolTimeout until they re-resolve .pool.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.closeall()
+
     def init_database(self):
         """Initialize database with required tables"""
         # conn = sqlite3.connect(self.db_path)
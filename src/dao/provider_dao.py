@@ -113,8 +113,8 @@ class ProviderDAO(BaseDAO):
             cursor.execute('''
                 SELECT DISTINCT p.* FROM providers p
                 JOIN services s ON p.id = s.provider_id
-                WHERE LOWER(s.name) LIKE %s OR LOWER(p.specialties) LIKE %s
-            ''', (f'%{service_type.lower()}%', f'%{service_type.lower()}%'))
+                WHERE s.name ILIKE %s OR p.specialties ILIKE %s
+            ''', (f'%{service_type}%', f'%{service_type}%'))
             
             rows = cursor.fetchall()
             providers = []
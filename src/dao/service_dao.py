@@ -1,4 +1,6 @@
 from .base_dao import BaseDAO
+from .cache import TTLCache, start_invalidation_listener
+import os
 import psycopg2
 import psycopg2.extras
 
@@ -10,6 +12,22 @@ class Service:
         self.duration_minutes = duration_minutes
         self.price = price
 
+# Process-wide cache of the appointment type catalogue (changes ~once a day).
+# Invalidated explicitly by POST /types/ and by the NOTIFY trigger from migration 0003.
+SERVICE_CATALOGUE_CHANNEL = 'appointment_types_changed'
+SERVICE_NAMES_KEY = 'service_names'
+service_catalogue_cache = TTLCache(ttl=float(os.getenv('SERVICE_CATALOGUE_TTL', 3600)))
+
+# Ranked fuzzy match on appointment type names. `%%` is pg_trgm's similarity operator
+# (served by the GIN trigram index); the threshold is set for this transaction only.
+SEARCH_SERVICES_SQL = '''
+    SELECT id, name, similarity(name, %(query)s) AS score
+    FROM appointment_types
+    WHERE name %% %(query)s
+    ORDER BY score DESC, name
+    LIMIT %(limit)s
+'''
+
 class ServiceDAO(BaseDAO):
     """Data Access Object for Service operations"""
     
@@ -74,7 +92,11 @@ class ServiceDAO(BaseDAO):
             conn.close()
 
     def get_all_service_names(self):
-        """Get all services"""
+        """Get all services (served from the process-wide catalogue cache)"""
+        return list(service_catalogue_cache.get_or_load(SERVICE_NAMES_KEY, self._load_all_service_names))
+
+    def _load_all_service_names(self):
+        """Read the appointment type names from the database"""
         conn = self.get_connection()
         cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
@@ -90,6 +112,44 @@ class ServiceDAO(BaseDAO):
         finally:
             conn.close()
 
+    def invalidate_service_catalogue(self):
+        """Drop the cached catalogue (call after appointment types change)"""
+        service_catalogue_cache.invalidate()
+
+    def get_catalogue_cache_stats(self):
+        """Hit/miss counters of the catalogue cache"""
+        return service_catalogue_cache.stats()
+
+    def start_catalogue_listener(self):
+        """Invalidate the catalogue cache whenever Postgres NOTIFYs a change to appointment_types"""
+        return start_invalidation_listener(self.database.db_config, SERVICE_CATALOGUE_CHANNEL, service_catalogue_cache)
+
+    def search_services(self, query, limit=5, min_similarity=0.3):
+        """
+        Fuzzy-search appointment types by name (pg_trgm trigram similarity).
+        Returns up to `limit` matches, best first, as
+        [{"type_id", "service_name", "similarity"}]
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+
+        try:
+            cursor.execute("SELECT set_config('pg_trgm.similarity_threshold', %s, true)", (str(min_similarity),))
+            cursor.execute(SEARCH_SERVICES_SQL, {"query": query, "limit": limit})
+            rows = cursor.fetchall()
+            conn.commit()
+
+            matches = []
+            for row in rows:
+                matches.append({
+                    "type_id": row['id'],
+                    "service_name": row['name'],
+                    "similarity": float(row['score'])
+                })
+            return matches
+        finally:
+            conn.close()
+
     def update(self, service):
         """Update service information"""
         if not service.id:
@@ -155,8 +215,8 @@ class ServiceDAO(BaseDAO):
                 SELECT s.*, p.name as provider_name, p.email, p.location, p.specialties
                 FROM services s
                 JOIN providers p ON s.provider_id = p.id
-                WHERE LOWER(s.name) LIKE %s OR LOWER(p.specialties) LIKE %s
-            ''', (f'%{service_type.lower()}%', f'%{service_type.lower()}%'))
+                WHERE s.name ILIKE %s OR p.specialties ILIKE %s
+            ''', (f'%{service_type}%', f'%{service_type}%'))
             
             rows = cursor.fetchall()
             services = []
@@ -0,0 +1,68 @@
+from .base_dao import BaseDAO
+import psycopg2
+import psycopg2.extras
+
+
+TRANSCRIPT_PAGE_SQL = '''
+    SELECT id, role, content, created_at
+    FROM chat_transcripts
+    WHERE session_id = %(session_id)s
+    AND (%(user_id)s::int IS NULL OR user_id = %(user_id)s)
+    AND (%(before_id)s::bigint IS NULL OR id < %(before_id)s)
+    ORDER BY id DESC
+    LIMIT %(limit)s
+'''
+
+
+def transcript_rows(session_id, user_id, messages):
+    return [(session_id, user_id, message["role"], message["content"]) for message in messages]
+
+
+def transcript_page(rows, limit):
+    """Rows come newest first (limit + 1 of them); return the page oldest first plus the next cursor"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    messages = [
+        {"id": row["id"], "role": row["role"], "content": row["content"], "created_at": row["created_at"]}
+        for row in reversed(rows)
+    ]
+    return {"messages": messages, "next_before_id": messages[0]["id"] if has_more else None}
+
+
+class TranscriptDAO(BaseDAO):
+    """
+    Append-only chat transcript (what the UI shows), one row per message.
+    Kept out of the graph state so checkpoints only carry what the agents need.
+    """
+
+    def append(self, session_id, user_id, messages):
+        """Append [{"role", "content"}, ...] to the session's transcript in one INSERT"""
+        if not messages:
+            return 0
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            psycopg2.extras.execute_values(cursor, '''
+                INSERT INTO chat_transcripts (session_id, user_id, role, content) VALUES %s
+            ''', transcript_rows(session_id, user_id, messages))
+            conn.commit()
+            return len(messages)
+        finally:
+            conn.close()
+
+    def get_page(self, session_id, user_id=None, limit=50, before_id=None):
+        """
+        The `limit` most recent messages of a session older than before_id, oldest first.
+        Returns {"messages": [...], "next_before_id"}; pass next_before_id back for the previous page.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+
+        try:
+            cursor.execute(TRANSCRIPT_PAGE_SQL, {
+                "session_id": session_id, "user_id": user_id, "before_id": before_id, "limit": limit + 1
+            })
+            return transcript_page(cursor.fetchall(), limit)
+        finally:
+            conn.close()
@@ -0,0 +1,234 @@
+import importlib.util
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager, nullcontext
+
+import aiosqlite
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from telemetry import current_span, trace_checkpointer
+
+
+# Where conversation state (graph checkpoints) is kept:
+#   "sqlite"   - a local file; fine for a single host, also shared by several uvicorn workers on it
+#   "postgres" - the app database (or CHECKPOINT_DB_URL); shared by every worker on every host
+CHECKPOINTER = os.getenv("CHECKPOINTER", "sqlite").lower()
+SQLITE_CHECKPOINT_PATH = os.getenv("SQLITE_CHECKPOINT_PATH", "state_db/example.db")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", 8))          # idle connections kept open
+CHECKPOINT_DB_URL = os.getenv("CHECKPOINT_DB_URL")
+CHECKPOINT_POOL_MIN_SIZE = int(os.getenv("CHECKPOINT_POOL_MIN_SIZE", 1))
+CHECKPOINT_POOL_MAX_SIZE = int(os.getenv("CHECKPOINT_POOL_MAX_SIZE", 10))
+
+# Applied to every SQLite checkpoint connection. WAL lets readers run alongside the writer
+# (and other processes); NORMAL only fsyncs at checkpoints, which WAL keeps crash-safe.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+)
+
+_lock = threading.Lock()
+_checkpointer = None
+
+
+def check_checkpointer():
+    """
+    Fail fast (app startup) on an unknown CHECKPOINTER or a backend whose package is missing,
+    instead of on the first chat turn
+    """
+    if CHECKPOINTER not in ("sqlite", "postgres"):
+        raise ValueError(f"Unknown CHECKPOINTER {CHECKPOINTER!r} (expected 'sqlite' or 'postgres')")
+    if CHECKPOINTER == "postgres" and importlib.util.find_spec("langgraph.checkpoint.postgres") is None:
+        raise RuntimeError("CHECKPOINTER=postgres needs the langgraph-checkpoint-postgres package "
+                           "(pip install langgraph-checkpoint-postgres)")
+
+
+def _sqlite_connect(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000)
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class PooledSqliteSaver(SqliteSaver):
+    """
+    SqliteSaver over a small pool of connections instead of one shared connection behind a
+    lock: each checkpoint read/write borrows its own connection, so sessions handled on
+    different threads no longer queue on each other. SQLite itself (WAL + busy_timeout)
+    arbitrates between writers, including other worker processes.
+    """
+
+    def __init__(self, path=SQLITE_CHECKPOINT_PATH, pool_size=SQLITE_POOL_SIZE):
+        self.path = path
+        self.pool_size = pool_size
+        self._idle = []
+        self._idle_lock = threading.Lock()
+        self._setup_lock = threading.Lock()
+        self._local = threading.local()
+        super().__init__(None)
+        # connections are not shared, so SqliteSaver's saver-wide lock is not needed
+        self.lock = nullcontext()
+
+    @property
+    def conn(self):
+        """The connection borrowed by the innermost cursor() on this thread"""
+        return self._local.borrowed[-1]
+
+    @conn.setter
+    def conn(self, value):
+        # SqliteSaver.__init__ assigns the shared connection; ours are borrowed per cursor()
+        pass
+
+    def _checkout(self):
+        with self._idle_lock:
+            if self._idle:
+                return self._idle.pop()
+        return _sqlite_connect(self.path)
+
+    def _checkin(self, conn):
+        with self._idle_lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def cursor(self, transaction=True):
+        conn = self._checkout()
+        borrowed = getattr(self._local, "borrowed", None)
+        if borrowed is None:
+            borrowed = self._local.borrowed = []
+        borrowed.append(conn)
+        try:
+            with super().cursor(transaction) as cur:
+                yield cur
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            borrowed.remove(conn)
+            self._checkin(conn)
+
+    def setup(self):
+        # tables are created once per process, not once per connection
+        if self.is_setup:
+            return
+        with self._setup_lock:
+            if not self.is_setup:
+                super().setup()
+
+    def close(self):
+        with self._idle_lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+def _postgres_conninfo():
+    if CHECKPOINT_DB_URL:
+        return CHECKPOINT_DB_URL
+    from dao.database import DB_CONFIG
+    from dao.async_database import _conninfo
+    return _conninfo(DB_CONFIG)
+
+
+# Connection settings PostgresSaver expects (see langgraph-checkpoint-postgres)
+POSTGRES_CONNECTION_KWARGS = {"autocommit": True, "prepare_threshold": 0}
+
+
+def _create_postgres_saver():
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+    from langgraph.checkpoint.postgres import PostgresSaver
+
+    pool = ConnectionPool(
+        _postgres_conninfo(),
+        min_size=CHECKPOINT_POOL_MIN_SIZE,
+        max_size=CHECKPOINT_POOL_MAX_SIZE,
+        kwargs={**POSTGRES_CONNECTION_KWARGS, "row_factory": dict_row},
+        open=True,
+    )
+    saver = PostgresSaver(pool)
+    saver.setup()
+    return saver
+
+
+def get_checkpointer():
+    """
+    Process-wide checkpointer for the sync graph, chosen by CHECKPOINTER.
+    Its reads and writes are traced as checkpoint.* spans.
+    """
+    global _checkpointer
+    with _lock:
+        if _checkpointer is None:
+            check_checkpointer()
+            if CHECKPOINTER == "postgres":
+                _checkpointer = _create_postgres_saver()
+            elif CHECKPOINTER == "sqlite":
+                _checkpointer = PooledSqliteSaver(SQLITE_CHECKPOINT_PATH)
+            else:
+                raise ValueError(f"Unknown CHECKPOINTER {CHECKPOINTER!r} (expected 'sqlite' or 'postgres')")
+            trace_checkpointer(_checkpointer)
+            current_span().add_event("checkpointer_created", backend=CHECKPOINTER)
+        return _checkpointer
+
+
+async def create_async_checkpointer():
+    """
+    Checkpointer for the async graph, chosen by CHECKPOINTER (traced like get_checkpointer's).
+    It is bound to the running event loop, so create it from the loop that will use it and
+    close it with close_async_checkpointer().
+    """
+    check_checkpointer()
+    if CHECKPOINTER == "postgres":
+        from psycopg.rows import dict_row
+        from psycopg_pool import AsyncConnectionPool
+        from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+        pool = AsyncConnectionPool(
+            _postgres_conninfo(),
+            min_size=CHECKPOINT_POOL_MIN_SIZE,
+            max_size=CHECKPOINT_POOL_MAX_SIZE,
+            kwargs={**POSTGRES_CONNECTION_KWARGS, "row_factory": dict_row},
+            open=False,
+        )
+        await pool.open()
+        saver = AsyncPostgresSaver(pool)
+        await saver.setup()
+        return trace_checkpointer(saver)
+
+    if CHECKPOINTER == "sqlite":
+        directory = os.path.dirname(SQLITE_CHECKPOINT_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = await aiosqlite.connect(SQLITE_CHECKPOINT_PATH, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000)
+        for pragma in SQLITE_PRAGMAS:
+            await conn.execute(pragma)
+        return trace_checkpointer(AsyncSqliteSaver(conn))
+
+    raise ValueError(f"Unknown CHECKPOINTER {CHECKPOINTER!r} (expected 'sqlite' or 'postgres')")
+
+
+async def close_async_checkpointer(saver):
+    """
+    Release what create_async_checkpointer() opened: the aiosqlite connection (its worker
+    thread keeps the process alive) or the async pool
+    """
+    await saver.conn.close()
+
+
+def close_checkpointer():
+    """Close the sync checkpointer's connections / pool (app shutdown)"""
+    global _checkpointer
+    with _lock:
+        saver, _checkpointer = _checkpointer, None
+    if isinstance(saver, PooledSqliteSaver):
+        saver.close()
+    elif saver is not None:
+        saver.conn.close()
@@ -0,0 +1,228 @@
+import ast
+import asyncio
+import json
+import os
+import re
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from engine.fast_extractor import parse_contact, parse_date, parse_name, parse_service, parse_time
+from engine.history import estimate_tokens
+
+
+# Offline stand-in for Gemini (LLM_BACKEND=fake, see engine.llm): answers every prompt the
+# nodes send with a deterministic, rule-based response, so the whole graph can run without
+# network access, e.g. for benchmarks. LLM_FAKE_LATENCY_MS simulates the model's round trip.
+LLM_FAKE_LATENCY_MS = float(os.getenv("LLM_FAKE_LATENCY_MS", 0))
+
+# Required booking items, in the order the gatherer asks for them
+REQUIRED_ITEMS = [
+    ("service_type", "Service type", "ask_service_type"),
+    ("preferred_date", "Preferred date", "ask_preferred_date"),
+    ("name", "User name", "ask_seeker_name"),
+    ("contact", "Contact", "ask_seeker_contact"),
+]
+
+STEP_REPLIES = {
+    "ask_service_type": "What type of service are you looking for?",
+    "ask_preferred_date": "What date would work best for you?",
+    "ask_seeker_name": "Could I get your name for the appointment?",
+    "ask_seeker_contact": "How can we reach you to confirm the appointment? (email or phone)",
+    "unsupported_service": "Sorry, we do not offer that service. Please choose one of our services.",
+    "fetch_slots": "Thanks! Let me check the available slots for you.",
+}
+
+SERVICE_LIST_RE = re.compile(r"services we provide -\s*(\[.*?\])", re.DOTALL)
+OUR_SERVICES_RE = re.compile(r"our services:\s*(\[.*?\])", re.DOTALL)
+KNOWN_RE = re.compile(r"^\s*- (Service type|Preferred date|Preferred time|User name|Contact): (.*)$", re.MULTILINE)
+MATCHER_ARG_RE = re.compile(r"^\s*- (Service info|Time preferences): (\{.*\})$", re.MULTILINE)
+BASE_QUESTION_RE = re.compile(r"Base question: (.*)")
+NOT_KNOWN = {"", "not specified", "none", "null"}
+# Streamed answers are sent in pieces of this many characters
+STREAM_PIECE_CHARS = 8
+
+
+def _text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+
+
+def _literal(text, default):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return default
+
+
+def extract_fields(message: str, prompt: str, expecting_name=False) -> dict:
+    """What the latest user message says, found with the fast extractor's rules"""
+    match = SERVICE_LIST_RE.search(prompt)
+    service_names = _literal(match.group(1), []) if match else []
+    return {
+        "service_type": parse_service(message, service_names)[0] if service_names else None,
+        "preferred_date": parse_date(message)[0],
+        "preferred_time": parse_time(message)[0],
+        "name": parse_name(message, expecting_name)[0],
+        "contact": parse_contact(message)[0],
+        "meeting_preference": None,
+        "special_requirements": None,
+    }
+
+
+def gathering_turn(message: str, prompt: str) -> dict:
+    """The combined call's answer: extracted fields, next_step and reply"""
+    known = {label: value.strip() for label, value in KNOWN_RE.findall(prompt)}
+    missing = [(key, step) for key, label, step in REQUIRED_ITEMS if known.get(label, "").lower() in NOT_KNOWN]
+    expecting_name = bool(missing) and missing[0][0] == "name"
+    extracted = extract_fields(message, prompt, expecting_name)
+
+    remaining = [step for key, step in missing if not extracted.get(key)]
+    if remaining:
+        next_step = remaining[0]
+    else:
+        # decided on the catalogue the next_step rule lists, as the node does (empty = unsupported)
+        match = OUR_SERVICES_RE.search(prompt)
+        service_names = _literal(match.group(1), []) if match else []
+        service_type = extracted.get("service_type") or known.get("Service type")
+        next_step = "fetch_slots" if service_type in service_names else "unsupported_service"
+    return {**extracted, "next_step": next_step, "reply": STEP_REPLIES[next_step]}
+
+
+def matcher_tool_call(prompt: str, tool_name: str, call_id: str) -> Optional[dict]:
+    """
+    The slot search the matcher agent should request, or None once the last message in the
+    history is the tool's result (the agent then answers "_end_")
+    """
+    if prompt.rfind("ToolMessage(") > prompt.rfind("'role': 'user'"):
+        return None
+    from engine.nodes.service_matcher_node import WHOLE_DAY, build_slot_query
+
+    args = dict(MATCHER_ARG_RE.findall(prompt))
+    service_info = _literal(args.get("Service info", "{}"), {})
+    time_preferences = _literal(args.get("Time preferences", "{}"), {})
+    query = build_slot_query(service_info, time_preferences) or {
+        "date": time_preferences.get("preferred_date"),
+        "start_time": WHOLE_DAY[0],
+        "end_time": WHOLE_DAY[1],
+        "service_name": service_info.get("service_type"),
+    }
+    query = {key: value for key, value in query.items() if value is not None}
+    return {"name": tool_name, "args": query, "id": call_id, "type": "tool_call"}
+
+
+def text_reply(prompt: str) -> str:
+    """Free-text answers: follow-up questions, summaries, slot-search and no-slot replies"""
+    match = BASE_QUESTION_RE.search(prompt)
+    if match:
+        return match.group(1).strip()
+    if "running summary" in prompt:
+        return "The user is booking an appointment; the details given so far are kept in the state."
+    if "no slots were available" in prompt:
+        return "Sorry, no slots are available for that time. Could you suggest another date or time?"
+    if "do not offer" in prompt:
+        return STEP_REPLIES["unsupported_service"]
+    if "check for available slots" in prompt:
+        return STEP_REPLIES["fetch_slots"]
+    return "OK."
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Deterministic chat model that understands the prompts of this graph's nodes: JSON extraction,
+    the combined GatheringTurn call (structured, or as streamed JSON text), follow-up questions,
+    the history summary and the matcher's tool call. Token usage is estimated (~4 characters per
+    token) so llm.call spans carry it.
+    """
+
+    model: str = "fake"
+    temperature: float = 0
+    latency_ms: float = LLM_FAKE_LATENCY_MS
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tool_names=[convert_to_openai_tool(tool)["function"]["name"] for tool in tools], **kwargs)
+
+    def with_structured_output(self, schema, **kwargs):
+        return self.bind(response_schema=schema) | RunnableLambda(lambda message: schema.model_validate_json(message.content))
+
+    def _respond(self, messages: List[BaseMessage], tool_names=None, response_schema=None) -> AIMessage:
+        self.calls += 1
+        prompt = "\n".join(_text(message) for message in messages)
+        user_messages = [_text(m) for m in messages if isinstance(m, HumanMessage)]
+        latest = user_messages[-1] if user_messages else ""
+        has_system = any(isinstance(m, SystemMessage) for m in messages)
+
+        tool_calls = []
+        if tool_names:
+            call = matcher_tool_call(prompt, tool_names[0], f"call_{self.calls}")
+            content = "" if call else "_end_"
+            tool_calls = [call] if call else []
+        elif response_schema is not None:
+            turn = gathering_turn(latest, prompt)
+            content = json.dumps({key: turn.get(key) for key in response_schema.model_fields})
+        elif has_system and "(reply last)" in prompt:
+            content = json.dumps(gathering_turn(latest, prompt))
+        elif has_system and "Return ONLY valid JSON" in prompt:
+            content = json.dumps(extract_fields(latest, prompt))
+        else:
+            content = text_reply(prompt)
+
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(content + json.dumps([call["args"] for call in tool_calls]))
+        return AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={"input_tokens": input_tokens, "output_tokens": output_tokens,
+                            "total_tokens": input_tokens + output_tokens},
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, tool_names=None, response_schema=None, **kwargs: Any) -> ChatResult:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, tool_names, response_schema))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, tool_names=None, response_schema=None, **kwargs: Any) -> ChatResult:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, tool_names, response_schema))])
+
+    def _chunks(self, message: AIMessage):
+        """The answer as streamed chunks; tool calls and usage go out with the last chunk"""
+        content = message.content
+        pieces = [content[i:i + STREAM_PIECE_CHARS] for i in range(0, len(content), STREAM_PIECE_CHARS)] or [""]
+        for piece in pieces[:-1]:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+        tool_call_chunks = [
+            {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i, "type": "tool_call_chunk"}
+            for i, call in enumerate(message.tool_calls)
+        ]
+        yield ChatGenerationChunk(message=AIMessageChunk(
+            content=pieces[-1], tool_call_chunks=tool_call_chunks, usage_metadata=message.usage_metadata))
+
+    def _stream(self, messages, stop=None, run_manager=None, tool_names=None, response_schema=None, **kwargs: Any):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        for chunk in self._chunks(self._respond(messages, tool_names, response_schema)):
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, tool_names=None, response_schema=None, **kwargs: Any):
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        for chunk in self._chunks(self._respond(messages, tool_names, response_schema)):
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
@@ -0,0 +1,291 @@
+import re
+import threading
+from datetime import datetime, timedelta, date as date_cls
+
+
+# Rule-based extraction that runs ahead of the LLM in the information gatherer.
+# It only fills a field when the match is unambiguous; everything else is left to
+# extract_information_from_message.
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"(?<![\w-])\+?\(?\d[\d\s().-]{8,}\d(?![\w-])")
+ISO_DATE_RE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+RELATIVE_DATE_RE = re.compile(r"\b(day after tomorrow|tomorrow|today)\b", re.IGNORECASE)
+WEEKDAY_RE = re.compile(r"\b(?:(this|next)\s+)?(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b", re.IGNORECASE)
+# full month names or their usual abbreviations as whole words ("maybe 10" is not May 10)
+MONTH_NAME = (r"(january|jan|february|feb|march|mar|april|apr|may|june|jun|july|jul|august|aug"
+              r"|september|sept|sep|october|oct|november|nov|december|dec)\b\.?")
+MONTH_DAY_RE = re.compile(
+    r"\b(?:(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?" + MONTH_NAME +
+    r"|" + MONTH_NAME + r"\s+(\d{1,2})(?:st|nd|rd|th)?\b)",
+    re.IGNORECASE
+)
+PART_OF_DAY_RE = re.compile(r"\b(morning|afternoon|evening)\b", re.IGNORECASE)
+CLOCK_TIME_RE = re.compile(r"\b(\d{1,2})(?::(\d{2}))?\s*(am|pm)\b|\b([01]?\d|2[0-3]):([0-5]\d)\b", re.IGNORECASE)
+NAME_RE = re.compile(r"\b(?:my name is|my name's|call me|name\s*:)\s+([A-Za-z][A-Za-z'-]*(?:\s+[A-Za-z][A-Za-z'-]*)?)", re.IGNORECASE)
+SLOT_ID_RE = re.compile(r"^\D*?(?:slot|id|#|number|no\.?)?\s*#?\s*(\d+)\D*$", re.IGNORECASE)
+WORD_RE = re.compile(r"[a-z']+")
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+ORDINALS = {"first": 0, "1st": 0, "second": 1, "2nd": 1, "third": 2, "3rd": 2, "fourth": 3, "4th": 3,
+            "fifth": 4, "5th": 4, "last": -1}
+
+# Words that carry no booking information; if only these are left after the rule-based
+# matches are cut out, the LLM has nothing more to extract from the message.
+FILLER_WORDS = {
+    "a", "am", "an", "and", "any", "at", "be", "by", "can", "contact", "could", "date", "day", "details",
+    "do", "e", "email", "fine", "for", "good", "great", "hi", "hello", "hey", "i", "i'd", "i'm", "id", "in",
+    "is", "it", "it's", "its", "just", "like", "mail", "me", "mobile", "my", "no", "number", "of", "ok",
+    "okay", "on", "or", "phone", "please", "prefer", "preferably", "reach", "s", "sure", "that", "the",
+    "thanks", "thank", "then", "this", "time", "to", "u", "works", "would", "yeah", "yes", "you", "around",
+    "name", "name's", "call", "slot", "number", "take", "book", "want", "one", "will", "i'll", "let's",
+    "go", "with", "next", "coming",
+}
+
+# Words that are never taken as a name: "Tomorrow", "Evening" or "May" answer a different
+# question (catalogue service names are rejected too, see parse_name's not_names)
+NOT_NAME_WORDS = set(WEEKDAYS) | set(MONTHS) | {
+    "january", "february", "march", "april", "june", "july", "august", "september", "sept",
+    "october", "november", "december", "today", "tomorrow", "tonight", "morning", "afternoon",
+    "evening", "noon", "night", "week", "weekend", "instead", "after", "before",
+}
+
+
+##--------------------------------------------------------------------
+#                   COUNTERS
+##--------------------------------------------------------------------
+_stats_lock = threading.Lock()
+_stats = {
+    "turns": 0,                 # gathering turns that went through the fast path
+    "llm_extractions_skipped": 0,
+    "llm_extractions": 0,
+    "slot_ids_resolved": 0,
+    "fields": {},               # field -> times resolved locally
+}
+
+
+def record_turn(resolved_fields, llm_called):
+    """Count one gathering turn and the fields the fast path resolved in it"""
+    with _stats_lock:
+        _stats["turns"] += 1
+        _stats["llm_extractions" if llm_called else "llm_extractions_skipped"] += 1
+        for field in resolved_fields:
+            _stats["fields"][field] = _stats["fields"].get(field, 0) + 1
+
+
+def record_slot_id():
+    with _stats_lock:
+        _stats["slot_ids_resolved"] += 1
+
+
+def get_fast_path_stats():
+    """Snapshot of the fast-path counters (LLM extraction calls saved, per-field hits)"""
+    with _stats_lock:
+        stats = dict(_stats)
+        stats["fields"] = dict(_stats["fields"])
+    stats["skip_rate"] = stats["llm_extractions_skipped"] / stats["turns"] if stats["turns"] else 0.0
+    return stats
+
+
+##--------------------------------------------------------------------
+#                   PARSERS
+##--------------------------------------------------------------------
+def parse_date(message, today=None):
+    """
+    Return (YYYY-MM-DD, matched span) for an unambiguous date expression, else (None, None).
+    "next friday" is left to the LLM since people disagree on what it means.
+    """
+    today = today or datetime.now().date()
+    found = []
+
+    for match in ISO_DATE_RE.finditer(message):
+        try:
+            found.append((date_cls(int(match.group(1)), int(match.group(2)), int(match.group(3))), match.span()))
+        except ValueError:
+            return None, None
+
+    for match in RELATIVE_DATE_RE.finditer(message):
+        offset = {"today": 0, "tomorrow": 1, "day after tomorrow": 2}[match.group(1).lower()]
+        found.append((today + timedelta(days=offset), match.span()))
+
+    for match in WEEKDAY_RE.finditer(message):
+        if match.group(1) and match.group(1).lower() == "next":
+            return None, None
+        days_ahead = (WEEKDAYS.index(match.group(2).lower()) - today.weekday()) % 7
+        if days_ahead == 0:
+            # "monday" said on a monday: today or a week from now
+            return None, None
+        found.append((today + timedelta(days=days_ahead), match.span()))
+
+    for match in MONTH_DAY_RE.finditer(message):
+        day = match.group(1) or match.group(4)
+        month = MONTHS.index((match.group(2) or match.group(3)).lower()[:3]) + 1
+        try:
+            value = date_cls(today.year, month, int(day))
+            if value < today:
+                value = date_cls(today.year + 1, month, int(day))
+        except ValueError:
+            return None, None
+        found.append((value, match.span()))
+
+    if len({value for value, _ in found}) != 1:
+        return None, None
+    return found[0][0].strftime("%Y-%m-%d"), [span for _, span in found]
+
+
+def parse_time(message):
+    """Return (preferred_time, spans): "morning"/"afternoon"/"evening" or HH:MM, else (None, None)"""
+    found = []
+    for match in PART_OF_DAY_RE.finditer(message):
+        found.append((match.group(1).lower(), match.span()))
+
+    for match in CLOCK_TIME_RE.finditer(message):
+        if match.group(3):
+            hour = int(match.group(1)) % 12 + (12 if match.group(3).lower() == "pm" else 0)
+            minute = int(match.group(2) or 0)
+            if int(match.group(1)) > 12 or minute > 59:
+                return None, None
+        else:
+            hour, minute = int(match.group(4)), int(match.group(5))
+        found.append((f"{hour:02d}:{minute:02d}", match.span()))
+
+    clock_times = {value for value, _ in found if ":" in value}
+    parts = {value for value, _ in found if ":" not in value}
+    if len(clock_times) > 1 or len(parts) > 1 or not found:
+        return None, None
+    # "3pm in the afternoon" -> the clock time is the more precise answer
+    value = clock_times.pop() if clock_times else parts.pop()
+    return value, [span for _, span in found]
+
+
+def parse_contact(message):
+    """Return (email or phone, spans) when the message holds exactly one contact, else (None, None)"""
+    emails = list(EMAIL_RE.finditer(message))
+    text = EMAIL_RE.sub(" ", message)
+    text = ISO_DATE_RE.sub(lambda m: " " * len(m.group(0)), text)
+    phones = [m for m in PHONE_RE.finditer(text) if 10 <= len(re.sub(r"\D", "", m.group(0))) <= 15]
+
+    if len(emails) + len(phones) != 1:
+        return None, None
+    match = emails[0] if emails else phones[0]
+    value = match.group(0) if emails else re.sub(r"[^\d+]", "", match.group(0))
+    return value, [match.span()]
+
+
+def parse_name(message, expecting_name=False, not_names=()):
+    """
+    "my name is Jane Doe" / "call me Jane"; a bare one-to-three word reply is taken as the
+    name only when the assistant just asked for it. Date, time and month words and the words
+    of not_names (catalogue service names) are never part of a name.
+    """
+    rejected = NOT_NAME_WORDS | {word for name in not_names for word in name.lower().split()}
+
+    match = NAME_RE.search(message)
+    if match and match.group(1).split()[0].lower() not in FILLER_WORDS:
+        name_words = [w for w in match.group(1).split() if w.lower() not in FILLER_WORDS]
+        if not any(w.lower() in rejected for w in name_words):
+            return " ".join(w.capitalize() for w in name_words), [match.span()]
+
+    if expecting_name:
+        words = message.strip().rstrip(".!").split()
+        if 1 <= len(words) <= 3 and all(re.fullmatch(r"[A-Za-z][A-Za-z'-]*", w) for w in words) \
+                and not any(w.lower() in FILLER_WORDS or w.lower() in rejected for w in words):
+            return " ".join(w.capitalize() for w in words), [(0, len(message))]
+    return None, None
+
+
+def parse_service(message, service_names):
+    """Exactly one catalogue service named verbatim (case-insensitive) in the message"""
+    matches = []
+    for name in service_names or []:
+        match = re.search(r"\b" + re.escape(name) + r"\b", message, re.IGNORECASE)
+        if match:
+            matches.append((name, match.span()))
+    # "dental cleaning" also contains "dental": keep the longest, but only if the rest are inside it
+    matches.sort(key=lambda m: m[1][1] - m[1][0], reverse=True)
+    if not matches or any(not (matches[0][1][0] <= s and e <= matches[0][1][1]) for _, (s, e) in matches[1:]):
+        return None, None
+    return matches[0][0], [matches[0][1]]
+
+
+def parse_slot_id(message, available_slots):
+    """
+    Resolve the user's pick in the CONFIRMING_SLOTS stage: "12", "slot 12", "#12",
+    "the first one". Returns a slot_id from available_slots, or None.
+    """
+    available_slots = available_slots or []
+    slot_ids = [slot.get("slot_id") for slot in available_slots]
+
+    match = SLOT_ID_RE.match(message.strip())
+    if match and len(re.findall(r"\d+", message)) == 1:
+        slot_id = int(match.group(1))
+        if slot_id in slot_ids:
+            return slot_id
+
+    words = set(WORD_RE.findall(message.lower())) | set(re.findall(r"\b\d(?:st|nd|rd|th)\b", message.lower()))
+    picks = [ORDINALS[w] for w in words if w in ORDINALS]
+    if len(picks) == 1 and not re.search(r"\d+(?!st|nd|rd|th)\b", message.lower()):
+        try:
+            return available_slots[picks[0]]["slot_id"]
+        except (IndexError, KeyError):
+            return None
+    return None
+
+
+##--------------------------------------------------------------------
+#                   EXTRACTOR
+##--------------------------------------------------------------------
+def expects_name(missing_info):
+    """True when the assistant's last question asked for the user's name"""
+    return bool(missing_info) and missing_info[0] == "seeker_name"
+
+
+def mask_spans(message, spans):
+    """message with the given spans blanked out (same length, so offsets stay valid)"""
+    for start, end in spans:
+        message = message[:start] + " " * (end - start) + message[end:]
+    return message
+
+
+def extract_locally(message, missing_info=None, service_names=None, today=None, not_names=()):
+    """
+    Rule-based pass over the latest message.
+    Returns (extracted_info, resolved_fields, residual_text): extracted_info uses the same keys
+    as extract_information_from_message; residual_text is what is left once the matched spans
+    are cut out.
+    The name is parsed last, on the text no other field claimed, and a bare reply counts as
+    the name only when nothing else was found in it ("Tomorrow" is a date, not a name).
+    """
+    missing_info = missing_info or []
+    extracted_info = {}
+    spans = []
+
+    parsers = [
+        ("contact", lambda: parse_contact(message)),
+        ("preferred_date", lambda: parse_date(message, today)),
+        ("preferred_time", lambda: parse_time(message)),
+    ]
+    if service_names is not None:
+        parsers.append(("service_type", lambda: parse_service(message, service_names)))
+
+    for field, parser in parsers:
+        value, field_spans = parser()
+        if value:
+            extracted_info[field] = value
+            spans.extend(field_spans)
+
+    name, name_spans = parse_name(mask_spans(message, spans),
+                                  expecting_name=expects_name(missing_info) and not extracted_info,
+                                  not_names=[*not_names, *(service_names or [])])
+    if name:
+        extracted_info["name"] = name
+        spans.extend(name_spans)
+
+    residual = mask_spans(message, spans)
+    return extracted_info, list(extracted_info), residual
+
+
+def is_trivial(residual_text):
+    """True when nothing but filler words and punctuation is left"""
+    return all(word in FILLER_WORDS for word in WORD_RE.findall(residual_text.lower()))
@@ -1,36 +1,45 @@
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.sqlite import SqliteSaver
-import sqlite3
 from .state import AppointmentState
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
-from engine.nodes import information_gatherer_node, service_matcher_node, booking_node, conversation_router, tools_node_matcher, matcher_tool_result_handler
+from engine.nodes import information_gatherer_node, service_matcher_node, booking_node, conversation_router, tools_node_matcher, matcher_tool_result_handler, direct_slot_fetch_node
+from engine.nodes import ainformation_gatherer_node, aservice_matcher_node, abooking_node, adirect_slot_fetch_node
+from engine.nodes import history_manager_node, ahistory_manager_node
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import tools_condition
-from langgraph.checkpoint.sqlite import SqliteSaver
+from engine.checkpointer import get_checkpointer, create_async_checkpointer
+from telemetry import traced
 
 
-db_path = "state_db/example.db"
-conn = sqlite3.connect(db_path, check_same_thread=False)
+def node(func, afunc):
+    """
+    Node with a sync and an async implementation; invoke/stream use func, ainvoke/astream afunc.
+    Both run in a "node.<func name>" span.
+    """
+    span_name = f"node.{func.__name__}"
+    return RunnableLambda(traced(span_name)(func), afunc=traced(span_name)(afunc), name=func.__name__)
 
-memory = SqliteSaver(conn)
 
-def create_appointment_graph():
+def build_appointment_workflow():
     """
-    Creates the main appointment booking graph
+    Builds the (uncompiled) appointment booking graph; every node runs under both
+    invoke/stream and ainvoke/astream
     """
     
     # Create the graph
     workflow = StateGraph(AppointmentState)
     
     # Add nodes
-    workflow.add_node("gather_info_agent", information_gatherer_node)
-    workflow.add_node("match_services_agent", service_matcher_node)
-    workflow.add_node("scheduler_agent", booking_node)
+    workflow.add_node("gather_info_agent", node(information_gatherer_node, ainformation_gatherer_node))
+    workflow.add_node("match_services_agent", node(service_matcher_node, aservice_matcher_node))
+    workflow.add_node("scheduler_agent", node(booking_node, abooking_node))
+    workflow.add_node("direct_slot_fetcher", node(direct_slot_fetch_node, adirect_slot_fetch_node))
+    workflow.add_node("history_manager", node(history_manager_node, ahistory_manager_node))
 
 
     # Tool nodes
     workflow.add_node("tools_node_matcher", tools_node_matcher)
-    workflow.add_node("matcher_tool_result_handler", matcher_tool_result_handler)
+    workflow.add_node("matcher_tool_result_handler", traced("node.matcher_tool_result_handler")(matcher_tool_result_handler))
     # workflow.add_node("tools_node_scheduler", tools_node_scheduler)
     # workflow.add_node("booking_tool_result_handler", booking_tool_result_handler)
 
@@ -39,19 +48,18 @@ def create_appointment_graph():
         "gather_info_agent",
         conversation_router,
         {   
-            "gather_info": END,
+            "gather_info": "history_manager",  # turn is over: bound the history, then stop
             "match_services": "match_services_agent", # Move to service matching
+            "fetch_slots": "direct_slot_fetcher", # Query fully determined, skip the LLM agent
             "schedule": "scheduler_agent", # Move to scheduler agent
-            "end": END
+            "end": "history_manager"
         }
     )
+    workflow.add_edge("history_manager", END)
 
 
     ## custom tool condition
     def custom_tool_condition(state):
-        ai_message = state["messages_history"][-1] 
-        print(isinstance(ai_message, AIMessage))
-        print(ai_message)
         return tools_condition(state, messages_key="messages_history")
 
     ## for match_services_agent----------------- 
@@ -67,6 +75,7 @@ def create_appointment_graph():
     # After tool execution → return to matcher or next stage
     workflow.add_edge("tools_node_matcher", "match_services_agent")
     workflow.add_edge("matcher_tool_result_handler", "gather_info_agent")
+    workflow.add_edge("direct_slot_fetcher", "gather_info_agent")
     # Sequential flow after info gathering
     # workflow.add_edge("matcher_tool_result_handler", "gather_info_agent")
 
@@ -78,7 +87,23 @@ def create_appointment_graph():
     # Set entry point
     workflow.set_entry_point("gather_info_agent")
     
-    return workflow.compile(checkpointer=memory)
+    return workflow
+
+
+def create_appointment_graph():
+    """
+    Creates the main appointment booking graph, checkpointed by the configured
+    checkpointer (CHECKPOINTER=sqlite|postgres, see engine/checkpointer.py)
+    """
+    return build_appointment_workflow().compile(checkpointer=get_checkpointer())
+
+
+async def create_async_appointment_graph():
+    """
+    Same graph with the async variant of the configured checkpointer, to be driven with
+    ainvoke/astream (must be called from the event loop that will run it)
+    """
+    return build_appointment_workflow().compile(checkpointer=await create_async_checkpointer())
 
 if __name__ == '__main__':
     graph = create_appointment_graph()
\ No newline at end of file
@@ -0,0 +1,96 @@
+import os
+
+from langchain_core.messages import BaseMessage, ToolMessage
+
+
+# Bounded conversation memory: the last HISTORY_KEEP_TURNS user turns stay verbatim in
+# messages_history, older ones are folded into state["conversation_summary"].
+# Folding waits until HISTORY_FOLD_TURNS extra turns have piled up, so the summarizer runs
+# once every few turns rather than on every message.
+HISTORY_KEEP_TURNS = int(os.getenv("HISTORY_KEEP_TURNS", 6))
+HISTORY_FOLD_TURNS = int(os.getenv("HISTORY_FOLD_TURNS", 4))
+HISTORY_SUMMARY_MAX_TOKENS = int(os.getenv("HISTORY_SUMMARY_MAX_TOKENS", 300))
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token), good enough for budgeting"""
+    return (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def clip_to_budget(text, max_tokens=HISTORY_SUMMARY_MAX_TOKENS):
+    """Keep the most recent part of text within max_tokens"""
+    text = (text or "").strip()
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return "…" + text[-(max_chars - 1):]
+
+
+def is_user_message(message):
+    return isinstance(message, dict) and message.get("role") == "user"
+
+
+def dialogue(messages):
+    """Only what the user and the assistant said to each other (no tool calls / results)"""
+    return [m for m in messages if isinstance(m, dict) and m.get("role") in ("user", "assistant")]
+
+
+def turn_starts(messages):
+    """Indexes where a user turn starts (each user message opens one)"""
+    return [i for i, message in enumerate(messages) if is_user_message(message)]
+
+
+def split_point(messages, keep_turns=HISTORY_KEEP_TURNS, fold_turns=HISTORY_FOLD_TURNS):
+    """
+    Index to cut messages at, or None while there is nothing to fold yet.
+    Cuts only at the start of a user turn, so an assistant tool call and its ToolMessage
+    always stay on the same side.
+    """
+    starts = turn_starts(messages)
+    if len(starts) <= keep_turns + fold_turns:
+        return None
+    cut = starts[-keep_turns] if keep_turns else len(messages)
+    while 0 < cut < len(messages) and isinstance(messages[cut], ToolMessage):
+        cut -= 1
+    return cut or None
+
+
+def render_message(message):
+    """One line of transcript for the summarizer"""
+    if isinstance(message, dict):
+        return f"{message.get('role', 'unknown')}: {message.get('content', '')}"
+    if isinstance(message, ToolMessage):
+        return f"tool result: {message.content}"
+    if isinstance(message, BaseMessage):
+        tool_calls = getattr(message, "tool_calls", None)
+        if tool_calls:
+            return "assistant called " + ", ".join(f"{call['name']}({call['args']})" for call in tool_calls)
+        return f"assistant: {message.content}"
+    return str(message)
+
+
+def summary_prompt(previous_summary, messages, max_tokens=HISTORY_SUMMARY_MAX_TOKENS):
+    transcript = "\n".join(render_message(message) for message in messages)
+    return f"""
+    You maintain the running summary of a conversation between a user and an appointment booking assistant.
+
+    Summary so far:
+    {previous_summary or "(none)"}
+
+    Older messages to fold into it:
+    {transcript}
+
+    Write the updated summary in at most {max_tokens * 3 // 4} words. Keep what the assistant still needs:
+    the requested service, dates and times discussed, the user's name and contact, slots offered,
+    bookings, reschedules and cancellations (with ids). Drop greetings and small talk.
+    Return only the summary text.
+    """
+
+
+def fallback_summary(previous_summary, messages, max_tokens=HISTORY_SUMMARY_MAX_TOKENS):
+    """Used when the summarizer call fails: plain transcript, clipped to the budget"""
+    lines = [previous_summary] if previous_summary else []
+    lines.extend(render_message(message) for message in messages)
+    return clip_to_budget(" | ".join(lines), max_tokens)
@@ -0,0 +1,113 @@
+import os
+import threading
+
+from dotenv import load_dotenv, find_dotenv
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from telemetry import llm_tracing_callback
+
+_ = load_dotenv(find_dotenv())
+
+# Per-request timeout (seconds) and retry budget for every Gemini call.
+# A stuck request used to hang a worker forever (timeout=None).
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 30))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 2))
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+# "gemini" - the real models; "fake" - engine.fake_llm.ScriptedChatModel, a deterministic offline
+# stand-in (no API key or network needed; used by the benchmarks in bench/)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+
+# Tag for LLM calls whose output is shown to the user as-is; only these are token-streamed
+# (structured extraction / tool-calling output is not).
+USER_FACING_TAG = "user_facing"
+USER_FACING = {"tags": [USER_FACING_TAG]}
+
+# Set in the graph config by execute_graph.stream_chat when tokens are streamed. User-facing
+# text that comes out of a structured call (the gatherer's combined call) is then emitted by
+# the node itself as custom stream events.
+STREAM_TOKENS_KEY = "stream_tokens"
+
+
+def streams_tokens(config):
+    """True when the running graph turn streams tokens to the client"""
+    return bool(((config or {}).get("configurable") or {}).get(STREAM_TOKENS_KEY))
+
+
+def message_text(message):
+    """Text of a message or chunk whose content is a string or a list of parts"""
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+
+
+# Process-wide registry of chat model clients.
+# Building a ChatGoogleGenerativeAI re-creates its HTTP/gRPC clients, so nodes fetch
+# shared instances from here instead; they are safe to use from many threads/sessions.
+_clients = {}      # (model, temperature, timeout, max_retries) -> ChatGoogleGenerativeAI / ScriptedChatModel
+_bound = {}        # client key + tool names / output schema -> bound runnable
+_lock = threading.Lock()
+
+
+def _tool_name(tool):
+    return getattr(tool, "name", None) or getattr(tool, "__name__", None) or repr(tool)
+
+
+def _create_client(model, temperature, timeout, max_retries):
+    if LLM_BACKEND == "fake":
+        from engine.fake_llm import ScriptedChatModel
+        return ScriptedChatModel(model=model, temperature=temperature, callbacks=[llm_tracing_callback])
+    return ChatGoogleGenerativeAI(
+        model=model,
+        temperature=temperature,
+        timeout=timeout,
+        max_retries=max_retries,
+        callbacks=[llm_tracing_callback],      # llm.call spans (model, tokens, latency)
+    )
+
+
+def get_llm(model=DEFAULT_MODEL, temperature=0, tools=None, timeout=None, max_retries=None,
+            structured_output=None):
+    """
+    Return the shared chat model for (model, temperature, tools).
+    The underlying client is created once per (model, temperature, timeout, max_retries)
+    and kept warm; tool-bound and structured-output variants wrap that same client.
+    With LLM_BACKEND=fake the client is a ScriptedChatModel.
+    `structured_output` is a pydantic model the response is parsed into (with_structured_output).
+    """
+    timeout = LLM_TIMEOUT if timeout is None else timeout
+    max_retries = LLM_MAX_RETRIES if max_retries is None else max_retries
+    client_key = (model, temperature, timeout, max_retries)
+
+    with _lock:
+        client = _clients.get(client_key)
+        if client is None:
+            client = _create_client(model, temperature, timeout, max_retries)
+            _clients[client_key] = client
+
+        if structured_output is not None:
+            bound_key = client_key + ("structured", structured_output)
+            bound = _bound.get(bound_key)
+            if bound is None:
+                bound = client.with_structured_output(structured_output)
+                _bound[bound_key] = bound
+            return bound
+
+        if not tools:
+            return client
+
+        bound_key = client_key + tuple(sorted(_tool_name(tool) for tool in tools))
+        bound = _bound.get(bound_key)
+        if bound is None:
+            bound = client.bind_tools(tools)
+            _bound[bound_key] = bound
+        return bound
+
+
+def clear_llm_registry():
+    """Drop every cached client (e.g. after changing credentials)"""
+    with _lock:
+        _clients.clear()
+        _bound.clear()
@@ -0,0 +1,223 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from telemetry import current_span, error_event
+
+
+# Response cache for the gatherer's LLM calls: the same short messages ("haircut tomorrow
+# morning", "my email is ...") come in from many users, and for the same stage, date and
+# normalized text Gemini returns the same answer. What is cached depends on GATHERER_MODE:
+#   combined   "combined"   - the extraction + reply call, keyed without the user's name and
+#                             contact; answers that contain either are not stored
+#              "extraction" - the fallback extraction, only when the combined call fails
+#              "follow_up"  - the fallback question, when the combined call fails or its
+#                             next_step does not match the node's
+#   two_call   "extraction" and "follow_up" - the separate extraction and question calls
+# Fast-path turns make no extraction call, and replies for fetch_slots / unsupported_service
+# are not cached. Backends:
+#   LLM_CACHE=memory  in-process LRU (default)
+#   LLM_CACHE=sqlite  on-disk, shared by the workers on one host (LLM_CACHE_PATH)
+#   LLM_CACHE=off
+LLM_CACHE = os.getenv("LLM_CACHE", "memory").lower()
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 3600))              # seconds
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 2048))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "state_db/llm_cache.db")
+
+PUNCTUATION_RE = re.compile(r"[\s.,!?;:]+")
+
+
+def normalize_prompt(text):
+    """Case, whitespace and punctuation runs do not change the answer"""
+    return PUNCTUATION_RE.sub(" ", str(text).lower()).strip()
+
+
+def cache_key(kind, stage, today, prompt):
+    """kind ("combined", "extraction", "follow_up"), conversation stage, today's date and the normalized prompt"""
+    stage = getattr(stage, "value", stage)
+    payload = json.dumps([kind, stage, today, normalize_prompt(prompt)], default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryBackend:
+    """Exact-match LRU with per-entry expiry"""
+
+    def __init__(self, max_entries=LLM_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()       # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] < time.time():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def size(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SqliteBackend:
+    """Same interface on a local SQLite file (WAL), so the cache survives restarts"""
+
+    def __init__(self, path=LLM_CACHE_PATH, max_entries=LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    used_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_used_at ON llm_cache (used_at)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        with self._conn() as conn:
+            row = conn.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return False, None
+            if row[1] < now:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return False, None
+            conn.execute("UPDATE llm_cache SET used_at = ? WHERE key = ?", (now, key))
+        return True, json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl, now)
+            )
+            # evict expired rows, then least recently used ones beyond max_entries
+            conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+            conn.execute("""
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY used_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+    def size(self):
+        with self._conn() as conn:
+            return conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def clear(self):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM llm_cache")
+
+
+class LLMResponseCache:
+    """
+    get/set on (kind, stage, today, prompt) plus hit/miss counters per kind.
+    Values must be JSON-serializable (extraction dicts, reply strings).
+    """
+
+    def __init__(self, backend, ttl=LLM_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self._stats_lock = threading.Lock()
+        self._stats = {}        # kind -> {"hits", "misses"}
+
+    def _count(self, kind, field):
+        with self._stats_lock:
+            counts = self._stats.setdefault(kind, {"hits": 0, "misses": 0})
+            counts[field] += 1
+
+    def get(self, kind, stage, today, prompt):
+        """(found, value)"""
+        if self.backend is None:
+            return False, None
+        try:
+            found, value = self.backend.get(cache_key(kind, stage, today, prompt))
+        except Exception as e:
+            error_event("llm_cache_read_error", e)
+            found, value = False, None
+        self._count(kind, "hits" if found else "misses")
+        current_span().add_event("llm_cache", kind=kind, hit=found)
+        return found, value
+
+    def set(self, kind, stage, today, prompt, value):
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(cache_key(kind, stage, today, prompt), value, self.ttl)
+        except Exception as e:
+            error_event("llm_cache_write_error", e)
+
+    def stats(self):
+        with self._stats_lock:
+            per_kind = {kind: dict(counts) for kind, counts in self._stats.items()}
+        hits = sum(counts["hits"] for counts in per_kind.values())
+        lookups = hits + sum(counts["misses"] for counts in per_kind.values())
+        for counts in per_kind.values():
+            total = counts["hits"] + counts["misses"]
+            counts["hit_rate"] = counts["hits"] / total if total else 0.0
+        return {
+            "backend": LLM_CACHE,
+            "entries": self.backend.size() if self.backend is not None else 0,
+            "hits": hits,
+            "misses": lookups - hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "kinds": per_kind,
+        }
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+
+def _create_backend():
+    if LLM_CACHE == "memory":
+        return MemoryBackend()
+    if LLM_CACHE == "sqlite":
+        return SqliteBackend()
+    if LLM_CACHE != "off":
+        logging.getLogger(__name__).warning("Unknown LLM_CACHE %r, caching disabled", LLM_CACHE)
+    return None
+
+
+llm_cache = LLMResponseCache(_create_backend())
+
+
+def get_llm_cache_stats():
+    """Hit/miss counters and hit rate, overall and per kind"""
+    return llm_cache.stats()
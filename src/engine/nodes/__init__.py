@@ -1,9 +1,14 @@
-from .information_gatherer_node import information_gatherer_node
-from .service_matcher_node import service_matcher_node, tools_node_matcher, matcher_tool_result_handler
-from .booking_node import booking_node
+from .information_gatherer_node import information_gatherer_node, ainformation_gatherer_node
+from .service_matcher_node import service_matcher_node, tools_node_matcher, matcher_tool_result_handler, direct_slot_fetch_node, \
+    aservice_matcher_node, adirect_slot_fetch_node
+from .booking_node import booking_node, abooking_node
 from .conversation_router import conversation_router
+from .history_node import history_manager_node, ahistory_manager_node
 
 
 __all__ = [
-    'information_gatherer_node', 'service_matcher_node', 'booking_node', 'conversation_router', "tools_node_matcher", "matcher_tool_result_handler"
+    'information_gatherer_node', 'service_matcher_node', 'booking_node', 'conversation_router', "tools_node_matcher", "matcher_tool_result_handler",
+    "direct_slot_fetch_node",
+    "ainformation_gatherer_node", "aservice_matcher_node", "abooking_node", "adirect_slot_fetch_node",
+    "history_manager_node", "ahistory_manager_node"
 ]
\ No newline at end of file
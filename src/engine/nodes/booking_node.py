@@ -2,15 +2,18 @@ from typing import Dict, Optional
 from datetime import datetime
 import sqlite3
 from engine.state import AppointmentState, ConversationStage
-from dao import DAOFactory
+from dao import DAOFactory, AsyncDAOFactory
 from datetime import datetime
 from langgraph.prebuilt import ToolNode
 from typing import Annotated
 from langchain_core.tools import InjectedToolCallId
 from langgraph.types import Command
 from dao import Appointment
+from dao.appointment_dao import OLD_APPOINTMENT_INACTIVE
+from telemetry import current_span, error_event
 # Initialize DAO
 dao_factory = DAOFactory()
+async_dao_factory = AsyncDAOFactory()
 
 from langchain_core.tools import tool
 
@@ -21,58 +24,86 @@ from dao import DAOFactory
 ##########################                   Tools for booking agent        ###################################################
 
 # @tool
-def book_slot_tool(seeker_id, provider_id, slot_id, scheduled_time, status, type_id=1, notes=None):
+def book_slot_tool(seeker_id, slot_id, status="booked", type_id=None, notes=None):
     """
-    Book a new appointment slot for a seeker with a provider.
+    Atomically book an availability slot for a seeker.
+    Locks the slot, checks it is still available, creates the appointment and marks the slot
+    as booked in a single database transaction (AppointmentDAO.book_slot_atomically).
 
     Args:
         seeker_id (int): Unique identifier of the seeker (user/patient) booking the slot.
-        provider_id (int): Unique identifier of the provider (doctor/mentor/etc.) with whom the slot is booked.
         slot_id (int): The ID of the availability slot being booked.
-        scheduled_time (str): The scheduled appointment time (format: "YYYY-MM-DD HH:MM:SS").
-        status (str): Status of the appointment (e.g., 'booked', 'pending', 'confirmed').
-        type_id (int, optional): Type of appointment (default=1).
+        status (str, optional): Status of the appointment (default 'booked').
+        type_id (int, optional): Type of appointment (default: the slot's own type).
         notes (str, optional): Any additional notes related to the appointment.
 
     Returns:
-        str | Appointment:
-            - Returns an Appointment object with the generated appointment ID if successfully created.
-            - Returns the string "error in creating appointment" if the insertion fails.
+        Appointment | None | str:
+            - Returns an Appointment object with the generated appointment ID if successfully booked.
+            - Returns None if the slot was already taken (or is being booked by another session).
+            - Returns the string "error in creating appointment ..." if the transaction fails.
 
     Usage:
         >>> book_slot_tool(
         ...     seeker_id=101,
-        ...     provider_id=55,
         ...     slot_id=3001,
-        ...     scheduled_time="2025-09-10 14:30:00",
-        ...     status="booked",
         ...     notes="First-time consultation"
         ... )
     """
     appointment_dao = dao_factory.get_appointment_dao()
-    curr_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    appointment = Appointment(
-        type_id=type_id,
-        seeker_id=seeker_id,
-        provider_id=provider_id,
-        slot_id=slot_id,
-        scheduled_time=scheduled_time,
-        status=status,
-        notes=None,
-        created_at=curr_time,
-        updated_at=curr_time
-    )
 
     try:
-        appointment = appointment_dao.create(appointment)
+        appointment = appointment_dao.book_slot_atomically(
+            seeker_id=seeker_id,
+            slot_id=slot_id,
+            type_id=type_id,
+            status=status,
+            notes=notes
+        )
     except Exception as e:
         return f"error in creating appointment for the slot id : {slot_id}. error : {e}"
     return appointment
 
+# @tool
+def reschedule_slot_tool(old_appointment_id, new_slot_id, seeker_id=None, status="booked", notes=None):
+    """
+    Move an existing appointment to a new slot.
+    Cancels the old appointment, releases its slot, books the new slot and creates the new
+    appointment in a single database transaction (AppointmentDAO.reschedule_appointment).
+
+    Args:
+        old_appointment_id (int): The ID of the appointment being rescheduled.
+        new_slot_id (int): The ID of the availability slot to move to.
+        seeker_id (int, optional): Seeker for the new appointment (default: the old appointment's seeker).
+        status (str, optional): Status of the new appointment (default 'booked').
+        notes (str, optional): Any additional notes related to the appointment.
+
+    Returns:
+        dict | str:
+            - Returns {"outcome": "rescheduled", "appointment": Appointment, "old_appointment_id", "old_slot_id",
+              "old_slot_released"} on success.
+            - Returns {"outcome": "slot_taken" | "old_appointment_inactive", "appointment": None} if nothing changed.
+            - Returns the string "error in rescheduling appointment ..." if the transaction fails.
+    """
+    appointment_dao = dao_factory.get_appointment_dao()
+
+    try:
+        return appointment_dao.reschedule_appointment(
+            old_appointment_id=old_appointment_id,
+            new_slot_id=new_slot_id,
+            seeker_id=seeker_id,
+            status=status,
+            notes=notes
+        )
+    except Exception as e:
+        return f"error in rescheduling appointment {old_appointment_id} to slot id : {new_slot_id}. error : {e}"
+
 # @tool
 def cancel_slot_tool(appointment_id: int) -> dict:
     """
     Cancel an existing appointment slot.
+    The appointment is marked as "cancelled" and its slot is released (status 'available')
+    in a single database transaction (AppointmentDAO.cancel_appointment).
 
     Args:
         appointment_id (int): The unique ID of the appointment to cancel.
@@ -83,43 +114,52 @@ def cancel_slot_tool(appointment_id: int) -> dict:
     Usage:
         - Use when the user explicitly requests to cancel an appointment.
         - Pass the `appointment_id` of the booking they want to cancel.
-        - If the appointment exists, it will be marked as "cancelled".
+        - If the appointment exists, it will be marked as "cancelled" and its slot made available again.
     """
     appointment_dao = dao_factory.get_appointment_dao()
-    result = appointment_dao.update(appointment_id, "cancelled")
+    result = appointment_dao.cancel_appointment(appointment_id)
     if result:
         return True
     else:
         return False    
-# @tool
-def update_slot_availability_tool(slot_id, status):
-    """
-    Update the availability status of a specific slot.
-    Need to be called immediately after book_slot_tool with the booking info. need to mark the slot as booked.
+async def abook_slot_tool(seeker_id, slot_id, status="booked", type_id=None, notes=None):
+    """Async book_slot_tool (AsyncAppointmentDAO.book_slot_atomically)"""
+    appointment_dao = async_dao_factory.get_appointment_dao()
 
-    Args:
-        slot_id (int): Unique identifier of the availability slot to update.
-        status (str): New status for the slot (e.g., 'available', 'booked', 'blocked').
+    try:
+        return await appointment_dao.book_slot_atomically(
+            seeker_id=seeker_id,
+            slot_id=slot_id,
+            type_id=type_id,
+            status=status,
+            notes=notes
+        )
+    except Exception as e:
+        return f"error in creating appointment for the slot id : {slot_id}. error : {e}"
 
-    Returns:
-        bool | str:
-            - Returns True if the slot status was successfully updated.
-            - Returns False if no rows were updated (slot not found).
-            - Returns an error string if the update operation fails.
+async def areschedule_slot_tool(old_appointment_id, new_slot_id, seeker_id=None, status="booked", notes=None):
+    """Async reschedule_slot_tool (AsyncAppointmentDAO.reschedule_appointment)"""
+    appointment_dao = async_dao_factory.get_appointment_dao()
 
-    Usage:
-        >>> update_slot_availability_tool(slot_id=3001, status="booked")
-        True
-    """
-    availability_dao = dao_factory.get_availability_dao()
     try:
-        availability_dao.update_slot_status(slot_id=slot_id, status=status)
-    except:
-        return f"error in updating slot status for slot id : {slot_id}"
+        return await appointment_dao.reschedule_appointment(
+            old_appointment_id=old_appointment_id,
+            new_slot_id=new_slot_id,
+            seeker_id=seeker_id,
+            status=status,
+            notes=notes
+        )
+    except Exception as e:
+        return f"error in rescheduling appointment {old_appointment_id} to slot id : {new_slot_id}. error : {e}"
 
+async def acancel_slot_tool(appointment_id: int) -> bool:
+    """Async cancel_slot_tool (AsyncAppointmentDAO.cancel_appointment)"""
+    appointment_dao = async_dao_factory.get_appointment_dao()
+    result = await appointment_dao.cancel_appointment(appointment_id)
+    return bool(result)
 
 # This node will handle calling your tool when Gemini requests it
-# tools_node_scheduler = ToolNode([book_slot_tool,update_slot_availability_tool], messages_key="messages_history")
+# tools_node_scheduler = ToolNode([book_slot_tool], messages_key="messages_history")
 
 
 
@@ -133,95 +173,174 @@ from datetime import datetime
 
 def booking_node(state: AppointmentState) -> AppointmentState:
     """
-    Booking node that creates the appointment by invoking tools directly.
-    Sequentially calls:
-    1. book_slot_tool
-    2. update_slot_availability_tool
+    Booking node that creates, reschedules or cancels the appointment by invoking tools directly.
+    Each path is a single database transaction:
+    - book_slot_tool         (booking)
+    - reschedule_slot_tool   (rescheduling_flag set)
+    - cancel_slot_tool       (CANCELLING stage)
+    If the chosen slot was taken in the meantime the conversation goes back to slot selection;
+    if the appointment being rescheduled is no longer active, to RESCHEDULE_FAILED.
     """
 
-    print("\n\n booking agent : ")
-    print(state["conversation_stage"])
-    print(state)
+    current_span().set_attribute("conversation_stage", state["conversation_stage"].value)
 
     if state['conversation_stage'] == ConversationStage.CANCELLING:
 
-        # cancel the slot now
+        # cancel the appointment and release its slot now (single transaction)
         old_appointment_id = state['old_appointment']  # get the old appointment id from old_appointment
-        old_slot_id = state['old_selected_slot'].get("slot_id") # get the old slot id from old_selected_slot
 
         try:
             res = cancel_slot_tool(old_appointment_id)
-            print(f"cancelling old appointment {old_appointment_id} result: {res}")
+            current_span().set_attributes({"outcome": "cancelled", "cancelled": bool(res)})
         except Exception as e:
-            print(f"Error cancelling old appointment {old_appointment_id}: {e}")
+            error_event("cancel_error", e)
+
+        return cancellation_result(state, old_appointment_id)
+
+    booking, missing_info_result = booking_request(state)
+    if booking is None:
+        return missing_info_result
+
+    if booking["rescheduling"]:
+        # Cancel the old appointment, release its slot and book the new one (single transaction)
+        result = reschedule_slot_tool(
+            old_appointment_id=booking["old_appointment_id"],
+            new_slot_id=booking["slot_id"],
+            seeker_id=booking["seeker_id"],
+            status="booked",
+            notes="Rescheduled via booking agent"
+        )
+        if isinstance(result, dict) and result["outcome"] == OLD_APPOINTMENT_INACTIVE:
+            return reschedule_failed_result(state, booking)
+        appointment = result["appointment"] if isinstance(result, dict) else result
+    else:
+        # Book appointment and mark the slot as booked (single transaction)
+        appointment = book_slot_tool(
+            seeker_id=booking["seeker_id"],
+            slot_id=booking["slot_id"],
+            status="booked",
+            notes="Auto-booked via booking agent"
+        )
+
+    return booking_result(state, booking, appointment)
+
+
+async def abooking_node(state: AppointmentState) -> AppointmentState:
+    """Async booking_node (AsyncAppointmentDAO, same single-transaction paths)"""
+
+    current_span().set_attribute("conversation_stage", state["conversation_stage"].value)
+
+    if state['conversation_stage'] == ConversationStage.CANCELLING:
+        old_appointment_id = state['old_appointment']
 
-        # now update the old slot to available
         try:
-            res = update_slot_availability_tool(old_slot_id, "available")
-            print(f"updating old slot {old_slot_id} to available slot table: {res}")
+            res = await acancel_slot_tool(old_appointment_id)
+            current_span().set_attributes({"outcome": "cancelled", "cancelled": bool(res)})
         except Exception as e:
-            print(f"Error updating old slot {old_slot_id} to available: {e}")
+            error_event("cancel_error", e)
+
+        return cancellation_result(state, old_appointment_id)
+
+    booking, missing_info_result = booking_request(state)
+    if booking is None:
+        return missing_info_result
+
+    if booking["rescheduling"]:
+        result = await areschedule_slot_tool(
+            old_appointment_id=booking["old_appointment_id"],
+            new_slot_id=booking["slot_id"],
+            seeker_id=booking["seeker_id"],
+            status="booked",
+            notes="Rescheduled via booking agent"
+        )
+        if isinstance(result, dict) and result["outcome"] == OLD_APPOINTMENT_INACTIVE:
+            return reschedule_failed_result(state, booking)
+        appointment = result["appointment"] if isinstance(result, dict) else result
+    else:
+        appointment = await abook_slot_tool(
+            seeker_id=booking["seeker_id"],
+            slot_id=booking["slot_id"],
+            status="booked",
+            notes="Auto-booked via booking agent"
+        )
 
-        confirmation_message = (
-        f"  Your appointment has been Cancelled!\n"
-        f"- Appointment ID: {old_appointment_id}\n"
-                    )
-        return {
-            **state,
-            "confirmation": confirmation_message,
-            "conversation_stage": ConversationStage.CANCELLEATION_COMPLETE,
-        }    
-    
+    return booking_result(state, booking, appointment)
+
+
+def cancellation_result(state: AppointmentState, old_appointment_id) -> AppointmentState:
+    confirmation_message = (
+    f"  Your appointment has been Cancelled!\n"
+    f"- Appointment ID: {old_appointment_id}\n"
+                )
+    return {
+        **state,
+        "confirmation": confirmation_message,
+        "conversation_stage": ConversationStage.CANCELLEATION_COMPLETE,
+    }
+
+
+def reschedule_failed_result(state: AppointmentState, booking: Dict) -> AppointmentState:
+    """The appointment being moved was cancelled meanwhile: nothing changed, the new slot is still free"""
+    current_span().set_attributes({"outcome": "old_appointment_inactive", "appointment_id": booking["old_appointment_id"]})
+    return {
+        **state,
+        "rescheduling_flag": False,
+        "conversation_stage": ConversationStage.RESCHEDULE_FAILED
+    }
+
+
+def booking_request(state: AppointmentState):
+    """
+    What to book, from the state: ({"seeker_id", "provider_id", "slot_id", "rescheduling",
+    "old_appointment_id"}, None), or (None, state update) when slot or contact is missing.
+    """
     selected_slot = state.get("selected_slot", {})
     seeker_contact = state.get("seeker_contact", {})
 
     if not selected_slot or not seeker_contact:
-        return {
+        return None, {
             **state,
             "error": "Missing information for booking",
             "conversation_stage": ConversationStage.BOOKING_COMPLETE
         }
 
-    seeker_id = state.get("user_id", 5)
-    provider_id = selected_slot.get("provider_id")
-    slot_id = selected_slot.get("slot_id")
-    date = selected_slot.get("date")          # e.g. "2025-08-30"
-    start_time = selected_slot.get("start_time")  # e.g. "09:00:00"
-
-    # Combine into proper timestamp
-    scheduled_time = datetime.strptime(f"{date} {start_time}", "%Y-%m-%d %H:%M:%S")
-
-    # Book appointment
-    appointment = book_slot_tool(
-        seeker_id=seeker_id,
-        provider_id=provider_id,
-        slot_id=slot_id,
-        scheduled_time=scheduled_time,
-        status="booked",
-        notes="Auto-booked via booking agent"
-    )
+    rescheduling = state.get('rescheduling_flag', False)
+    return {
+        "seeker_id": state.get("user_id", 5),
+        "provider_id": selected_slot.get("provider_id"),
+        "slot_id": selected_slot.get("slot_id"),
+        "rescheduling": rescheduling,
+        "old_appointment_id": state['old_appointment'] if rescheduling else None,  # get the old appointment id from old_appointment
+    }, None
+
+
+def booking_result(state: AppointmentState, booking: Dict, appointment) -> AppointmentState:
+    """State update once the booking/rescheduling transaction has run"""
+    selected_slot = state.get("selected_slot", {})
+    provider_id = booking["provider_id"]
+    slot_id = booking["slot_id"]
+    rescheduling = booking["rescheduling"]
 
-    print(appointment)
-    
     if isinstance(appointment, str) and appointment.startswith("error"):
-        print(f"booking node :: appointment:: {appointment}")
+        current_span().set_attribute("outcome", "error").add_event("booking_error", error=appointment)
         return {
             **state,
             "error": appointment,
             "conversation_stage": ConversationStage.BOOKING_COMPLETE
         }
 
-    # Update slot availability
-    slot_update = update_slot_availability_tool(slot_id=slot_id, status="booked")
-
-    if isinstance(slot_update, str) and slot_update.startswith("error"):
-        print(f"booking node :: slot update:: {slot_update}")
+    if appointment is None:
+        # Someone else booked the slot first -- drop it and let the seeker choose again
+        current_span().set_attributes({"outcome": "slot_taken", "slot_id": slot_id})
         return {
             **state,
-            "error": slot_update,
-            "conversation_stage": ConversationStage.BOOKING_COMPLETE
+            "available_slots": [slot for slot in state.get("available_slots", []) if slot.get("slot_id") != slot_id],
+            "selected_slot": None,
+            "conversation_stage": ConversationStage.SLOT_TAKEN
         }
 
+    scheduled_time = appointment.scheduled_time
+
     #Create confirmation message
     confirmation_message = (
         f"  Your appointment has been booked!\n"
@@ -231,23 +350,7 @@ def booking_node(state: AppointmentState) -> AppointmentState:
         f"- Appointment ID: {getattr(appointment, 'id', 'N/A')}"
     )
 
-    if state.get('rescheduling_flag', False):
-
-        # Cancel the old slot now
-        old_appointment_id = state['old_appointment']  # get the old appointment id from old_appointment
-        old_slot_id = state['old_selected_slot'].get("slot_id")  # get the old slot id from old_selected_slot
-
-        try:
-            cancel_slot_tool(old_appointment_id)
-        except Exception as e:
-            print(f"Error cancelling old appointment {old_appointment_id}: {e}")
-
-        # now update the old slot to available
-        try:
-            update_slot_availability_tool(old_slot_id, "available")
-        except Exception as e:
-            print(f"Error updating old slot {old_slot_id} to available: {e}")
-
+    if rescheduling:
         confirmation_message = (
         f"  Your appointment has been Rescheduled!\n"
         f"- Provider ID: {provider_id}\n"
@@ -264,12 +367,13 @@ def booking_node(state: AppointmentState) -> AppointmentState:
 
         ## If online
 
-    print(f"booking node :: confirmation message :: {confirmation_message}")
+    current_span().set_attributes({"outcome": "rescheduled" if rescheduling else "booked", "appointment_id": appointment.id})
     return {
         **state,
         "appointment": appointment.id,
         "confirmation": confirmation_message,
         "conversation_stage": ConversationStage.BOOKING_COMPLETE,
+        "rescheduling_flag": False,
     }
 
    
@@ -1,4 +1,5 @@
 from engine.state import AppointmentState, ConversationStage
+from engine.nodes.service_matcher_node import DIRECT_SLOT_FETCH, build_slot_query
 
 ####-----------------------------------------------------------------------
 #                       ROUTER
@@ -19,6 +20,9 @@ def conversation_router(state: AppointmentState) -> str:
     
     # If we have all info, move to next stage
     if stage == ConversationStage.PROCEED_TO_FETCH_SLOTS:
+        # fully determined query -> hit the DAO directly, otherwise let the LLM agent interpret it
+        if DIRECT_SLOT_FETCH and build_slot_query(state.get("service_info", {}), state.get("time_preferences", {})):
+            return "fetch_slots"
         return "match_services"
     
     if stage == ConversationStage.SLOTS_FETCHED:
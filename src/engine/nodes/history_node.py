@@ -0,0 +1,56 @@
+from engine.state import AppointmentState
+from engine.llm import get_llm
+from telemetry import current_span, error_event
+from engine.history import HISTORY_SUMMARY_MAX_TOKENS, split_point, summary_prompt, fallback_summary, clip_to_budget
+
+
+##--------------------------------------------------------------------
+#                   HISTORY MANAGER
+##--------------------------------------------------------------------
+# Runs at the end of every turn: older turns leave messages_history and are
+# folded into conversation_summary, so prompts and checkpoints stop growing with the session.
+
+def history_update(messages, summary):
+    return {
+        "messages_history": messages,
+        "conversation_summary": clip_to_budget(summary, HISTORY_SUMMARY_MAX_TOKENS),
+    }
+
+
+def history_manager_node(state: AppointmentState):
+    messages = state.get("messages_history", [])
+    cut = split_point(messages)
+    if cut is None:
+        return {}
+
+    older, kept = messages[:cut], messages[cut:]
+    previous_summary = state.get("conversation_summary")
+    try:
+        llm = get_llm("gemini-2.5-flash", temperature=0)
+        summary = llm.invoke(summary_prompt(previous_summary, older)).content.strip()
+    except Exception as e:
+        error_event("history_summary_error", e)
+        summary = fallback_summary(previous_summary, older)
+
+    current_span().set_attributes({"folded_messages": len(older), "kept_messages": len(kept)})
+    return history_update(kept, summary)
+
+
+async def ahistory_manager_node(state: AppointmentState):
+    """Async history_manager_node"""
+    messages = state.get("messages_history", [])
+    cut = split_point(messages)
+    if cut is None:
+        return {}
+
+    older, kept = messages[:cut], messages[cut:]
+    previous_summary = state.get("conversation_summary")
+    try:
+        llm = get_llm("gemini-2.5-flash", temperature=0)
+        summary = (await llm.ainvoke(summary_prompt(previous_summary, older))).content.strip()
+    except Exception as e:
+        error_event("history_summary_error", e)
+        summary = fallback_summary(previous_summary, older)
+
+    current_span().set_attributes({"folded_messages": len(older), "kept_messages": len(kept)})
+    return history_update(kept, summary)
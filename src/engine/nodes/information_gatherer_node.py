@@ -1,170 +1,101 @@
 from engine.state import AppointmentState, ConversationStage
-from langchain_google_genai import ChatGoogleGenerativeAI
+from engine.llm import get_llm, USER_FACING, streams_tokens, message_text
+from engine.history import dialogue
+from engine.slot_table import render_slot_table, render_slot
+from engine.llm_cache import llm_cache
+from engine.prefetch import session_id, start_prefetch, astart_prefetch
+from engine.nodes.service_matcher_node import prefetch_query, fetch_slots, afetch_slots
+from langchain_core.runnables import RunnableConfig
+from langchain_core.utils.json import parse_partial_json
+from langgraph.config import get_stream_writer
+from telemetry import current_span, error_event
+from engine.fast_extractor import expects_name, extract_locally, is_trivial, parse_slot_id, record_turn, record_slot_id
 import os
 from dotenv import load_dotenv, find_dotenv
 import json
 from datetime import datetime
 from langchain_core.prompts import ChatPromptTemplate
-from typing import List, Dict
-from dao import DAOFactory
+from typing import List, Dict, Optional, Literal
+from pydantic import BaseModel, Field
+from dao import DAOFactory, AsyncDAOFactory
 
 _ = load_dotenv(find_dotenv())
 
+# "combined": one structured LLM call extracts the fields AND writes the next reply.
+# "two_call": extraction call, then a separate reply call (also the fallback for "combined").
+GATHERER_MODE = os.getenv("GATHERER_MODE", "combined")
+
+# Rule-based extraction (emails, phones, dates, times, slot ids) ahead of the LLM; "0" disables it.
+FAST_PATH_EXTRACTION = os.getenv("FAST_PATH_EXTRACTION", "1") != "0"
+
+GATHERING_STAGES = [ConversationStage.INITIAL_REQUEST, ConversationStage.CONFIRMING_DETAILS, ConversationStage.GATHERING_CONTACT_INFO,
+                    ConversationStage.GATHERING_SERVICE_INFO, ConversationStage.GATHERING_TIME_PREFERENCES]
+
 
 
 ##--------------------------------------------------------------------
 #                   NODE
 ##--------------------------------------------------------------------
-def information_gatherer_node(state: AppointmentState) -> AppointmentState:
+def information_gatherer_node(state: AppointmentState, config: RunnableConfig = None) -> AppointmentState:
     """
     Main node that handles conversation flow and information collection ((Communication agent)
     """
-    # print(state)
-    print("\n\nCommunication agent : ")
-    print(state["conversation_stage"])
+    current_span().set_attribute("conversation_stage", state["conversation_stage"].value)
 
 ### --------------------------------------   for information gather, communication with seeker ---------------------------------------
     
-    if state['conversation_stage'] in [ConversationStage.INITIAL_REQUEST, ConversationStage.CONFIRMING_DETAILS, ConversationStage.GATHERING_CONTACT_INFO,\
-                                       ConversationStage.GATHERING_SERVICE_INFO, ConversationStage.GATHERING_TIME_PREFERENCES]:
+    if state['conversation_stage'] in GATHERING_STAGES:
         # Initialize Gemini model
-        llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash",
-                                temperature=0,
-                                max_tokens=None,
-                                timeout=None,
-                                max_retries=2)
+        llm = get_llm("gemini-2.5-flash", temperature=0)
         
         # Check what information we still need
         missing_info = identify_missing_information(state)
-        print("Missing Info: ", missing_info)
-        # if not missing_info:
-        #     # All required info collected, move to next stage
-        #     return {
-        #         **state,
-        #         "conversation_stage": ConversationStage.PROCEED_TO_FETCH_SLOTS,
-        #         "missing_info": []
-        #     }
-        
+        current_span().set_attribute("missing_info", missing_info)
+
+        # Rule-based pass first: if it resolves something and nothing but filler is left,
+        # the LLM extraction is skipped for this turn
+        service_names = None
+        if FAST_PATH_EXTRACTION and needs_catalogue(state, missing_info):
+            try:
+                service_names = DAOFactory().get_service_dao().get_all_service_names()
+            except Exception as e:
+                error_event("service_fetch_error", e)
+        local_info, locally_resolved, needs_llm = fast_path_extraction(state, missing_info, service_names)
+
         # Extract any new information from the latest message
-        extracted_info = extract_information_from_message(state["seeker_request"], llm, state['conversation_stage'])
+        # (combined mode also returns the assistant's next reply in the same call)
+        turn = None
+        extracted_info = {}
+        if needs_llm:
+            if GATHERER_MODE == "combined":
+                turn = extract_information_and_reply(state, state['conversation_stage'], local_info, config)
+
+            if turn is not None:
+                extracted_info = turn["extracted_info"]
+            else:
+                extracted_info = extract_information_from_message(state["seeker_request"], llm, state['conversation_stage'])
 
-        print("Extracted Info: ", extracted_info)
-        
-        # Update state with newly extracted info
-        updated_state = update_state_with_extracted_info(state, extracted_info)
-        
-        # Re-check missing info after extraction
-        remaining_missing = identify_missing_information(updated_state)
-        print("Remaining State: ", remaining_missing)
-        
+        updated_state, remaining_missing = merge_extracted_info(state, extracted_info, local_info, locally_resolved, needs_llm)
+
+        # service and date already settled while name/contact are still missing: start the slot query now
+        if remaining_missing:
+            start_prefetch(session_id(config), prefetch_query(updated_state), fetch_slots)
+
+        available_services = None
         if not remaining_missing:
             available_services = DAOFactory().get_service_dao().get_all_service_names()
-            print("Available Services: ", available_services)
-            # Check if the extracted service type is valid
-            if updated_state.get("service_info", {}).get("service_type") is None or updated_state.get("service_info", {}).get("service_type") == "null" or updated_state.get("service_info", {}).get("service_type") not in available_services:
-                # No matching service found, inform user
-                llm = ChatGoogleGenerativeAI(
-                    model="gemini-2.5-flash",
-                    temperature=0.3,
-                    max_retries=2
-                )   
-                prompt = f"""
-                You are a friendly appointment booking assistant.  
-                The user requested a service type that we do not offer: {updated_state.get('service_info', {}).get('service_type')}.  
-                Our available services are: {', '.join(available_services)}.  
-                Inform the user politely that we do not offer the requested service and ask them to specify a different one.
-                Keep the tone polite and conversational.
-                """
-
-                response = llm.invoke(prompt)
-                follow_up_message = response.content.strip()        
-                
-                new_messages_history = updated_state.get("messages_history", []).copy()
-                new_chat_history =  updated_state.get("chat_history", []).copy()       
-                new_messages_history.extend([
-                    {"role": "user", "content": state["seeker_request"]},
-                    {"role": "assistant", "content": follow_up_message}
-                ])
-                new_chat_history.extend([
-                    {"role": "user", "content": state["seeker_request"],"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")},
-                    {"role": "assistant", "content": follow_up_message, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-                ])
+        step = next_gathering_step(updated_state, remaining_missing, available_services)
 
-                return {
-                    **updated_state,
-                    "messages_history": new_messages_history,
-                    "chat_history": new_chat_history,
-                    "conversation_stage": ConversationStage.GATHERING_SERVICE_INFO,
-                    "missing_info": []
-                }
-            # All info now complete --> proceed to fetch slots
-
-            llm = ChatGoogleGenerativeAI(
-                model="gemini-2.0-flash",   
-                temperature=0.3,
-                max_retries=2
-            )       
-            prompt = f"""
-            You are a friendly appointment booking assistant.  
-            The user has provided all necessary information for booking an appointment:
-            - Service type: {updated_state.get('service_info', {}).get('service_type')}
-            - Preferred date: {updated_state.get('time_preferences', {}).get('preferred_date')}  
-
-                        Confirm with the user that you will now check for available slots based on their preferences.
-            Keep the tone polite and conversational. 
-            Here is the chat history for context:
-            { ' | '.join([msg["content"] for msg in state.get("chat_history", [])]) }
-            """
-
-            follow_up_message = llm.invoke(prompt).content.strip()  
-
-            new_messages_history = updated_state.get("messages_history", []).copy()
-            new_chat_history =  updated_state.get("chat_history", []).copy()    
-            new_messages_history.extend([
-                {"role": "user", "content": state["seeker_request"]},
-                {"role": "assistant", "content": follow_up_message}
-            ])
-            new_chat_history.extend([
-                {"role": "user", "content": state["seeker_request"],"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")},
-                {"role": "assistant", "content": follow_up_message, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-            ])
-            return {
-                **updated_state,
-                "messages_history": new_messages_history,
-                "chat_history": new_chat_history,
-                "conversation_stage": ConversationStage.PROCEED_TO_FETCH_SLOTS,
-                "missing_info": []
-            }
-        
-        # Generate appropriate follow-up question
-        follow_up_message = generate_follow_up_question(updated_state, remaining_missing, llm)
-        
-        # Update conversation history
-        new_messages_history = updated_state.get("messages_history", []).copy()
-        new_chat_history =  state.get("chat_history", []).copy()
-        new_messages_history.extend([
-            {"role": "user", "content": state["seeker_request"]},
-            {"role": "assistant", "content": follow_up_message}
-        ])
+        # Reply: the combined call's, if written for this step, otherwise a dedicated LLM call
+        follow_up_message = combined_reply(turn, step)
+        if follow_up_message is None:
+            if step.startswith("ask_"):
+                follow_up_message = generate_follow_up_question(updated_state, remaining_missing, llm)
+            else:
+                llm, prompt = gathering_reply_prompt(step, state, updated_state, available_services)
+                follow_up_message = llm.invoke(prompt, config=USER_FACING).content.strip()
 
-        new_chat_history.extend([
-            {"role": "user", "content": state["seeker_request"], "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")},
-            {"role": "assistant", "content": follow_up_message, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-        ])
-        
-        if remaining_missing[0] == "seeker_contact":
-            next_stage = ConversationStage.GATHERING_CONTACT_INFO
-        elif remaining_missing[0] == "service_type":
-            next_stage = ConversationStage.GATHERING_SERVICE_INFO
-        else:
-            next_stage = ConversationStage.GATHERING_TIME_PREFERENCES
-        return {
-            **updated_state,
-            "messages_history": new_messages_history,
-            "chat_history": new_chat_history,
-            "missing_info": remaining_missing,
-            "conversation_stage": next_stage
-        }
+        return gathering_result(state, updated_state, remaining_missing, step, follow_up_message, locally_resolved)
 
 
     ##-----------------------------------------     reply on fetched slots   ----------------------------------------
@@ -172,47 +103,35 @@ def information_gatherer_node(state: AppointmentState) -> AppointmentState:
     elif state['conversation_stage'] in [ConversationStage.SLOTS_FETCHED, ConversationStage.CONFIRMING_SLOTS]:
         if state['conversation_stage'] == ConversationStage.SLOTS_FETCHED:
             new_messages_history = state.get("messages_history", []).copy()
-            new_chat_history =  state.get("chat_history", []).copy()       
             new_messages_history.extend([
-                {"role": "assistant", "content": f"Here are the available slots as per your request : {state['available_slots']}. Please chose one." }
-            ])
-            new_chat_history.extend([
-                {"role": "assistant", "content": f"Here are the available slots as per your request : {state['available_slots']}. Please chose one." , "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+                {"role": "assistant", "content": f"Here are the available slots as per your request :\n{render_slot_table(state['available_slots'])}\nPlease chose one (reply with the slot number)." }
             ])
 
             return {
                 **state,
                 "messages_history": new_messages_history,
-                "chat_history": new_chat_history,
                 "conversation_stage": ConversationStage.CONFIRMING_SLOTS
             }
         else:
             ## Make communication with seeker for confirming from the provided slots , 
 
                     ## add llm prmpt  for loop conversation on confirming the available slot
-            try:        
-                selected_slot_id = int(state['seeker_request'])
-            except:
-                selected_slot_id = None
+            selected_slot_id = parse_slot_id(state['seeker_request'], state.get('available_slots'))
+            if selected_slot_id is not None:
+                record_slot_id()
 
             ##
             if selected_slot_id == None:
                 # put followup message for confirming slot
                 new_messages_history = state.get("messages_history", []).copy()
-                new_chat_history =  state.get("chat_history", []).copy()       
                 new_messages_history.extend([
                     {"role": "user", "content": state["seeker_request"]},
                     {"role": "assistant", "content": f"Could not confirm slot from your input , please choose correct slot..." }
                 ])
-                new_chat_history.extend([
-                    {"role": "user", "content": state["seeker_request"],"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")},
-                    {"role": "assistant", "content": f"Could not confirm slot from your input , please choose correct slot...", "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S") }
-                ])
 
                 return {
                     **state,
                     "messages_history": new_messages_history,
-                    "chat_history": new_chat_history 
                 }
 
             else:
@@ -223,121 +142,98 @@ def information_gatherer_node(state: AppointmentState) -> AppointmentState:
                         state['selected_slot'] = slot
 
                 new_messages_history = state.get("messages_history", []).copy()
-                new_chat_history =  state.get("chat_history", []).copy()       
                 new_messages_history.extend([
                     {"role": "user", "content": state["seeker_request"]},
-                    {"role": "assistant", "content": f"booking your slot : {state.get('selected_slot','selected_slot_not_found')}." }
-                ])
-                new_chat_history.extend([
-                    {"role": "user", "content": state["seeker_request"],"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")},
-                    {"role": "assistant", "content": f"booking your slot : {state.get('selected_slot','selected_slot_not_found')}.", "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S") }
+                    {"role": "assistant", "content": f"booking your slot : {render_slot(state.get('selected_slot'))}." }
                 ])
 
                 return {
                     **state,
                     "messages_history": new_messages_history,
-                    "chat_history": new_chat_history,
                     "conversation_stage": ConversationStage.PROCEED_TO_BOOKING  ### from here the flow will go to booking/scheduler agent 
                 }
-    ##---------------------------------------- If No SLOTS FOUND, reply accordingly   ---------------------------------------------------
-    elif state['conversation_stage'] == ConversationStage.NO_SLOT_AVAILABLE:
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            temperature=0.3,
-            max_tokens=None,
-            timeout=None,
-            max_retries=2
-        )
-
-        # Prepare context
-        preferred_date_time = state.get("time_preferences", {})
-        chat_summary = " | ".join([msg["content"] for msg in state.get("chat_history", [])[-3:]])  # last 3 exchanges
-
-        # Direct f-string prompt
-        prompt = f"""
-        You are a friendly appointment booking assistant.  
-        The user requested a slot for following time preference :  {preferred_date_time}.  
-        Unfortunately, no slots were available.  
-
-        Recent conversation context: {chat_summary}
+    ##---------------------------------------- Selected slot got booked by someone else meanwhile  ---------------------------------------
+    elif state['conversation_stage'] == ConversationStage.SLOT_TAKEN:
+        remaining_slots = state.get("available_slots", [])
+        if remaining_slots:
+            follow_up_message = f"Sorry, that slot was just booked by someone else. Here are the remaining slots :\n{render_slot_table(remaining_slots)}\nPlease chose another one."
+            next_stage = ConversationStage.CONFIRMING_SLOTS
+        else:
+            follow_up_message = "Sorry, that slot was just booked by someone else and no other slots are left for your preference. Could you suggest another date or time?"
+            next_stage = ConversationStage.GATHERING_TIME_PREFERENCES
 
-        Generate a short, natural reply telling the user no slots are available, 
-        and ask them to suggest an alternative timing (different date or time range).
-        Keep the tone polite and conversational.
-        """
+        new_messages_history = state.get("messages_history", []).copy()
+        new_messages_history.append({"role": "assistant", "content": follow_up_message})
 
-        response = llm.invoke(prompt)
-        follow_up_message = response.content.strip()
+        return {
+            **state,
+            "messages_history": new_messages_history,
+            "conversation_stage": next_stage
+        }
 
+    ##---------------------------------------- Appointment to reschedule was cancelled meanwhile  -----------------------------------------
+    elif state['conversation_stage'] == ConversationStage.RESCHEDULE_FAILED:
+        follow_up_message = (
+            f"Sorry, appointment {state.get('old_appointment')} is no longer active (it was cancelled), so it could not be rescheduled. "
+            f"Nothing was changed. Here are the slots again :\n{render_slot_table(state.get('available_slots', []))}\n"
+            f"Please choose one to book it as a new appointment."
+        )
         new_messages_history = state.get("messages_history", []).copy()
-        new_chat_history = state.get("chat_history", []).copy()
         new_messages_history.append({"role": "assistant", "content": follow_up_message})
-        new_chat_history.append({
-            "role": "assistant",
-            "content": follow_up_message,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        })
 
         return {
             **state,
             "messages_history": new_messages_history,
-            "chat_history": new_chat_history,
-            "conversation_stage": ConversationStage.GATHERING_TIME_PREFERENCES  # <-- loop back to asking
+            "old_appointment": None,
+            "conversation_stage": ConversationStage.CONFIRMING_SLOTS
         }
 
+    ##---------------------------------------- If No SLOTS FOUND, reply accordingly   ---------------------------------------------------
+    elif state['conversation_stage'] == ConversationStage.NO_SLOT_AVAILABLE:
+        llm = get_llm("gemini-2.5-flash", temperature=0.3)
+
+        response = llm.invoke(no_slot_prompt(state), config=USER_FACING)
+        follow_up_message = response.content.strip()
+
+        return no_slot_result(state, follow_up_message)
+
     ## For dealing with final booking  stages   
     elif state['conversation_stage'] == ConversationStage.BOOKING_COMPLETE:
 
         ## give the final message on slot booked by booking/scheduler agent
 
         new_messages_history = state.get("messages_history", []).copy()
-        new_chat_history =  state.get("chat_history", []).copy()       
         new_messages_history.extend([
             {"role": "assistant", "content": f"Successfully booked your slot. Booking confirmation details: {state.get('confirmation','conf_det_not _found')}" }
         ])
-        new_chat_history.extend([
-            {"role": "assistant", "content": f"Successfully booked your slot. Booking confirmation details: {state.get('confirmation','conf_det_not _found')}" , "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-        ])
 
         return {
             **state,
             "messages_history": new_messages_history,
-            "chat_history": new_chat_history
         }
     
     elif state['conversation_stage'] == ConversationStage.RESCHEDULING:
         # empty the time preference of the state and go to gathering time preference stage
         state['time_preferences'] = {}
         new_messages_history = state.get("messages_history", []).copy()
-        new_chat_history =  state.get("chat_history", []).copy()       
         new_messages_history.extend([
             {"role": "assistant", "content": f"Rescheduling your appointment. Please provide new time preferences." }
         ])
-        new_chat_history.extend([
-            {"role": "assistant", "content": f"Rescheduling your appointment. Please provide new time preferences.", "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-        ])
 
         state['old_selected_slot'] = state['selected_slot']  # put the old slot in old_selected_slot for cancelling later
         state['old_appointment'] = state['appointment']  # put the old appointment in old_appointment for cancelling later
         return {
             **state,
             "messages_history": new_messages_history,
-            "chat_history": new_chat_history,
             "conversation_stage": ConversationStage.GATHERING_TIME_PREFERENCES,
             "rescheduling_flag": True
         }
     
     elif state['conversation_stage'] == ConversationStage.CANCELLING:
         new_messages_history = state.get("messages_history", []).copy()
-        new_chat_history =  state.get("chat_history", []).copy()       
         new_messages_history.extend([
             {"role": "assistant", "content": f"Cancelling your appointment. appointment details: {state.get('appointment','appointment_not_found')}" }
         ])
-        new_chat_history.extend([
-            {"role": "assistant",
-             "content": f"Cancelling your appointment. appointment details: {state.get('appointment','appointment_not_found')}",
-             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-        ])
 
         state['old_appointment'] = state['appointment']  # put the old appointment in old_appointment for cancelling later
         state['old_selected_slot'] = state['selected_slot']  # put the old slot in old_selected_slot for cancelling later
@@ -345,37 +241,168 @@ def information_gatherer_node(state: AppointmentState) -> AppointmentState:
         return {
             **state,
             "messages_history": new_messages_history,
-            "chat_history": new_chat_history
         }
     elif state['conversation_stage'] == ConversationStage.CANCELLEATION_COMPLETE:
         new_messages_history = state.get("messages_history", []).copy()
-        new_chat_history =  state.get("chat_history", []).copy()       
         new_messages_history.extend([
             {"role": "assistant", "content": f"Successfully cancelled your appointment. appointment details: {state.get('appointment','appointment_not_found')}" }
         ])
-        new_chat_history.extend([
-            {"role": "assistant",
-             "content": f"Successfully cancelled your appointment. appointment details: {state.get('appointment','appointment_not_found')}",
-             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-        ])
 
         return {
             **state,
             "messages_history": new_messages_history,
-            "chat_history": new_chat_history
         }
     ## other scenario  I dont know !!!!!!  :) 
     else:
         return state
 
-def extract_information_from_message(message: str, llm, stage) -> Dict:
-    """Extract structured information from user message using Gemini"""
-    
-    
+##--------------------------------------------------------------------
+#     GATHERING TURN STEPS (shared by the sync and async nodes)
+##--------------------------------------------------------------------
+def needs_catalogue(state: AppointmentState, missing_info: List[str]) -> bool:
+    """The fast path matches service names in the service stage and rejects them as names"""
+    return state['conversation_stage'] == ConversationStage.GATHERING_SERVICE_INFO or expects_name(missing_info)
+
+
+def fast_path_extraction(state: AppointmentState, missing_info: List[str], service_names=None):
+    """Rule-based pass; returns (local_info, locally_resolved, needs_llm)"""
+    if not FAST_PATH_EXTRACTION:
+        return {}, [], True
+    # the service type is only extracted in its own stage
+    service_stage = state['conversation_stage'] == ConversationStage.GATHERING_SERVICE_INFO
+    local_info, locally_resolved, residual = extract_locally(
+        state["seeker_request"], missing_info, service_names if service_stage else None, not_names=service_names or ())
+    needs_llm = not locally_resolved or not is_trivial(residual)
+    current_span().set_attributes({"locally_resolved": locally_resolved, "needs_llm": needs_llm})
+    return local_info, locally_resolved, needs_llm
+
+
+def merge_extracted_info(state: AppointmentState, extracted_info: Dict, local_info: Dict, locally_resolved: List[str], needs_llm: bool):
+    """Fold this turn's extraction into the state; returns (updated_state, remaining_missing)"""
+    # locally parsed values are exact matches, so they win over the LLM's reading
+    extracted_info = {**extracted_info, **local_info}
+    if FAST_PATH_EXTRACTION:
+        record_turn(locally_resolved, needs_llm)
+
+    # field names only: the values are the user's contact details
+    current_span().set_attribute("extracted_fields", sorted(extracted_info))
+
+    # Update state with newly extracted info
+    updated_state = update_state_with_extracted_info(state, extracted_info)
+
+    # Re-check missing info after extraction
+    remaining_missing = identify_missing_information(updated_state)
+    current_span().set_attribute("remaining_missing", remaining_missing)
+    return updated_state, remaining_missing
+
+
+def next_gathering_step(updated_state: AppointmentState, remaining_missing: List[str], available_services) -> str:
+    """ask_<missing item> | unsupported_service | fetch_slots"""
+    if remaining_missing:
+        return f"ask_{remaining_missing[0]}"
+    service_type = updated_state.get("service_info", {}).get("service_type")
+    if service_type is None or service_type == "null" or service_type not in available_services:
+        return "unsupported_service"
+    return "fetch_slots"
+
+
+def gathering_reply_prompt(step: str, state: AppointmentState, updated_state: AppointmentState, available_services):
+    """(llm, prompt) for the unsupported_service / fetch_slots replies"""
+    if step == "unsupported_service":
+        # No matching service found, inform user
+        llm = get_llm("gemini-2.5-flash", temperature=0.3)
+        prompt = f"""
+        You are a friendly appointment booking assistant.  
+        The user requested a service type that we do not offer: {updated_state.get('service_info', {}).get('service_type')}.  
+        Our available services are: {', '.join(available_services)}.  
+        Inform the user politely that we do not offer the requested service and ask them to specify a different one.
+        Keep the tone polite and conversational.
+        """
+        return llm, prompt
+
+    llm = get_llm("gemini-2.0-flash", temperature=0.3)
+    prompt = f"""
+    You are a friendly appointment booking assistant.  
+    The user has provided all necessary information for booking an appointment:
+    - Service type: {updated_state.get('service_info', {}).get('service_type')}
+    - Preferred date: {updated_state.get('time_preferences', {}).get('preferred_date')}  
+
+                Confirm with the user that you will now check for available slots based on their preferences.
+    Keep the tone polite and conversational. 
+    Here is the chat history for context:
+    {state.get("conversation_summary") or ""}
+    { ' | '.join([msg["content"] for msg in dialogue(state.get("messages_history", []))]) }
+    """
+    return llm, prompt
+
 
+def gathering_result(state: AppointmentState, updated_state: AppointmentState, remaining_missing: List[str],
+                     step: str, follow_up_message: str, locally_resolved: List[str]) -> AppointmentState:
+    """State update for a gathering turn once the reply is known"""
+    new_messages_history = updated_state.get("messages_history", []).copy()
+    new_messages_history.extend([
+        {"role": "user", "content": state["seeker_request"]},
+        {"role": "assistant", "content": follow_up_message}
+    ])
+
+    if step == "unsupported_service":
+        next_stage = ConversationStage.GATHERING_SERVICE_INFO
+    elif step == "fetch_slots":
+        # All info now complete --> proceed to fetch slots
+        next_stage = ConversationStage.PROCEED_TO_FETCH_SLOTS
+    elif remaining_missing[0] == "seeker_contact":
+        next_stage = ConversationStage.GATHERING_CONTACT_INFO
+    elif remaining_missing[0] == "service_type":
+        next_stage = ConversationStage.GATHERING_SERVICE_INFO
+    else:
+        next_stage = ConversationStage.GATHERING_TIME_PREFERENCES
+
+    return {
+        **updated_state,
+        "messages_history": new_messages_history,
+        "missing_info": remaining_missing,
+        "conversation_stage": next_stage,
+        "locally_resolved": locally_resolved
+    }
+
+
+def no_slot_prompt(state: AppointmentState) -> str:
+    """Prompt for the 'no slots found, suggest another time' reply"""
+    # Prepare context
+    preferred_date_time = state.get("time_preferences", {})
+    chat_summary = " | ".join([msg["content"] for msg in dialogue(state.get("messages_history", []))[-3:]])  # last 3 exchanges
+
+    # Direct f-string prompt
+    return f"""
+    You are a friendly appointment booking assistant.  
+    The user requested a slot for following time preference :  {preferred_date_time}.  
+    Unfortunately, no slots were available.  
+
+    Earlier conversation (summary): {state.get("conversation_summary") or "none"}
+    Recent conversation context: {chat_summary}
+
+    Generate a short, natural reply telling the user no slots are available, 
+    and ask them to suggest an alternative timing (different date or time range).
+    Keep the tone polite and conversational.
+    """
+
+
+def no_slot_result(state: AppointmentState, follow_up_message: str) -> AppointmentState:
+    new_messages_history = state.get("messages_history", []).copy()
+    new_messages_history.append({"role": "assistant", "content": follow_up_message})
+
+    return {
+        **state,
+        "messages_history": new_messages_history,
+        "conversation_stage": ConversationStage.GATHERING_TIME_PREFERENCES  # <-- loop back to asking
+    }
+
+
+def extraction_prompt(stage) -> ChatPromptTemplate:
+    """Extraction prompt for the stage (the service type is only asked for in GATHERING_SERVICE_INFO)"""
     if stage == ConversationStage.GATHERING_SERVICE_INFO:
-        extraction_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert at extracting appointment booking information.
+        return ChatPromptTemplate.from_messages([
+        ("system", """You are an expert at extracting appointment booking information.
             Extract the following from the user message and return as JSON:
             
             {{
@@ -401,35 +428,8 @@ def extract_information_from_message(message: str, llm, stage) -> Dict:
             Return ONLY valid JSON, no additional text."""),
             ("user", "{message}")
         ])
-        
-        chain = extraction_prompt | llm
-        service_dao = DAOFactory().get_service_dao()
-        try:
-            service_list = service_dao.get_all_service_names()
-        except Exception as e:
-            print(f"Service fetch error: {e}")
-            service_list = []
-        try:
-            response = chain.invoke({
-                "message": message,
-                "service_list": service_list,
-                "today": datetime.now().strftime("%Y-%m-%d")
-            })
-            
-            # Clean the response and parse JSON
-            content = response.content.strip()
-            if content.startswith("```"):
-                content = content[7:-3].strip()
-            elif content.startswith("```"):
-                content = content[3:-3].strip()
-                
-            return json.loads(content)
-        except Exception as e:
-            print(f"Extraction error: {e}")
-            return {}
-    else:
-        extraction_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert at extracting appointment booking information.
+    return ChatPromptTemplate.from_messages([
+        ("system", """You are an expert at extracting appointment booking information.
             Extract the following from the user message and return as JSON:
             
             {{
@@ -446,29 +446,309 @@ def extract_information_from_message(message: str, llm, stage) -> Dict:
             If user says "this weekend", extract as null since it's not specific.
             
             Return ONLY valid JSON, no additional text."""),
-            ("user", "{message}")
-        ])
+        ("user", "{message}")
+    ])
+
 
-        chain = extraction_prompt | llm
+def parse_extraction(response) -> Dict:
+    """Clean the response and parse JSON"""
+    content = response.content.strip()
+    if content.startswith("```"):
+        content = content[7:-3].strip()
+    elif content.startswith("```"):
+        content = content[3:-3].strip()
         
+    return json.loads(content)
+
+
+def extract_information_from_message(message: str, llm, stage) -> Dict:
+    """Extract structured information from user message using Gemini"""
+    service_list = []
+    if stage == ConversationStage.GATHERING_SERVICE_INFO:
+        service_dao = DAOFactory().get_service_dao()
         try:
-            response = chain.invoke({
-                "message": message,
-                "today": datetime.now().strftime("%Y-%m-%d")
-            })
-            
-            # Clean the response and parse JSON
-            content = response.content.strip()
-            if content.startswith("```"):
-                content = content[7:-3].strip()
-            elif content.startswith("```"):
-                content = content[3:-3].strip()
-                
-            return json.loads(content)
+            service_list = service_dao.get_all_service_names()
         except Exception as e:
-            print(f"Extraction error: {e}")
-            return {}
+            error_event("service_fetch_error", e)
+            service_list = []
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    cache_prompt = extraction_cache_prompt(message, service_list)
+    found, extracted = llm_cache.get("extraction", stage, today, cache_prompt)
+    if found:
+        return extracted
+
+    chain = extraction_prompt(stage) | llm
+    try:
+        response = chain.invoke({
+            "message": message,
+            "service_list": service_list,
+            "today": today
+        })
+        extracted = parse_extraction(response)
+    except Exception as e:
+        error_event("extraction_error", e)
+        return {}
+    llm_cache.set("extraction", stage, today, cache_prompt, extracted)
+    return extracted
+
+
+def extraction_cache_prompt(message: str, service_list: List[str]) -> str:
+    """What the extraction answer depends on besides stage and date: the message and the catalogue"""
+    return f"{message}\n{sorted(service_list)}"
+
+
+class GatheringTurn(BaseModel):
+    """Structured output of the combined extraction + reply call"""
+    service_type: Optional[str] = Field(None, description="service type requested in the latest message, or null")
+    preferred_date: Optional[str] = Field(None, description="YYYY-MM-DD, or null")
+    preferred_time: Optional[str] = Field(None, description="morning/afternoon/evening/specific time, or null")
+    name: Optional[str] = Field(None, description="user's name, or null")
+    contact: Optional[str] = Field(None, description="phone or email, or null")
+    meeting_preference: Optional[str] = Field(None, description="online/in-person/no-preference, or null")
+    special_requirements: Optional[str] = Field(None, description="any specific requests, or null")
+    next_step: Literal[
+        "ask_service_type", "ask_preferred_date", "ask_seeker_name", "ask_seeker_contact",
+        "unsupported_service", "fetch_slots"
+    ] = Field(description="what the reply does, after merging the extracted fields with what is already known")
+    reply: str = Field(description="the assistant's next message to the user")
+
+
+def extract_information_and_reply(state: AppointmentState, stage, local_info=None, config=None) -> Optional[Dict]:
+    """
+    Combined mode: one structured Gemini call that extracts the booking fields from the latest
+    message and writes the assistant's next utterance.
+    Returns {"extracted_info": dict, "next_step": str, "reply": str}, or None on failure
+    (the caller then falls back to the two-call path).
+    The service catalogue is passed in every stage: next_step needs it to tell fetch_slots
+    from unsupported_service, and the last gathering turn is usually about contact details.
+    When the turn streams tokens, the answer is requested as JSON text and its `reply` is
+    streamed as it is written (see ReplyStreamer).
+    Answers without personal data are cached under "combined" (combined_cache_prompt).
+    """
+    try:
+        service_list = DAOFactory().get_service_dao().get_all_service_names()
+    except Exception as e:
+        error_event("service_fetch_error", e)
+        service_list = []
+    inputs = combined_inputs(state, service_list)
+
+    today = inputs["today"]
+    cache_prompt = combined_cache_prompt(inputs)
+    found, cached = llm_cache.get("combined", stage, today, cache_prompt)
+
+    try:
+        if found:
+            result = GatheringTurn.model_validate(cached)
+            if streams_tokens(config):
+                reply_streamer(state, stage, local_info, service_list, config).feed(result.model_dump_json())
+        elif streams_tokens(config):
+            streamer = reply_streamer(state, stage, local_info, service_list, config)
+            chain = combined_prompt(stage, json_reply=True) | get_llm("gemini-2.5-flash", temperature=0)
+            for chunk in chain.stream(inputs):
+                streamer.feed(message_text(chunk))
+            result = streamer.result()
+        else:
+            chain = combined_prompt(stage) | get_llm("gemini-2.5-flash", temperature=0, structured_output=GatheringTurn)
+            result = chain.invoke(inputs)
+    except Exception as e:
+        error_event("combined_extraction_error", e)
+        return None
+
+    if not found and result is not None and shareable_turn(state, result):
+        llm_cache.set("combined", stage, today, cache_prompt, result.model_dump())
+    return combined_turn(result, stage)
+
+
+def strip_code_fence(text: str) -> str:
+    """JSON text without a surrounding ``` / ```json fence (also while the fence is still open)"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    return text
+
+
+class ReplyStreamer:
+    """
+    Follows the combined call's JSON answer while it streams. When `reply` begins, the fields
+    before it are complete: if the next_step the model chose is the step the node will take
+    (expected_step(fields)), the reply is emitted as it grows. Otherwise nothing is emitted and
+    the node's fallback reply call, which is USER_FACING, streams instead.
+    """
+
+    def __init__(self, expected_step, emit):
+        self.expected_step = expected_step
+        self.emit = emit
+        self.text = ""
+        self.sent = 0
+        self.streaming = None       # undecided until `reply` shows up
+
+    def feed(self, text: str):
+        self.text += text
+        if self.streaming is False:
+            return
+        try:
+            partial = parse_partial_json(strip_code_fence(self.text))
+        except ValueError:
+            return
+        if not isinstance(partial, dict) or not isinstance(partial.get("reply"), str):
+            return
+        if self.streaming is None:
+            fields = {key: value for key, value in partial.items() if key != "reply"}
+            self.streaming = fields.get("next_step") == self.expected_step(fields)
+        if self.streaming and len(partial["reply"]) > self.sent:
+            self.emit(partial["reply"][self.sent:])
+            self.sent = len(partial["reply"])
 
+    def result(self) -> GatheringTurn:
+        return GatheringTurn.model_validate_json(strip_code_fence(self.text))
+
+
+def reply_streamer(state: AppointmentState, stage, local_info, service_list, config) -> ReplyStreamer:
+    """ReplyStreamer emitting token events for this node on the graph's custom stream"""
+    writer = get_stream_writer()
+    node = ((config or {}).get("metadata") or {}).get("langgraph_node")
+
+    def expected_step(fields):
+        return preview_gathering_step(state, stage, fields, local_info, service_list)
+
+    return ReplyStreamer(expected_step, lambda text: writer({"event": "token", "node": node, "content": text}))
+
+
+def preview_gathering_step(state: AppointmentState, stage, fields: Dict, local_info, service_list) -> str:
+    """next_gathering_step as if the combined call's fields were merged, without touching state"""
+    fields = {key: value for key, value in fields.items() if key != "next_step"}
+    if stage != ConversationStage.GATHERING_SERVICE_INFO:
+        fields["service_type"] = None
+    preview = {key: dict(state.get(key) or {}) for key in ("service_info", "time_preferences", "seeker_contact")}
+    preview = update_state_with_extracted_info(preview, {**fields, **(local_info or {})})
+    return next_gathering_step(preview, identify_missing_information(preview), service_list)
+
+
+# Streamed combined call: plain JSON text instead of structured output, reply last so the
+# fields that decide next_step are complete by the time the reply starts
+COMBINED_JSON_RULE = """
+
+            Return ONLY a JSON object with the keys service_type, preferred_date, preferred_time, name,
+            contact, meeting_preference, special_requirements, next_step and reply, in this order
+            (reply last), no additional text."""
+
+
+def combined_prompt(stage, json_reply=False) -> ChatPromptTemplate:
+    """
+    Prompt of the combined call; the service type is only extracted in GATHERING_SERVICE_INFO,
+    but the catalogue ({service_list}) is always there for the next_step decision.
+    json_reply asks for the JSON as text (COMBINED_JSON_RULE) for token streaming.
+    """
+    if stage == ConversationStage.GATHERING_SERVICE_INFO:
+        service_rules = """- service_type: infer from the user request which service he/she is trying to get.
+            Here is the complete list of services we provide - {service_list}
+            If there is no information for service type yet, return null.
+            If the user asks for a service we do not offer, put the value as you infer it from the request."""
+    else:
+        service_rules = """- service_type: always return null for this message."""
+
+    return ChatPromptTemplate.from_messages([
+        ("system", """You are a friendly appointment booking assistant collecting booking details.
+            Today is {today}.
+
+            Already known:
+            - Service type: {service_type}
+            - Preferred date: {preferred_date}
+            - Preferred time: {preferred_time}
+            - User name: {user_name}
+            - Contact: {contact}
+
+            1. Extract booking information from the user's latest message:
+            """ + service_rules + """
+            - preferred_date: YYYY-MM-DD. If user says "tomorrow", calculate the actual date.
+              If user says "this weekend", return null since it's not specific.
+            - preferred_time, name, contact, meeting_preference, special_requirements: as stated, or null.
+            Only return values that appear in the latest message.
+
+            2. Merge the extracted values with what is already known and choose next_step.
+            Required, in this order: service type, preferred date, user name, contact.
+            - ask_service_type / ask_preferred_date / ask_seeker_name / ask_seeker_contact:
+              the first required item that is still missing.
+            - unsupported_service: everything is known but the service type is not one we provide
+              (our services: {service_list}).
+            - fetch_slots: everything is known and the service is one we provide.
+
+            3. Write `reply`, the assistant's next message, matching next_step:
+            - ask_*: a natural, friendly follow-up question for that item, referencing what you already know.
+            - unsupported_service: politely say we do not offer the requested service, list our services
+              and ask the user to choose a different one.
+            - fetch_slots: confirm that you will now check for available slots for the service and date.
+            Keep the tone polite and conversational.""" + (COMBINED_JSON_RULE if json_reply else "")),
+        ("user", "{message}")
+    ])
+
+
+def combined_inputs(state: AppointmentState, service_list: List[str]) -> Dict:
+    return {
+        "message": state["seeker_request"],
+        "today": datetime.now().strftime("%Y-%m-%d"),
+        "service_list": service_list,
+        "service_type": state.get("service_info", {}).get("service_type", "not specified"),
+        "preferred_date": state.get("time_preferences", {}).get("preferred_date", "not specified"),
+        "preferred_time": state.get("time_preferences", {}).get("preferred_time", "not specified"),
+        "user_name": state.get("seeker_contact", {}).get("name", "not specified"),
+        "contact": state.get("seeker_contact", {}).get("contact", "not specified"),
+    }
+
+
+def combined_cache_prompt(inputs: Dict) -> str:
+    """
+    Cache key text of the combined call: combined_inputs without today (part of the key anyway)
+    and with the user's name and contact reduced to whether they are known
+    """
+    keyed = {key: value for key, value in inputs.items() if key not in ("today", "user_name", "contact")}
+    keyed["service_list"] = sorted(keyed["service_list"])
+    keyed["has_name"] = inputs["user_name"] != "not specified"
+    keyed["has_contact"] = inputs["contact"] != "not specified"
+    return json.dumps(keyed, sort_keys=True, default=str)
+
+
+def shareable_turn(state: AppointmentState, result: GatheringTurn) -> bool:
+    """
+    Whether a combined answer may be served to other users: the key holds no name or contact,
+    so answers that extract one or repeat the known ones in the reply are not cached
+    """
+    if result.name or result.contact:
+        return False
+    known = [state.get("seeker_contact", {}).get(key) for key in ("name", "contact")]
+    reply = result.reply.lower()
+    return not any(value and str(value).lower() in reply for value in known)
+
+
+def combined_turn(result: Optional[GatheringTurn], stage) -> Optional[Dict]:
+    """{"extracted_info", "next_step", "reply"} from the parsed GatheringTurn, or None"""
+    if result is None or not result.reply:
+        return None
+
+    extracted_info = result.model_dump(exclude={"next_step", "reply"})
+    if stage != ConversationStage.GATHERING_SERVICE_INFO:
+        extracted_info["service_type"] = None
+    return {
+        "extracted_info": extracted_info,
+        "next_step": result.next_step,
+        "reply": result.reply.strip()
+    }
+
+
+def combined_reply(turn: Optional[Dict], expected_step: str) -> Optional[str]:
+    """
+    The reply written by the combined call, if it was written for the step the node actually
+    decided on; None means the caller must generate the reply itself.
+    """
+    if turn is None:
+        return None
+    if turn["next_step"] != expected_step:
+        current_span().add_event("combined_reply_mismatch", chosen=turn["next_step"], expected=expected_step)
+        return None
+    return turn["reply"]
 
 
 def identify_missing_information(state: AppointmentState) -> List[str]:
@@ -523,19 +803,34 @@ def update_state_with_extracted_info(state: AppointmentState, extracted_info: Di
 
 def generate_follow_up_question(state: AppointmentState, missing_info: List[str], llm) -> str:
     """Generate contextual follow-up question based on missing information"""
+    inputs = follow_up_inputs(state, missing_info)
+    today = datetime.now().strftime("%Y-%m-%d")
+    cache_prompt = json.dumps(inputs, sort_keys=True)
+    found, question = llm_cache.get("follow_up", state.get("conversation_stage"), today, cache_prompt)
+    if found:
+        return question
+
+    chain = follow_up_prompt() | llm
     
-    question_map = {
-        "service_type": "What type of service are you looking for?",
-        "preferred_date": "What date would work best for you?",
-        "seeker_name": "Could I get your name for the appointment?",
-        "seeker_contact": "How can we reach you to confirm the appointment? (email or phone)"
-    }
-    
-    # Get the most important missing piece
-    next_question = question_map.get(missing_info[0], "Could you provide more details?")
-    
+    try:
+        response = chain.invoke(inputs, config=USER_FACING)
+    except:
+        return inputs["base_question"]
+    llm_cache.set("follow_up", state.get("conversation_stage"), today, cache_prompt, response.content)
+    return response.content
+
+
+QUESTION_MAP = {
+    "service_type": "What type of service are you looking for?",
+    "preferred_date": "What date would work best for you?",
+    "seeker_name": "Could I get your name for the appointment?",
+    "seeker_contact": "How can we reach you to confirm the appointment? (email or phone)"
+}
+
+
+def follow_up_prompt() -> ChatPromptTemplate:
     # Add context based on what we already know
-    context_prompt = ChatPromptTemplate.from_messages([
+    return ChatPromptTemplate.from_messages([
         ("system", """You are a friendly appointment booking assistant. 
         Generate a natural, conversational follow-up question.
         
@@ -550,24 +845,163 @@ def generate_follow_up_question(state: AppointmentState, missing_info: List[str]
         Make it natural and friendly, referencing what you already know."""),
         ("user", "Generate the follow-up question")
     ])
-    
-    chain = context_prompt | llm
-    
+
+
+def follow_up_inputs(state: AppointmentState, missing_info: List[str]) -> Dict:
+    # Get the most important missing piece
+    next_question = QUESTION_MAP.get(missing_info[0], "Could you provide more details?")
+    return {
+        "service_type": state.get("service_info", {}).get("service_type", "not specified"),
+        "preferred_date": state.get("time_preferences", {}).get("preferred_date", "not specified"),
+        "user_name": state.get("seeker_contact", {}).get("name", "not specified"),
+        "missing_item": missing_info[0],
+        "base_question": next_question
+    }
+
+
+##--------------------------------------------------------------------
+#                   ASYNC NODE
+##--------------------------------------------------------------------
+async_dao_factory = AsyncDAOFactory()
+
+
+async def ainformation_gatherer_node(state: AppointmentState, config: RunnableConfig = None) -> AppointmentState:
+    """
+    Async twin of information_gatherer_node for ainvoke/astream: the same turn logic, with the
+    Gemini and DAO calls awaited. Stages without I/O are delegated to the sync node.
+    """
+    current_span().set_attribute("conversation_stage", state["conversation_stage"].value)
+    if state['conversation_stage'] in GATHERING_STAGES:
+        llm = get_llm("gemini-2.5-flash", temperature=0)
+        missing_info = identify_missing_information(state)
+        current_span().set_attribute("missing_info", missing_info)
+
+        service_names = None
+        if FAST_PATH_EXTRACTION and needs_catalogue(state, missing_info):
+            service_names = await aget_service_list()
+        local_info, locally_resolved, needs_llm = fast_path_extraction(state, missing_info, service_names)
+
+        turn = None
+        extracted_info = {}
+        if needs_llm:
+            if GATHERER_MODE == "combined":
+                turn = await aextract_information_and_reply(state, state['conversation_stage'], local_info, config)
+
+            if turn is not None:
+                extracted_info = turn["extracted_info"]
+            else:
+                extracted_info = await aextract_information_from_message(state["seeker_request"], llm, state['conversation_stage'])
+
+        updated_state, remaining_missing = merge_extracted_info(state, extracted_info, local_info, locally_resolved, needs_llm)
+
+        if remaining_missing:
+            astart_prefetch(session_id(config), prefetch_query(updated_state), afetch_slots)
+
+        available_services = None
+        if not remaining_missing:
+            available_services = await async_dao_factory.get_service_dao().get_all_service_names()
+        step = next_gathering_step(updated_state, remaining_missing, available_services)
+
+        follow_up_message = combined_reply(turn, step)
+        if follow_up_message is None:
+            if step.startswith("ask_"):
+                follow_up_message = await agenerate_follow_up_question(updated_state, remaining_missing, llm)
+            else:
+                llm, prompt = gathering_reply_prompt(step, state, updated_state, available_services)
+                follow_up_message = (await llm.ainvoke(prompt, config=USER_FACING)).content.strip()
+
+        return gathering_result(state, updated_state, remaining_missing, step, follow_up_message, locally_resolved)
+
+    if state['conversation_stage'] == ConversationStage.NO_SLOT_AVAILABLE:
+        llm = get_llm("gemini-2.5-flash", temperature=0.3)
+        response = await llm.ainvoke(no_slot_prompt(state), config=USER_FACING)
+        return no_slot_result(state, response.content.strip())
+
+    # remaining stages only reshape the state
+    return information_gatherer_node(state)
+
+
+async def aget_service_list() -> List[str]:
     try:
-        response = chain.invoke({
-            "service_type": state.get("service_info", {}).get("service_type", "not specified"),
-            "preferred_date": state.get("time_preferences", {}).get("preferred_date", "not specified"),
-            "user_name": state.get("seeker_contact", {}).get("name", "not specified"),
-            "missing_item": missing_info[0],
-            "base_question": next_question
+        return await async_dao_factory.get_service_dao().get_all_service_names()
+    except Exception as e:
+        error_event("service_fetch_error", e)
+        return []
+
+
+async def aextract_information_from_message(message: str, llm, stage) -> Dict:
+    """Async extract_information_from_message"""
+    service_list = []
+    if stage == ConversationStage.GATHERING_SERVICE_INFO:
+        service_list = await aget_service_list()
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    cache_prompt = extraction_cache_prompt(message, service_list)
+    found, extracted = llm_cache.get("extraction", stage, today, cache_prompt)
+    if found:
+        return extracted
+
+    chain = extraction_prompt(stage) | llm
+    try:
+        response = await chain.ainvoke({
+            "message": message,
+            "service_list": service_list,
+            "today": today
         })
-        return response.content
-    except:
-        return next_question
+        extracted = parse_extraction(response)
+    except Exception as e:
+        error_event("extraction_error", e)
+        return {}
+    llm_cache.set("extraction", stage, today, cache_prompt, extracted)
+    return extracted
+
 
+async def aextract_information_and_reply(state: AppointmentState, stage, local_info=None, config=None) -> Optional[Dict]:
+    """Async extract_information_and_reply"""
+    service_list = await aget_service_list()
+    inputs = combined_inputs(state, service_list)
 
+    today = inputs["today"]
+    cache_prompt = combined_cache_prompt(inputs)
+    found, cached = llm_cache.get("combined", stage, today, cache_prompt)
 
+    try:
+        if found:
+            result = GatheringTurn.model_validate(cached)
+            if streams_tokens(config):
+                reply_streamer(state, stage, local_info, service_list, config).feed(result.model_dump_json())
+        elif streams_tokens(config):
+            streamer = reply_streamer(state, stage, local_info, service_list, config)
+            chain = combined_prompt(stage, json_reply=True) | get_llm("gemini-2.5-flash", temperature=0)
+            async for chunk in chain.astream(inputs):
+                streamer.feed(message_text(chunk))
+            result = streamer.result()
+        else:
+            chain = combined_prompt(stage) | get_llm("gemini-2.5-flash", temperature=0, structured_output=GatheringTurn)
+            result = await chain.ainvoke(inputs)
+    except Exception as e:
+        error_event("combined_extraction_error", e)
+        return None
 
+    if not found and result is not None and shareable_turn(state, result):
+        llm_cache.set("combined", stage, today, cache_prompt, result.model_dump())
+    return combined_turn(result, stage)
 
 
+async def agenerate_follow_up_question(state: AppointmentState, missing_info: List[str], llm) -> str:
+    """Async generate_follow_up_question"""
+    inputs = follow_up_inputs(state, missing_info)
+    today = datetime.now().strftime("%Y-%m-%d")
+    cache_prompt = json.dumps(inputs, sort_keys=True)
+    found, question = llm_cache.get("follow_up", state.get("conversation_stage"), today, cache_prompt)
+    if found:
+        return question
 
+    chain = follow_up_prompt() | llm
+
+    try:
+        response = await chain.ainvoke(inputs, config=USER_FACING)
+    except:
+        return inputs["base_question"]
+    llm_cache.set("follow_up", state.get("conversation_stage"), today, cache_prompt, response.content)
+    return response.content
@@ -1,5 +1,5 @@
 from engine.state import AppointmentState, ConversationStage
-from langchain_google_genai import ChatGoogleGenerativeAI
+from engine.llm import get_llm
 import os
 from langchain_core.prompts import ChatPromptTemplate
 from typing import List, Dict
@@ -10,19 +10,121 @@ from langgraph.prebuilt import ToolNode
 from typing import Annotated
 from langchain_core.tools import InjectedToolCallId
 from langgraph.types import Command
-from dao import DAOFactory
+from dao import DAOFactory, AsyncDAOFactory
 from dao import Appointment
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
-from langchain_core.tools import tool
+from langchain_core.tools import tool, StructuredTool
+from engine.fast_extractor import parse_time
+from engine.slot_table import render_slot_table
+from engine.prefetch import session_id, take_prefetched, atake_prefetched
+from langchain_core.runnables import RunnableConfig
+from telemetry import current_span, error_event
 
 # Initialize DAO
 dao_factory = DAOFactory()
+async_dao_factory = AsyncDAOFactory()
 
 
 
+# Direct slot fetch: when service and date are known and the time preference maps to a
+# fixed window, query the DAO straight away instead of asking Gemini to emit the tool call.
+# "0" always goes through the LLM agent.
+DIRECT_SLOT_FETCH = os.getenv("DIRECT_SLOT_FETCH", "1") != "0"
+
+# preferred_time -> (start_time, end_time) searched with the overlap query
+TIME_WINDOWS = {
+    "morning": ("08:00", "12:00"),
+    "afternoon": ("12:00", "17:00"),
+    "evening": ("17:00", "21:00"),
+}
+WHOLE_DAY = ("00:00", "23:59")
+NO_TIME_PREFERENCE = {"", "null", "none", "any", "anytime", "any time", "no preference", "no-preference", "not specified", "flexible"}
+
+
+def fetch_slots(date, start_time, end_time=None, status="available", service_name=None):
+    """
+    Run the overlapping-slots query.
+    Returns (slots, conversation_stage, message_text), shared by the tool and the direct fetch node.
+    """
+    availability_dao = dao_factory.get_availability_dao()
+
+    try:
+        availability_slots = availability_dao.get_slots_by_date_overlapping_time_range(
+            date, start_time, end_time, status, service_name
+        )
+    except Exception as e:
+        error_event("availability_error", e)
+        availability_slots = None
+
+    return slots_outcome(availability_slots)
+
+
+async def afetch_slots(date, start_time, end_time=None, status="available", service_name=None):
+    """Async fetch_slots (AsyncAvailabilityDAO)"""
+    availability_dao = async_dao_factory.get_availability_dao()
+
+    try:
+        availability_slots = await availability_dao.get_slots_by_date_overlapping_time_range(
+            date, start_time, end_time, status, service_name
+        )
+    except Exception as e:
+        error_event("availability_error", e)
+        availability_slots = None
+
+    return slots_outcome(availability_slots)
+
+
+def slots_outcome(availability_slots):
+    if availability_slots:
+        conv_stage = ConversationStage.SLOTS_FETCHED
+        # compact table for the LLM; the full records go to state["available_slots"]
+        msg_text = f"Found {len(availability_slots)} slots:\n{render_slot_table(availability_slots)}"
+    else:
+        conv_stage = ConversationStage.NO_SLOT_AVAILABLE
+        msg_text = "No available slots found."
+
+    return availability_slots, conv_stage, msg_text
+
+
+def build_slot_query(service_info, time_preferences):
+    """
+    Map service_info / time_preferences to arguments of get_slots_by_date_overlapping_time_range.
+    Returns {"date", "start_time", "end_time", "service_name"}, or None when the preferences are
+    ambiguous and the LLM agent has to interpret them.
+    """
+    service_name = (service_info or {}).get("service_type")
+    preferred_date = (time_preferences or {}).get("preferred_date")
+    preferred_time = (time_preferences or {}).get("preferred_time")
+
+    if not service_name or not preferred_date:
+        return None
+    try:
+        datetime.strptime(str(preferred_date), "%Y-%m-%d")
+    except ValueError:
+        return None
+
+    normalized = str(preferred_time or "").strip().lower()
+    if normalized in NO_TIME_PREFERENCE:
+        start_time, end_time = WHOLE_DAY
+    elif normalized in TIME_WINDOWS:
+        start_time, end_time = TIME_WINDOWS[normalized]
+    else:
+        # "15:00", "3pm", "3:30 pm" -> that hour; anything vaguer goes to the LLM
+        clock_time, _ = parse_time(normalized)
+        if clock_time is None or clock_time in TIME_WINDOWS:
+            return None
+        start_time, end_time = clock_time, None
+
+    return {
+        "date": str(preferred_date),
+        "start_time": start_time,
+        "end_time": end_time,
+        "service_name": service_name,
+    }
+
+
 ###############################   Tools for slot/service matching agent ################################### 
-@tool
-def find_available_slots_by_date_overlapping_time_range_tool(
+def find_available_slots(
     tool_call_id: Annotated[str, InjectedToolCallId],
     date: str,
     start_time: str,
@@ -44,25 +146,30 @@ def find_available_slots_by_date_overlapping_time_range_tool(
         Command: Updates state with available slots, conversation stage, and a ToolMessage.
     """
 
-    availability_dao = dao_factory.get_availability_dao()
+    availability_slots, conv_stage, msg_text = fetch_slots(date, start_time, end_time, status, service_name)
 
-    try:
-        availability_slots = availability_dao.get_slots_by_date_overlapping_time_range(
-            date, start_time, end_time, status, service_name
-        )
-    except Exception as e:
-        print("availability error:", e)
-        availability_slots = None
+    current_span().set_attribute("slots", len(availability_slots or []))
 
-    if availability_slots:
-        conv_stage = ConversationStage.SLOTS_FETCHED
-        msg_text = f"Found {len(availability_slots)} slots: {availability_slots}"
-    else:
-        conv_stage = ConversationStage.NO_SLOT_AVAILABLE
-        msg_text = "No available slots found."
+    return slots_command(availability_slots, conv_stage, msg_text, tool_call_id)
 
-    print("tool node - call - available slots:", availability_slots)
 
+async def afind_available_slots(
+    tool_call_id: Annotated[str, InjectedToolCallId],
+    date: str,
+    start_time: str,
+    end_time: str = None,
+    status: str = "available",
+    service_name: str = None,
+):
+    """Async find_available_slots, used when the tool node runs under ainvoke/astream"""
+    availability_slots, conv_stage, msg_text = await afetch_slots(date, start_time, end_time, status, service_name)
+
+    current_span().set_attribute("slots", len(availability_slots or []))
+
+    return slots_command(availability_slots, conv_stage, msg_text, tool_call_id)
+
+
+def slots_command(availability_slots, conv_stage, msg_text, tool_call_id):
     return Command(
         update={
             "available_slots": availability_slots,
@@ -77,6 +184,14 @@ def find_available_slots_by_date_overlapping_time_range_tool(
     )
 
 
+# one tool, sync and async implementations (ToolNode picks the one matching invoke/ainvoke)
+find_available_slots_by_date_overlapping_time_range_tool = StructuredTool.from_function(
+    func=find_available_slots,
+    coroutine=afind_available_slots,
+    name="find_available_slots_by_date_overlapping_time_range_tool",
+)
+
+
 # This node will handle calling your tool when Gemini requests it
 tools_node_matcher = ToolNode([find_available_slots_by_date_overlapping_time_range_tool], messages_key="messages_history")
 
@@ -95,12 +210,67 @@ def matcher_tool_result_handler(state: AppointmentState):
 ##--------------------------------------------------------------------
 
 
-def service_matcher_node(state: AppointmentState):
+def service_matcher_node(state: AppointmentState, config: RunnableConfig = None):
+
+    current_span().set_attribute("conversation_stage", state["conversation_stage"].value)
+
+    prefetched = take_prefetched(session_id(config), prefetch_query(state))
+    if prefetched is not None:
+        return prefetched_result(state, prefetched)
+
+    slots_prompt = matcher_prompt(state)
+
+    llm = get_llm("gemini-2.5-flash", temperature=0,
+                  tools=[find_available_slots_by_date_overlapping_time_range_tool])
+
+    result = llm.invoke(slots_prompt)
+    current_span().set_attribute("tool_calls", len(getattr(result, "tool_calls", None) or []))
+
+    return {
+        **state,
+        "messages_history": state.get("messages_history", []) + [result]
+    }
+
+
+async def aservice_matcher_node(state: AppointmentState, config: RunnableConfig = None):
+    """Async service_matcher_node"""
+    current_span().set_attribute("conversation_stage", state["conversation_stage"].value)
+
+    prefetched = await atake_prefetched(session_id(config), prefetch_query(state))
+    if prefetched is not None:
+        return prefetched_result(state, prefetched)
+
+    llm = get_llm("gemini-2.5-flash", temperature=0,
+                  tools=[find_available_slots_by_date_overlapping_time_range_tool])
+
+    result = await llm.ainvoke(matcher_prompt(state))
+    current_span().set_attribute("tool_calls", len(getattr(result, "tool_calls", None) or []))
+
+    return {
+        **state,
+        "messages_history": state.get("messages_history", []) + [result]
+    }
+
 
-    # print(state)
-    print("\n\n service matcher agent : ")
-    print(state["conversation_stage"])
+def prefetch_query(state: AppointmentState):
+    return build_slot_query(state.get("service_info", {}), state.get("time_preferences", {}))
 
+
+def prefetched_result(state: AppointmentState, prefetched):
+    """
+    Slots fetched in the background during gathering, for unchanged preferences: skip the
+    tool-calling round trip (no tool call in the reply, so the graph goes on to the result handler)
+    """
+    availability_slots, conv_stage, _ = prefetched
+    current_span().set_attributes({"prefetched": True, "slots": len(availability_slots or [])})
+    return {
+        **state,
+        "available_slots": availability_slots or [],
+        "conversation_stage": conv_stage
+    }
+
+
+def matcher_prompt(state: AppointmentState) -> str:
     service_info = state.get("service_info", {})
     time_preferences = state.get("time_preferences", {})
     location_preference = state.get("location_preference", "no-preference")
@@ -113,6 +283,7 @@ def service_matcher_node(state: AppointmentState):
     - Location preference: {location_preference}
 
 
+    - earlier conversation (summary) : {state.get('conversation_summary') or 'none'}
     - messages history : {state['messages_history']}
 
 
@@ -124,20 +295,57 @@ def service_matcher_node(state: AppointmentState):
     - Do **not** call the tool again in these cases.
 
     """
+    return slots_prompt
 
-    llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0).bind_tools([find_available_slots_by_date_overlapping_time_range_tool])
 
-    result = llm.invoke(slots_prompt)
+def direct_slot_fetch_node(state: AppointmentState, config: RunnableConfig = None):
+    """
+    Deterministic replacement for the match_services_agent -> tools_node_matcher -> match_services_agent
+    round trip, used when build_slot_query() can resolve the preferences on its own.
+    """
+    current_span().set_attribute("conversation_stage", state["conversation_stage"].value)
 
-    print(type(result))
-    print(result)
+    query = build_slot_query(state.get("service_info", {}), state.get("time_preferences", {}))
+    if query is None:
+        # the router only sends determined queries here; keep the old fallback behaviour
+        return {
+            **state,
+            "available_slots": [],
+            "conversation_stage": ConversationStage.NO_SLOT_AVAILABLE
+        }
+
+    # the gatherer may have started this exact query in the background already
+    availability_slots, conv_stage, _ = take_prefetched(session_id(config), query) or fetch_slots(
+        query["date"], query["start_time"], query["end_time"], "available", query["service_name"]
+    )
+    current_span().set_attributes({"slot_query": query, "slots": len(availability_slots or [])})
 
-    
     return {
         **state,
-        "messages_history": state.get("messages_history", []) + [result]
+        "available_slots": availability_slots or [],
+        "conversation_stage": conv_stage
     }
 
 
+async def adirect_slot_fetch_node(state: AppointmentState, config: RunnableConfig = None):
+    """Async direct_slot_fetch_node"""
+    current_span().set_attribute("conversation_stage", state["conversation_stage"].value)
+
+    query = build_slot_query(state.get("service_info", {}), state.get("time_preferences", {}))
+    if query is None:
+        return {
+            **state,
+            "available_slots": [],
+            "conversation_stage": ConversationStage.NO_SLOT_AVAILABLE
+        }
+
+    availability_slots, conv_stage, _ = await atake_prefetched(session_id(config), query) or await afetch_slots(
+        query["date"], query["start_time"], query["end_time"], "available", query["service_name"]
+    )
+    current_span().set_attributes({"slot_query": query, "slots": len(availability_slots or [])})
+
+    return {
+        **state,
+        "available_slots": availability_slots or [],
+        "conversation_stage": conv_stage
+    }
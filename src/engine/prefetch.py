@@ -0,0 +1,131 @@
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from telemetry import current_span
+
+
+# Speculative slot prefetch: once the gatherer knows service + date (+ time window) it starts
+# the slot query in the background while it keeps asking for name and contact. When the
+# session reaches the slot stage with the same query, the result is already there.
+#   SLOT_PREFETCH=0          disable
+#   SLOT_PREFETCH_TTL        seconds a prefetched result may be used (slots get booked meanwhile)
+#   SLOT_PREFETCH_WAIT       seconds the slot stage waits for a prefetch still in flight
+SLOT_PREFETCH = os.getenv("SLOT_PREFETCH", "1") != "0"
+SLOT_PREFETCH_TTL = float(os.getenv("SLOT_PREFETCH_TTL", 60))
+SLOT_PREFETCH_WAIT = float(os.getenv("SLOT_PREFETCH_WAIT", 5))
+SLOT_PREFETCH_WORKERS = int(os.getenv("SLOT_PREFETCH_WORKERS", 4))
+SLOT_PREFETCH_MAX_SESSIONS = int(os.getenv("SLOT_PREFETCH_MAX_SESSIONS", 1024))
+
+_executor = ThreadPoolExecutor(max_workers=SLOT_PREFETCH_WORKERS, thread_name_prefix="slot-prefetch")
+_entries = OrderedDict()    # thread_id -> (query, started_at, concurrent Future | asyncio Task)
+_lock = threading.Lock()
+_stats = {"started": 0, "hits": 0, "misses": 0, "stale": 0}
+
+
+def session_id(config):
+    """Graph thread id of the running turn (node config), or None outside a session"""
+    return ((config or {}).get("configurable") or {}).get("thread_id")
+
+
+def _count(field):
+    with _lock:
+        _stats[field] += 1
+
+
+def get_prefetch_stats():
+    with _lock:
+        return {**_stats, "sessions": len(_entries)}
+
+
+def _in_flight(thread_id, query):
+    """Caller holds _lock. True when the same query was already started and is still fresh"""
+    entry = _entries.get(thread_id)
+    return entry is not None and entry[0] == query and time.time() - entry[1] < SLOT_PREFETCH_TTL
+
+
+def _store(thread_id, query, job):
+    """Caller holds _lock"""
+    previous = _entries.pop(thread_id, None)
+    if previous is not None:
+        previous[2].cancel()
+    _entries[thread_id] = (query, time.time(), job)
+    while len(_entries) > SLOT_PREFETCH_MAX_SESSIONS:
+        _entries.popitem(last=False)[1][2].cancel()
+    _stats["started"] += 1
+
+
+def start_prefetch(thread_id, query, fetch):
+    """Run fetch(**query) on the prefetch pool for this session; False if nothing was started"""
+    if not SLOT_PREFETCH or thread_id is None or query is None:
+        return False
+    with _lock:
+        if _in_flight(thread_id, query):
+            return False
+        # run in a copy of this context, so the fetch's DAO spans belong to the current turn
+        _store(thread_id, query, _executor.submit(contextvars.copy_context().run, fetch, **query))
+    current_span().add_event("slot_prefetch_started", **query)
+    return True
+
+
+def astart_prefetch(thread_id, query, afetch):
+    """Same as start_prefetch, as a task on the running event loop"""
+    if not SLOT_PREFETCH or thread_id is None or query is None:
+        return False
+    with _lock:
+        if _in_flight(thread_id, query):
+            return False
+        _store(thread_id, query, asyncio.get_running_loop().create_task(afetch(**query)))
+    current_span().add_event("slot_prefetch_started", **query)
+    return True
+
+
+def _take(thread_id, query):
+    """Pop the session's prefetch if it was for this query and is still fresh"""
+    if not SLOT_PREFETCH or thread_id is None:
+        return None
+    with _lock:
+        entry = _entries.pop(thread_id, None)
+    if entry is None:
+        _count("misses")
+        return None
+    if entry[0] != query or time.time() - entry[1] >= SLOT_PREFETCH_TTL:
+        # preferences changed since (or too old to trust)
+        entry[2].cancel()
+        _count("stale")
+        return None
+    return entry[2]
+
+
+def take_prefetched(thread_id, query):
+    """The prefetched fetch result for this query, or None (then query the DAO as usual)"""
+    job = _take(thread_id, query)
+    if job is None or isinstance(job, asyncio.Future):
+        return None
+    try:
+        result = job.result(timeout=SLOT_PREFETCH_WAIT)
+    except Exception as e:
+        current_span().add_event("slot_prefetch_unused", error=repr(e))
+        return None
+    _count("hits")
+    return result
+
+
+async def atake_prefetched(thread_id, query):
+    """Async take_prefetched"""
+    job = _take(thread_id, query)
+    if job is None:
+        return None
+    try:
+        if not isinstance(job, asyncio.Future):
+            job = asyncio.wrap_future(job)
+        result = await asyncio.wait_for(job, SLOT_PREFETCH_WAIT)
+    except Exception as e:
+        current_span().add_event("slot_prefetch_unused", error=repr(e))
+        return None
+    _count("hits")
+    return result
@@ -0,0 +1,45 @@
+import os
+
+
+# Slots shown to the LLM / user as a short table with only what is needed to choose one
+# (id, date, time, service, provider); the full records stay in state["available_slots"].
+SLOT_TABLE_MAX_ROWS = int(os.getenv("SLOT_TABLE_MAX_ROWS", 20))
+
+SLOT_TABLE_HEADER = "slot | date | time | service | provider"
+
+
+def _hhmm(value):
+    if value is None:
+        return "?"
+    if hasattr(value, "strftime"):
+        return value.strftime("%H:%M")
+    return str(value)[:5]
+
+
+def slot_row(slot):
+    """One slot as 'id | YYYY-MM-DD | HH:MM-HH:MM | service | provider'"""
+    return " | ".join([
+        str(slot.get("slot_id")),
+        str(slot.get("date")),
+        f"{_hhmm(slot.get('start_time'))}-{_hhmm(slot.get('end_time'))}",
+        str(slot.get("service_name") or "-"),
+        str(slot.get("provider_name") or "-"),
+    ])
+
+
+def render_slot_table(slots, max_rows=SLOT_TABLE_MAX_ROWS):
+    """Header plus one row per slot; rows beyond max_rows are counted, not listed"""
+    slots = slots or []
+    lines = [SLOT_TABLE_HEADER] + [slot_row(slot) for slot in slots[:max_rows]]
+    if len(slots) > max_rows:
+        lines.append(f"... and {len(slots) - max_rows} more")
+    return "\n".join(lines)
+
+
+def render_slot(slot):
+    """A single slot inline, e.g. for 'booking your slot : ...'"""
+    if not slot:
+        return "selected_slot_not_found"
+    return (f"slot {slot.get('slot_id')} on {slot.get('date')} "
+            f"{_hhmm(slot.get('start_time'))}-{_hhmm(slot.get('end_time'))}"
+            f" ({slot.get('service_name') or 'service'} with {slot.get('provider_name') or 'provider'})")
@@ -17,6 +17,7 @@ class ConversationStage(Enum):
     NO_SERVICE_AVAILABLE = "no_service_available"
     NO_SLOT_AVAILABLE = "no_slot_available"
     CONFIRMING_SLOTS = "confirming_slots"
+    SLOT_TAKEN = "slot_taken"             # selected slot was booked by someone else meanwhile
     
     # for communication with scheduler/booking agent
     PROCEED_TO_BOOKING = "proceed_to_booking"
@@ -24,6 +25,7 @@ class ConversationStage(Enum):
 
     # for rescheduling/cancelling
     RESCHEDULING = "rescheduling"
+    RESCHEDULE_FAILED = "reschedule_failed"   # appointment being rescheduled is no longer active
     CANCELLING = "cancelling"
     CANCELLEATION_COMPLETE = "cancellation_complete"
 
@@ -36,8 +38,9 @@ class AppointmentState(TypedDict):
     # Conversation Management
     conversation_stage: ConversationStage = ConversationStage.INITIAL_REQUEST
     messages_history: List[dict]          # Full conversation context among all, user, assistance as well as tools
-    chat_history: List[dict]              # the conversation between AI and user that needs to be shown on the UI page
+                                          # (the UI transcript is stored in chat_transcripts, see TranscriptDAO)
     missing_info: List[str]               # What we still need to collect
+    conversation_summary: Optional[str]   # Older turns, summarized once they leave messages_history (engine/history.py)
     
     # Information Collection (Incremental)
     seeker_request: str                   # Latest message
@@ -48,6 +51,7 @@ class AppointmentState(TypedDict):
     
     # AI Processing
     extracted_info: dict                  # Cumulative parsed information
+    locally_resolved: List[str]           # Fields the rule-based fast path resolved this turn (no LLM needed)
     matched_providers: List[dict]         # Providers with required expertise
     available_slots: List[dict]           # Available time slots
     selected_slot: Optional[dict]         # Final booking choice SLOT
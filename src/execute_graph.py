@@ -1,8 +1,256 @@
-from engine.graph import create_appointment_graph
+import asyncio
+
+from dao import DAOFactory, AsyncDAOFactory
+from engine.graph import create_appointment_graph, create_async_appointment_graph
+from engine.checkpointer import close_async_checkpointer, close_checkpointer
+from engine.llm import USER_FACING_TAG, STREAM_TOKENS_KEY, message_text
+from engine.state import ConversationStage
+from telemetry import traced, current_span, error_event
 
 
 graph = create_appointment_graph()
 
-def execute_chat(input_dict):
-    response = graph.invoke(input_dict, config={"configurable": {"thread_id": "101"}})
-    return response
\ No newline at end of file
+dao_factory = DAOFactory()
+async_dao_factory = AsyncDAOFactory()
+
+# Built on first use from the serving event loop (see get_async_graph)
+async_graph = None
+_async_graph_lock = asyncio.Lock()
+
+# Progress shown while the graph works on a stage the user would otherwise wait on silently
+PROGRESS_MESSAGES = {
+    ConversationStage.PROCEED_TO_FETCH_SLOTS: "fetching slots…",
+    ConversationStage.PROCEED_TO_BOOKING: "booking your slot…",
+    ConversationStage.CANCELLING: "cancelling your appointment…",
+}
+
+class SessionOwnershipError(Exception):
+    """The chat session (graph thread) belongs to another user"""
+    pass
+
+
+def thread_config(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def execute_chat(input_dict, thread_id):
+    response = graph.invoke(input_dict, config=thread_config(thread_id))
+    return response
+
+
+async def get_async_graph():
+    """The async-checkpointed graph, for ainvoke/astream"""
+    global async_graph
+    async with _async_graph_lock:
+        if async_graph is None:
+            async_graph = await create_async_appointment_graph()
+    return async_graph
+
+
+async def close_async_graph():
+    """Close the async graph's checkpointer (its connection thread / pool keeps the process alive)"""
+    global async_graph
+    async with _async_graph_lock:
+        if async_graph is not None:
+            await close_async_checkpointer(async_graph.checkpointer)
+            async_graph = None
+
+
+async def close_graphs():
+    """App shutdown: release both graphs' checkpointer connections"""
+    await close_async_graph()
+    close_checkpointer()
+
+
+def check_session_owner(values, thread_id, user_id):
+    """A session started by one user cannot be continued by another"""
+    if user_id is not None and values.get("user_id") is not None and values["user_id"] != user_id:
+        raise SessionOwnershipError(thread_id)
+
+
+def chat_input(values, input_text, thread_id, user_id=None):
+    """Latest user message as graph input; a new thread starts at INITIAL_REQUEST"""
+    input_dict = {"seeker_request": input_text}
+    if not values:
+        input_dict["conversation_stage"] = ConversationStage.INITIAL_REQUEST
+    check_session_owner(values, thread_id, user_id)
+    if user_id is not None:
+        input_dict["user_id"] = user_id
+    return input_dict
+
+
+def session_owned_by(thread_id, user_id):
+    """False if the session exists and belongs to another user"""
+    try:
+        check_session_owner(graph.get_state(thread_config(thread_id)).values, thread_id, user_id)
+    except SessionOwnershipError:
+        return False
+    return True
+
+
+async def asession_owned_by(thread_id, user_id):
+    try:
+        values = (await (await get_async_graph()).aget_state(thread_config(thread_id))).values
+        check_session_owner(values, thread_id, user_id)
+    except SessionOwnershipError:
+        return False
+    return True
+
+
+def latest_reply(state):
+    replies = [m for m in state.get("messages_history", []) if isinstance(m, dict) and m.get("role") == "assistant"]
+    return replies[-1]["content"] if replies else None
+
+
+def stage_value(stage):
+    return stage.value if isinstance(stage, ConversationStage) else stage
+
+
+def turn_output(done, thread_id):
+    return {
+        "output": done["reply"],
+        "session_id": thread_id,
+        "conversation_stage": done["conversation_stage"],
+    }
+
+
+def run_chat_turn(input_text, thread_id, user_id=None):
+    """Run one chat turn on the session's own checkpoint thread (blocking)"""
+    # consumed to the end so the turn's span closes with the turn
+    done = None
+    for event in stream_chat(input_text, thread_id, user_id, tokens=False):
+        if event["event"] == "done":
+            done = event
+    return turn_output(done, thread_id)
+
+
+async def arun_chat_turn(input_text, thread_id, user_id=None):
+    """run_chat_turn on the async graph"""
+    done = None
+    async for event in astream_chat(input_text, thread_id, user_id, tokens=False):
+        if event["event"] == "done":
+            done = event
+    return turn_output(done, thread_id)
+
+
+def transcript_messages(input_text, events):
+    """What the UI shows for this turn: the user's message and every assistant message"""
+    return [{"role": "user", "content": input_text}] + [
+        {"role": "assistant", "content": event["content"]} for event in events if event["event"] == "message"
+    ]
+
+
+def record_transcript(thread_id, user_id, messages):
+    try:
+        dao_factory.get_transcript_dao().append(thread_id, user_id, messages)
+    except Exception as e:
+        error_event("transcript_write_error", e)
+
+
+async def arecord_transcript(thread_id, user_id, messages):
+    try:
+        await async_dao_factory.get_transcript_dao().append(thread_id, user_id, messages)
+    except Exception as e:
+        error_event("transcript_write_error", e)
+
+
+def stream_events(mode, payload, seen_messages):
+    """Translate one graph.stream item into chat events; returns (events, seen_messages)"""
+    events = []
+    if mode == "messages":
+        chunk, metadata = payload
+        if USER_FACING_TAG in metadata.get("tags", []):
+            text = message_text(chunk)
+            if text:
+                events.append({"event": "token", "node": metadata.get("langgraph_node"), "content": text})
+        return events, seen_messages
+    if mode == "custom":
+        # token events a node emitted itself (see engine.llm.STREAM_TOKENS_KEY)
+        if isinstance(payload, dict) and payload.get("event") == "token" and payload.get("content"):
+            events.append(payload)
+        return events, seen_messages
+
+    for node, update in payload.items():
+        if not isinstance(update, dict):
+            continue
+        messages = update.get("messages_history")
+        if isinstance(messages, list) and len(messages) > seen_messages:
+            for message in messages[seen_messages:]:
+                if isinstance(message, dict) and message.get("role") == "assistant":
+                    events.append({"event": "message", "node": node, "content": message["content"]})
+        if isinstance(messages, list):
+            seen_messages = len(messages)
+
+        stage = update.get("conversation_stage")
+        if stage in PROGRESS_MESSAGES:
+            events.append({"event": "progress", "node": node, "message": PROGRESS_MESSAGES[stage]})
+    return events, seen_messages
+
+
+def done_event(state):
+    return {
+        "event": "done",
+        "conversation_stage": stage_value(state.get("conversation_stage")),
+        "reply": latest_reply(state),
+    }
+
+
+def stream_modes(tokens):
+    return ["messages", "custom", "updates"] if tokens else ["updates"]
+
+
+def stream_config(thread_id, tokens):
+    """thread_config plus the flag telling nodes that tokens are streamed"""
+    config = thread_config(thread_id)
+    config["configurable"][STREAM_TOKENS_KEY] = tokens
+    return config
+
+
+@traced("chat.turn")
+def stream_chat(input_text, thread_id, user_id=None, tokens=True):
+    """
+    Run one chat turn and yield events as they are produced:
+      {"event": "token", "node", "content"}     - assistant tokens from user-facing LLM calls and the
+                                                 combined gatherer call's reply (if tokens)
+      {"event": "progress", "node", "message"}  - e.g. "fetching slots…"
+      {"event": "message", "node", "content"}   - each complete assistant message
+      {"event": "done", "conversation_stage", "reply"}
+    The turn is appended to the session's transcript before `done`.
+    The whole turn is one chat.turn span; node, LLM, DAO and checkpoint spans are its children.
+    """
+    current_span().set_attributes({"thread_id": thread_id, "graph": "sync"})
+    config = thread_config(thread_id)
+    values = graph.get_state(config).values
+    input_dict = chat_input(values, input_text, thread_id, user_id)
+    seen_messages = len(values.get("messages_history", []))
+    turn_events = []
+
+    for mode, payload in graph.stream(input_dict, config=stream_config(thread_id, tokens), stream_mode=stream_modes(tokens)):
+        events, seen_messages = stream_events(mode, payload, seen_messages)
+        turn_events.extend(events)
+        yield from events
+
+    record_transcript(thread_id, user_id, transcript_messages(input_text, turn_events))
+    yield done_event(graph.get_state(config).values)
+
+
+@traced("chat.turn")
+async def astream_chat(input_text, thread_id, user_id=None, tokens=True):
+    """stream_chat on the async graph (astream)"""
+    current_span().set_attributes({"thread_id": thread_id, "graph": "async"})
+    async_graph = await get_async_graph()
+    config = thread_config(thread_id)
+    values = (await async_graph.aget_state(config)).values
+    input_dict = chat_input(values, input_text, thread_id, user_id)
+    seen_messages = len(values.get("messages_history", []))
+    turn_events = []
+
+    async for mode, payload in async_graph.astream(input_dict, config=stream_config(thread_id, tokens),
+                                                   stream_mode=stream_modes(tokens)):
+        events, seen_messages = stream_events(mode, payload, seen_messages)
+        turn_events.extend(events)
+        for event in events:
+            yield event
+
+    await arecord_transcript(thread_id, user_id, transcript_messages(input_text, turn_events))
+    yield done_event((await async_graph.aget_state(config)).values)
@@ -0,0 +1,62 @@
+import os
+from logging.config import fileConfig
+
+from sqlalchemy import create_engine, pool
+from sqlalchemy.engine import URL
+
+from alembic import context
+
+from app.database import Base
+from app import models  # noqa: F401  (registers the tables on Base.metadata)
+from dao.database import DB_CONFIG
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def get_url():
+    """DATABASE_URL if set, otherwise the database the DAO layer talks to"""
+    if os.getenv("DATABASE_URL"):
+        return os.getenv("DATABASE_URL")
+    return URL.create(
+        "postgresql+psycopg2",
+        username=DB_CONFIG["user"],
+        password=DB_CONFIG["password"],
+        host=DB_CONFIG["host"],
+        port=DB_CONFIG["port"],
+        database=DB_CONFIG["database"],
+    )
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL to stdout (alembic upgrade head --sql)"""
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against a live connection"""
+    connectable = create_engine(get_url(), poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,64 @@
+"""availability slot overlap indexes
+
+Slot search (AvailabilityDAO.get_slots_by_date_overlapping_time_range) filters on
+date + status and the canonical overlap predicate `start_time < :end AND end_time > :start`.
+A (date, status, start_time) btree turns that into an index range scan; end_time is
+INCLUDEd so the second half of the predicate is checked without visiting the heap.
+The service-filtered variant joins appointment_types -> availability_slots on type_id,
+so it gets the same index with type_id leading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_availability_slots_date_status_start_time',
+            'availability_slots',
+            ['date', 'status', 'start_time'],
+            postgresql_include=['end_time'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_availability_slots_type_date_status_start_time',
+            'availability_slots',
+            ['type_id', 'date', 'status', 'start_time'],
+            postgresql_include=['end_time'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_availability_slots_type_date_status_start_time',
+            table_name='availability_slots',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_availability_slots_date_status_start_time',
+            table_name='availability_slots',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,68 @@
+"""trigram indexes for service name matching
+
+Service lookups use substring matches (`ILIKE '%name%'`) on appointment_types.name,
+services.name and providers.specialties. A leading wildcard can never use a btree,
+so these columns get pg_trgm GIN indexes, which serve ILIKE as well as the similarity
+operator used by ServiceDAO.search_services.
+services/providers are legacy tables that not every deployment has; they are only
+indexed when present.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, column)
+TRIGRAM_INDEXES = [
+    ('ix_appointment_types_name_trgm', 'appointment_types', 'name'),
+    ('ix_services_name_trgm', 'services', 'name'),
+    ('ix_providers_specialties_trgm', 'providers', 'specialties'),
+]
+
+
+def _existing_tables():
+    if op.get_context().as_sql:
+        # offline mode: cannot inspect, emit everything
+        return {table for _, table, _ in TRIGRAM_INDEXES}
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    tables = _existing_tables()
+    with op.get_context().autocommit_block():
+        for index_name, table, column in TRIGRAM_INDEXES:
+            if table not in tables:
+                continue
+            op.create_index(
+                index_name,
+                table,
+                [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, table, _ in reversed(TRIGRAM_INDEXES):
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}')
+    # the extension is left installed: other objects may depend on it
@@ -0,0 +1,46 @@
+"""NOTIFY on appointment_types changes
+
+Every process caches the appointment type catalogue (dao.service_dao.service_catalogue_cache).
+This statement-level trigger sends `NOTIFY appointment_types_changed` on any write so
+listening processes drop their copy immediately instead of waiting for the TTL.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_appointment_types_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('appointment_types_changed', TG_OP);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS appointment_types_changed ON appointment_types")
+    op.execute("""
+        CREATE TRIGGER appointment_types_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON appointment_types
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_appointment_types_changed()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS appointment_types_changed ON appointment_types")
+    op.execute("DROP FUNCTION IF EXISTS notify_appointment_types_changed()")
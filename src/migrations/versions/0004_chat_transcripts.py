@@ -0,0 +1,49 @@
+"""chat_transcripts table
+
+The UI transcript used to live in the graph state (chat_history), so every checkpoint
+carried each utterance twice. It is now an append-only table: one row per message,
+read back per session in id order (the (session_id, id) index serves both the
+newest-first page and the "before this id" keyset page).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS chat_transcripts (
+            id BIGSERIAL PRIMARY KEY,
+            session_id VARCHAR(255) NOT NULL,
+            user_id INTEGER REFERENCES users(id),
+            role VARCHAR(20) NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.create_index(
+        'ix_chat_transcripts_session_id_id',
+        'chat_transcripts',
+        ['session_id', 'id'],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chat_transcripts_session_id_id', table_name='chat_transcripts', if_exists=True)
+    op.execute("DROP TABLE IF EXISTS chat_transcripts")
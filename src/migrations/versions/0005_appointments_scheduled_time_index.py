@@ -0,0 +1,48 @@
+"""appointments (scheduled_time, id) index
+
+AppointmentDAO.iter_all / iter_appointments_with_details stream appointments in
+(scheduled_time, id) order from a server-side cursor and continue after the last row seen
+with `(scheduled_time, id) > (:after_scheduled_time, :after_id)`. This btree serves the
+order and the keyset predicate, so the first rows arrive without sorting the whole table
+and every page is an index range scan, however deep.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_appointments_scheduled_time_id',
+            'appointments',
+            ['scheduled_time', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_appointments_scheduled_time_id',
+            table_name='appointments',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
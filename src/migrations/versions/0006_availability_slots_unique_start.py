@@ -0,0 +1,61 @@
+"""availability_slots unique (provider_id, date, start_time)
+
+AvailabilityDAO.create_many / POST /availability/bulk import slots in bulk with
+`ON CONFLICT (provider_id, date, start_time) DO NOTHING`, so re-publishing a calendar
+skips the slots that already exist. That needs a unique index on those columns; it also
+serves slot lookups per provider. Duplicates already in the table have to be removed
+first, the upgrade refuses to run while there are any.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    duplicates = op.get_bind().execute(sa.text("""
+        SELECT count(*) FROM (
+            SELECT 1 FROM availability_slots
+            GROUP BY provider_id, date, start_time
+            HAVING count(*) > 1
+        ) d
+    """)).scalar()
+    if duplicates:
+        # a failed CREATE UNIQUE INDEX CONCURRENTLY would leave an invalid index behind
+        raise RuntimeError(f"{duplicates} (provider_id, date, start_time) groups in availability_slots "
+                           "have more than one slot; remove the duplicates before upgrading")
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ux_availability_slots_provider_date_start_time',
+            'availability_slots',
+            ['provider_id', 'date', 'start_time'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ux_availability_slots_provider_date_start_time',
+            table_name='availability_slots',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
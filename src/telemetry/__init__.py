@@ -0,0 +1,10 @@
+from .tracer import Span, Tracer, tracer, span, current_span, error_event, traced, traced_iter, atraced_iter, set_exporter, get_trace_stats
+from .exporters import SpanExporter, ConsoleExporter, InMemoryExporter, JsonLinesExporter, OtlpFileExporter, create_exporter
+from .instrumentation import LLMTracingCallback, llm_tracing_callback, TracedCursor, TracedAsyncCursor, trace_methods, trace_checkpointer
+
+__all__ = [
+    'Span', 'Tracer', 'tracer', 'span', 'current_span', 'error_event', 'traced', 'traced_iter', 'atraced_iter',
+    'set_exporter', 'get_trace_stats',
+    'SpanExporter', 'ConsoleExporter', 'InMemoryExporter', 'JsonLinesExporter', 'OtlpFileExporter', 'create_exporter',
+    'LLMTracingCallback', 'llm_tracing_callback', 'TracedCursor', 'TracedAsyncCursor', 'trace_methods', 'trace_checkpointer'
+]
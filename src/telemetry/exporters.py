@@ -0,0 +1,164 @@
+import importlib
+import json
+import logging
+import os
+import threading
+from collections import deque
+
+
+# Where ended spans go:
+#   TRACE_EXPORTER=none       counters only (GET /chatbot/stats), the default
+#   TRACE_EXPORTER=console    one line per span on stdout
+#   TRACE_EXPORTER=memory     the last spans kept in-process (InMemoryExporter.spans)
+#   TRACE_EXPORTER=jsonl      one JSON object per span appended to TRACE_FILE
+#   TRACE_EXPORTER=otlp_file  OTLP/JSON (one ExportTraceServiceRequest per line) appended to TRACE_FILE,
+#                             readable by the OpenTelemetry collector's file receiver / otel-desktop-viewer
+#   TRACE_EXPORTER=package.module:ClassName   any class with export(span) and shutdown()
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none")
+TRACE_FILE = os.getenv("TRACE_FILE")
+TRACE_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "appointment-agent")
+
+DEFAULT_TRACE_FILES = {
+    "jsonl": "traces/spans.jsonl",
+    "otlp_file": "traces/otlp.jsonl",
+}
+
+
+class SpanExporter:
+    """Base class: export(span) is called once per ended span"""
+
+    def export(self, span):
+        raise NotImplementedError("Subclasses must implement export method")
+
+    def shutdown(self):
+        pass
+
+
+class ConsoleExporter(SpanExporter):
+    """Human-readable line per span, for local debugging"""
+
+    def export(self, span):
+        status = "" if span.status == "ok" else f" [{span.error}]"
+        print(f"[trace {span.trace_id[:8]}] {span.name} {span.duration_ms:.1f}ms {span.attributes}{status}")
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps the last max_spans spans (tests, notebooks)"""
+
+    def __init__(self, max_spans=10000):
+        self.spans = deque(maxlen=max_spans)
+
+    def export(self, span):
+        self.spans.append(span)
+
+    def clear(self):
+        self.spans.clear()
+
+
+class _FileExporter(SpanExporter):
+    """Appends one JSON line per span; the file is opened on the first span"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def line(self, span):
+        raise NotImplementedError
+
+    def export(self, span):
+        line = json.dumps(self.line(span), default=str)
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def shutdown(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class JsonLinesExporter(_FileExporter):
+    """Span.to_dict() per line"""
+
+    def line(self, span):
+        return span.to_dict()
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes):
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+# SPAN_KIND_INTERNAL / SPAN_KIND_CLIENT: LLM and database calls leave the process
+_CLIENT_SPAN_PREFIXES = ("llm.", "db.")
+
+
+class OtlpFileExporter(_FileExporter):
+    """OTLP/JSON encoding of each span, in the layout of the collector's file exporter"""
+
+    def __init__(self, path, service_name=TRACE_SERVICE_NAME):
+        super().__init__(path)
+        self.service_name = service_name
+
+    def line(self, span):
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 3 if span.name.startswith(_CLIENT_SPAN_PREFIXES) else 1,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": _otlp_attributes(span.attributes),
+            "events": [
+                {"timeUnixNano": str(event["time_ns"]), "name": event["name"],
+                 "attributes": _otlp_attributes(event["attributes"])}
+                for event in span.events
+            ],
+            "status": {"code": 2, "message": span.error} if span.status == "error" else {"code": 1},
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{"scope": {"name": "telemetry"}, "spans": [otlp_span]}],
+            }]
+        }
+
+
+def create_exporter(name=TRACE_EXPORTER, path=TRACE_FILE):
+    """Exporter for TRACE_EXPORTER (None for "none")"""
+    if ":" in name:
+        module_name, class_name = name.split(":", 1)
+        return getattr(importlib.import_module(module_name), class_name)()
+    name = name.lower()
+    if name in ("", "none", "off"):
+        return None
+    if name == "console":
+        return ConsoleExporter()
+    if name == "memory":
+        return InMemoryExporter()
+    if name == "jsonl":
+        return JsonLinesExporter(path or DEFAULT_TRACE_FILES["jsonl"])
+    if name == "otlp_file":
+        return OtlpFileExporter(path or DEFAULT_TRACE_FILES["otlp_file"])
+    logging.getLogger(__name__).warning("Unknown TRACE_EXPORTER %r, spans are not exported", name)
+    return None
@@ -0,0 +1,188 @@
+import functools
+import inspect
+import os
+import re
+import threading
+
+from langchain_core.callbacks import BaseCallbackHandler
+from psycopg import AsyncCursor
+
+from .tracer import tracer, traced
+
+
+# SQL text kept on db.query spans (parameters are never recorded)
+TRACE_SQL_MAX_CHARS = int(os.getenv("TRACE_SQL_MAX_CHARS", 500))
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def sql_statement(query, max_chars=TRACE_SQL_MAX_CHARS):
+    """Statement text on one line, clipped to max_chars"""
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "replace")
+    text = WHITESPACE_RE.sub(" ", str(query)).strip()
+    return text if len(text) <= max_chars else text[:max_chars - 1] + "…"
+
+
+##--------------------------------------------------------------------
+#                   LLM CALLS
+##--------------------------------------------------------------------
+class LLMTracingCallback(BaseCallbackHandler):
+    """
+    One llm.call span per chat model invocation: model, prompt / completion tokens and latency.
+    Attached to the shared clients in engine.llm, so every node's calls are covered.
+    """
+
+    # called in the invoking thread / task, so spans parent to the node that made the call
+    run_inline = True
+
+    def __init__(self):
+        self._spans = {}        # run_id -> span
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, tags=None, metadata=None, **kwargs):
+        metadata = metadata or {}
+        span = tracer.start_span(
+            "llm.call",
+            **{"llm.model": metadata.get("ls_model_name"), "llm.temperature": metadata.get("ls_temperature"),
+               "llm.user_facing": "user_facing" in (tags or []), "llm.messages": sum(len(batch) for batch in messages)}
+        )
+        with self._lock:
+            self._spans[run_id] = span
+
+    def _pop(self, run_id):
+        with self._lock:
+            return self._spans.pop(run_id, None)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        span = self._pop(run_id)
+        if span is None:
+            return
+        prompt_tokens = completion_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+        span.set_attributes({"llm.prompt_tokens": prompt_tokens, "llm.completion_tokens": completion_tokens})
+        span.end()
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        span = self._pop(run_id)
+        if span is not None:
+            span.record_error(error)
+            span.end()
+
+
+llm_tracing_callback = LLMTracingCallback()
+
+
+##--------------------------------------------------------------------
+#                   DAO METHODS AND SQL
+##--------------------------------------------------------------------
+def trace_methods(cls, prefix):
+    """Wrap every public method defined on cls in a '<prefix>.<Class>.<method>' span"""
+    for name, value in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(value):
+            continue
+        setattr(cls, name, traced(f"{prefix}.{cls.__name__}.{name}")(value))
+    return cls
+
+
+def _query_span(query):
+    return tracer.span("db.query", **{"db.statement": sql_statement(query)})
+
+
+class TracedCursor:
+    """psycopg2 cursor proxy: execute / executemany run in a db.query span with the row count"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        # cursor options (itersize, arraysize, ...) belong to the real cursor
+        if name == "_cursor":
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._cursor.__exit__(exc_type, exc_value, traceback)
+
+    def execute(self, query, vars=None):
+        with _query_span(query) as span:
+            result = self._cursor.execute(query, vars)
+            span.set_attribute("db.rows", self._cursor.rowcount)
+            return result
+
+    def executemany(self, query, vars_list):
+        with _query_span(query) as span:
+            result = self._cursor.executemany(query, vars_list)
+            span.set_attribute("db.rows", self._cursor.rowcount)
+            return result
+
+
+class TracedAsyncCursor(AsyncCursor):
+    """psycopg 3 cursor_factory with the same db.query spans"""
+
+    async def execute(self, query, params=None, **kwargs):
+        if not query:
+            # the pool's connection check (an empty statement) is part of acquiring, not a query
+            return await super().execute(query, params, **kwargs)
+        with _query_span(query) as span:
+            result = await super().execute(query, params, **kwargs)
+            span.set_attribute("db.rows", self.rowcount)
+            return result
+
+    async def executemany(self, query, params_seq, **kwargs):
+        with _query_span(query) as span:
+            result = await super().executemany(query, params_seq, **kwargs)
+            span.set_attribute("db.rows", self.rowcount)
+            return result
+
+
+##--------------------------------------------------------------------
+#                   CHECKPOINTS
+##--------------------------------------------------------------------
+CHECKPOINT_METHODS = ("get_tuple", "put", "put_writes", "aget_tuple", "aput", "aput_writes")
+
+
+def _thread_id(config):
+    return ((config or {}).get("configurable") or {}).get("thread_id")
+
+
+def _traced_checkpoint_method(span_name, method):
+    # LangGraph sometimes writes from a done-callback outside the turn's context, so the
+    # span also carries the thread_id to tie it back to its session
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(config, *args, **kwargs):
+            with tracer.span(span_name, thread_id=_thread_id(config)):
+                return await method(config, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(config, *args, **kwargs):
+        with tracer.span(span_name, thread_id=_thread_id(config)):
+            return method(config, *args, **kwargs)
+    return wrapper
+
+
+def trace_checkpointer(saver):
+    """checkpoint.<method> spans around the saver's reads and writes (wraps the instance's methods)"""
+    for name in CHECKPOINT_METHODS:
+        method = getattr(saver, name, None)
+        if method is not None:
+            # aput and put share one span name (and one row in the stats)
+            setattr(saver, name, _traced_checkpoint_method(f"checkpoint.{name[1:] if name.startswith('a') else name}", method))
+    return saver
@@ -0,0 +1,295 @@
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+
+from .exporters import create_exporter
+
+
+# Spans for chat turns, graph nodes, LLM calls, DAO methods / SQL and checkpoint reads and writes.
+# Every ended span is counted per name (see get_trace_stats) and handed to the exporter
+# (TRACE_EXPORTER, see exporters.py). TRACING=0 turns spans into no-ops.
+TRACING = os.getenv("TRACING", "1") != "0"
+
+_current = contextvars.ContextVar("current_span", default=None)
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """One timed operation; ended spans go to the tracer's exporter"""
+
+    def __init__(self, tracer, name, parent=None, attributes=None):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = dict(attributes or {})
+        self.events = []
+        self.status = "ok"
+        self.error = None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.duration_ms = None
+        self._started = time.perf_counter()
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+        return self
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+        return self
+
+    def add_event(self, name, **attributes):
+        self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": attributes})
+        return self
+
+    def record_error(self, error):
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+        return self
+
+    def end(self):
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        self.tracer._finish(self)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+            "events": self.events,
+        }
+
+
+class NoopSpan:
+    """Stands in for a span when tracing is off or nothing is being traced"""
+    name = None
+    attributes = {}
+
+    def set_attribute(self, key, value):
+        return self
+
+    def set_attributes(self, attributes):
+        return self
+
+    def add_event(self, name, **attributes):
+        return self
+
+    def record_error(self, error):
+        return self
+
+    def end(self):
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+def _restore(token, previous):
+    try:
+        _current.reset(token)
+    except ValueError:
+        # set in a different context (a generator resumed from another thread / task)
+        _current.set(previous)
+
+
+class Tracer:
+    """Creates spans, tracks the current one per context and keeps per-name latency counters"""
+
+    def __init__(self, exporter=None, enabled=TRACING):
+        self.exporter = exporter
+        self.enabled = enabled
+        self._stats_lock = threading.Lock()
+        self._stats = {}        # span name -> {"count", "errors", "total_ms", "max_ms"}
+
+    def start_span(self, name, parent=None, **attributes):
+        """A started span, child of parent (default: the current span); not made current"""
+        if not self.enabled:
+            return NOOP_SPAN
+        if parent is None:
+            parent = _current.get()
+        return Span(self, name, parent if isinstance(parent, Span) else None, attributes)
+
+    @contextmanager
+    def activate(self, span):
+        """Make an already started span current for the block (does not end it)"""
+        previous = _current.get()
+        token = _current.set(span)
+        try:
+            yield span
+        finally:
+            _restore(token, previous)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Span around the block, current inside it; exceptions are recorded and re-raised"""
+        span = self.start_span(name, **attributes)
+        with self.activate(span):
+            try:
+                yield span
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                span.record_error(e)
+                raise
+            finally:
+                span.end()
+
+    def _finish(self, span):
+        with self._stats_lock:
+            counts = self._stats.setdefault(span.name, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+            counts["count"] += 1
+            counts["errors"] += span.status == "error"
+            counts["total_ms"] += span.duration_ms
+            counts["max_ms"] = max(counts["max_ms"], span.duration_ms)
+        if self.exporter is not None:
+            try:
+                self.exporter.export(span)
+            except Exception as e:
+                logger.warning("Trace export error: %s", e)
+
+    def stats(self):
+        """Per span name: count, errors, avg_ms, max_ms, total_ms"""
+        with self._stats_lock:
+            stats = {name: dict(counts) for name, counts in self._stats.items()}
+        for counts in stats.values():
+            counts["avg_ms"] = counts["total_ms"] / counts["count"] if counts["count"] else 0.0
+        return stats
+
+    def shutdown(self):
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+tracer = Tracer(create_exporter())
+
+
+def current_span():
+    """The innermost active span, or a no-op span (so callers never need to check)"""
+    return _current.get() or NOOP_SPAN
+
+
+def span(name, **attributes):
+    return tracer.span(name, **attributes)
+
+
+def error_event(name, error):
+    """
+    A handled error (the operation carried on, e.g. with a fallback) as an event on the
+    current span; unhandled ones are recorded by the span itself (record_error)
+    """
+    return current_span().add_event(name, error=f"{type(error).__name__}: {error}")
+
+
+def set_exporter(exporter):
+    """Swap the exporter (anything with export(span) and shutdown())"""
+    previous, tracer.exporter = tracer.exporter, exporter
+    if previous is not None and previous is not exporter:
+        previous.shutdown()
+
+
+def get_trace_stats():
+    return {"exporter": type(tracer.exporter).__name__ if tracer.exporter else None, "spans": tracer.stats()}
+
+
+def traced(name=None, **attributes):
+    """
+    Decorator: run the function inside a span named name (default module.qualname).
+    Coroutine functions are awaited in the span; for (async) generator functions the span
+    covers the whole iteration.
+    """
+    def decorator(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                return traced_iter(span_name, func(*args, **kwargs), **attributes)
+            return generator_wrapper
+
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            def async_generator_wrapper(*args, **kwargs):
+                return atraced_iter(span_name, func(*args, **kwargs), **attributes)
+            return async_generator_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def traced_iter(name, iterator, **attributes):
+    """
+    Yield from iterator inside one span. The span is made current around each step rather than
+    for the whole generator, so it survives being resumed from different threads
+    (e.g. Starlette's iterate_in_threadpool).
+    """
+    span = tracer.start_span(name, **attributes)
+    iterator = iter(iterator)
+    try:
+        while True:
+            with tracer.activate(span):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+    except GeneratorExit:
+        raise
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        if hasattr(iterator, "close"):
+            iterator.close()
+        span.end()
+
+
+async def atraced_iter(name, iterator, **attributes):
+    """traced_iter for async iterators"""
+    span = tracer.start_span(name, **attributes)
+    iterator = iterator.__aiter__()
+    try:
+        while True:
+            with tracer.activate(span):
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield item
+    except GeneratorExit:
+        raise
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
+        span.end()
@@ -0,0 +1,70 @@
+from datetime import date
+
+import pytest
+
+from engine.fast_extractor import extract_locally, is_trivial, parse_date
+
+TODAY = date(2026, 10, 18)
+SERVICES = ["haircut", "dentist", "massage"]
+# the assistant just asked for the user's name
+ASKED_NAME = ["seeker_name", "seeker_contact"]
+
+
+# Words that merely start like a month must not become dates: the residual would look
+# trivial, the LLM would be skipped and the wrong date kept.
+@pytest.mark.parametrize("message", ["maybe 10 works", "Marketing 5", "I decide 12 is fine", "10 mayhem", "junebug 4"])
+def test_no_date_from_words_starting_like_a_month(message):
+    assert parse_date(message, TODAY)[0] is None
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("may 10", "2027-05-10"),
+    ("10 may", "2027-05-10"),
+    ("Jan. 5", "2027-01-05"),
+    ("5th of September", "2027-09-05"),
+    ("sept 3", "2027-09-03"),
+    ("on Dec 12th please", "2026-12-12"),
+])
+def test_month_day_dates(message, expected):
+    assert parse_date(message, TODAY)[0] == expected
+
+
+@pytest.mark.parametrize("message", ["Tomorrow", "Evening", "Friday instead", "Haircut", "May", "march"])
+def test_reply_to_name_question_that_is_not_a_name(message):
+    extracted, _, _ = extract_locally(message, ASKED_NAME, not_names=SERVICES, today=TODAY)
+    assert "name" not in extracted
+
+
+def test_date_reply_to_name_question_is_only_a_date():
+    extracted, resolved, _ = extract_locally("Tomorrow", ASKED_NAME, not_names=SERVICES, today=TODAY)
+    assert extracted == {"preferred_date": "2026-10-19"}
+    assert resolved == ["preferred_date"]
+
+
+def test_call_me_followed_by_a_date_is_not_a_name():
+    extracted, _, _ = extract_locally("call me tomorrow at 10am", ASKED_NAME, not_names=SERVICES, today=TODAY)
+    assert "name" not in extracted
+    assert extracted["preferred_date"] == "2026-10-19"
+    assert extracted["preferred_time"] == "10:00"
+
+
+def test_service_word_is_not_a_name_after_my_name_is():
+    extracted, _, residual = extract_locally("my name is haircut", ASKED_NAME, not_names=SERVICES, today=TODAY)
+    assert "name" not in extracted
+    assert not is_trivial(residual)
+
+
+@pytest.mark.parametrize("message, name", [
+    ("Jane Doe", "Jane Doe"),
+    ("my name is jane", "Jane"),
+    ("call me Jane, my email is jane@example.com", "Jane"),
+])
+def test_names(message, name):
+    extracted, _, residual = extract_locally(message, ASKED_NAME, not_names=SERVICES, today=TODAY)
+    assert extracted["name"] == name
+    assert is_trivial(residual)
+
+
+def test_bare_name_only_when_asked():
+    extracted, _, _ = extract_locally("Jane Doe", ["preferred_date"], today=TODAY)
+    assert "name" not in extracted